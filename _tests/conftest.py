@@ -0,0 +1,54 @@
+"""Shared helpers for the Notion integration tests."""
+
+from typing import Any
+
+USER = {"object": "user", "id": "user_id"}
+
+
+def rich_text(content: str) -> list[dict[str, Any]]:
+    """Builds a rich text array holding one plain text item, as returned by the API."""
+    return [
+        {
+            "type": "text",
+            "text": {"content": content},
+            "plain_text": content,
+            "annotations": {},
+        }
+    ]
+
+
+def page_object(
+    page_id: str,
+    properties: dict[str, Any] | None = None,
+    *,
+    created_time: str = "2024-01-01T00:00:00.000Z",
+    last_edited_time: str | None = None,
+    user: dict[str, Any] = USER,
+    parent: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """
+    Builds a page object as returned by the API.
+
+    Args:
+        page_id: The ID of the page, also used in its URL.
+        properties: The property values in response format.
+        created_time: The creation time.
+        last_edited_time: The last edit time. Defaults to `created_time`.
+        user: The user who created and last edited the page.
+        parent: The parent of the page. Defaults to the database "db_id".
+
+    Returns:
+        The page object.
+    """
+    return {
+        "object": "page",
+        "id": page_id,
+        "created_time": created_time,
+        "last_edited_time": last_edited_time or created_time,
+        "created_by": user,
+        "last_edited_by": user,
+        "parent": parent or {"type": "database_id", "database_id": "db_id"},
+        "archived": False,
+        "url": f"https://www.notion.so/{page_id}",
+        "properties": properties or {},
+    }
@@ -0,0 +1,195 @@
+"""Tests for the block-tree diff and sync."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.core.integrations.notion.block_sync import (
+    BlockNode,
+    DeleteBlock,
+    InsertBlocks,
+    UpdateBlock,
+    diff_blocks,
+    sync_blocks,
+)
+from app.core.integrations.notion.schemas import (
+    AppendBlockChildrenResponse,
+    Block,
+    PaginatedBlockResponse,
+)
+
+
+def rich_text(text: str) -> list[dict]:
+    # * Without the type, as requests usually leave it out
+    return [{"text": {"content": text}}]
+
+
+def desired(block_type: str, text: str, children: list[dict] | None = None) -> dict:
+    content = {"rich_text": rich_text(text)}
+    if children:
+        content["children"] = children
+    return {"object": "block", "type": block_type, block_type: content}
+
+
+def block(block_id: str, block_type: str, text: str, has_children=False) -> Block:
+    # * As returned by the API, with response-only fields and defaults
+    content = {
+        "rich_text": [
+            {
+                "type": "text",
+                "text": {"content": text, "link": None},
+                "annotations": {"bold": False, "code": False, "color": "default"},
+                "plain_text": text,
+                "href": None,
+            }
+        ],
+        "color": "default",
+    }
+    return Block.model_validate(
+        {
+            "object": "block",
+            "id": block_id,
+            "created_time": "2024-01-01T00:00:00.000Z",
+            "last_edited_time": "2024-01-01T00:00:00.000Z",
+            "created_by": {"object": "user", "id": "user_id"},
+            "last_edited_by": {"object": "user", "id": "user_id"},
+            "has_children": has_children,
+            "archived": False,
+            "type": block_type,
+            block_type: content,
+        }
+    )
+
+
+def node(block_id: str, block_type: str, text: str, children=()) -> BlockNode:
+    return BlockNode(block(block_id, block_type, text, bool(children)), list(children))
+
+
+def test_unchanged_tree_needs_no_operations():
+    """Tests that API defaults and response-only fields do not count as changes."""
+    current = [node("a", "paragraph", "One"), node("b", "heading_1", "Two")]
+
+    assert (
+        diff_blocks(
+            "page", current, [desired("paragraph", "One"), desired("heading_1", "Two")]
+        )
+        == []
+    )
+
+
+def test_diff_prefers_updates_and_inserts_after_kept_blocks():
+    """Tests that edits keep block IDs and inserts are anchored correctly."""
+    current = [
+        node("a", "paragraph", "One"),
+        node("b", "paragraph", "Two"),
+        node("c", "heading_1", "Gone"),
+        node("d", "paragraph", "Four"),
+    ]
+    operations = diff_blocks(
+        "page",
+        current,
+        [
+            desired("paragraph", "One"),
+            desired("paragraph", "Two, edited"),
+            desired("to_do", "New"),
+            desired("paragraph", "Four"),
+        ],
+    )
+
+    assert operations == [
+        UpdateBlock("page", "b", "paragraph", {"rich_text": rich_text("Two, edited")}),
+        DeleteBlock("page", "c"),
+        InsertBlocks("page", "b", [desired("to_do", "New")]),
+    ]
+
+
+def test_diff_never_inserts_before_the_first_kept_block():
+    """Tests that a new first block is written by updating, not inserting."""
+    current = [node("a", "paragraph", "Old"), node("b", "paragraph", "Kept")]
+    operations = diff_blocks(
+        "page",
+        current,
+        [
+            desired("paragraph", "New"),
+            desired("paragraph", "Old"),
+            desired("paragraph", "Kept"),
+        ],
+    )
+
+    assert not any(
+        isinstance(op, InsertBlocks) and op.after is None for op in operations
+    )
+    assert len(operations) == 2
+
+
+def test_diff_recurses_into_children_and_keeps_child_pages():
+    """Tests nested diffs and that child pages are never deleted."""
+    child_page = BlockNode(
+        Block.model_validate(
+            {
+                **block("p", "paragraph", "").model_dump(),
+                "type": "child_page",
+                "paragraph": None,
+                "child_page": {"title": "Sub page"},
+            }
+        )
+    )
+    current = [
+        node("t", "toggle", "Toggle", [node("t1", "paragraph", "Inner")]),
+        child_page,
+    ]
+    operations = diff_blocks(
+        "page",
+        current,
+        [desired("toggle", "Toggle", [desired("paragraph", "Inner, edited")])],
+    )
+
+    assert operations == [
+        UpdateBlock("t", "t1", "paragraph", {"rich_text": rich_text("Inner, edited")})
+    ]
+
+
+@pytest.mark.asyncio
+async def test_sync_blocks_applies_the_diff(async_notion_client):
+    """Tests that sync fetches the tree and sends only the needed requests."""
+    children = PaginatedBlockResponse(
+        object="list",
+        results=[block("a", "paragraph", "One"), block("b", "paragraph", "Two")],
+        next_cursor=None,
+        has_more=False,
+    )
+    appended = AppendBlockChildrenResponse(
+        object="list", results=[block("c", "to_do", "Three")]
+    )
+
+    with (
+        patch.object(
+            async_notion_client, "get_block_children", AsyncMock(return_value=children)
+        ),
+        patch.object(
+            async_notion_client,
+            "append_block_children",
+            AsyncMock(return_value=appended),
+        ) as append,
+        patch.object(async_notion_client, "update_block", AsyncMock()) as update,
+        patch.object(async_notion_client, "delete_block", AsyncMock()) as delete,
+    ):
+        operations = await sync_blocks(
+            async_notion_client,
+            "page",
+            [
+                desired("paragraph", "One"),
+                desired("paragraph", "Two, edited"),
+                desired("to_do", "Three"),
+            ],
+        )
+
+    assert len(operations) == 2
+    update.assert_awaited_once_with(
+        "b", {"paragraph": {"rich_text": rich_text("Two, edited")}}
+    )
+    (parent_id, payload), _ = append.await_args
+    assert parent_id == "page"
+    assert payload.after == "b"
+    assert payload.children == [desired("to_do", "Three")]
+    delete.assert_not_awaited()
@@ -0,0 +1,116 @@
+"""Tests for the Notion object cache and its backends."""
+
+import time
+
+import httpx
+import pytest
+
+from app.core.integrations.notion.cache import (
+    MemoryCacheBackend,
+    NotionCache,
+    SQLiteCacheBackend,
+)
+from app.core.integrations.notion.circuit_breaker import CircuitBreakerRegistry
+from app.core.integrations.notion.client import AsyncNotionClient
+from app.core.integrations.notion.exceptions import NotionInternalServerError
+from app.core.integrations.notion.schemas import Page
+
+PAGE = {
+    "object": "page",
+    "id": "page_id",
+    "created_time": "2024-01-01T00:00:00.000Z",
+    "last_edited_time": "2024-01-01T00:00:00.000Z",
+    "created_by": {"object": "user", "id": "user_id"},
+    "last_edited_by": {"object": "user", "id": "user_id"},
+    "archived": False,
+    "properties": {
+        "Name": {
+            "id": "title",
+            "type": "title",
+            "title": [
+                {"type": "text", "text": {"content": "Hello"}, "plain_text": "Hello"}
+            ],
+        },
+        "Count": {"id": "abc", "type": "number", "number": 3},
+    },
+    "parent": {"type": "database_id", "database_id": "db_id"},
+    "url": "https://www.notion.so/page_id",
+}
+
+
+@pytest.mark.asyncio
+async def test_sqlite_backend_is_shared_and_evicts_by_size(tmp_path):
+    """Tests that instances on one file share entries and stay under the size cap."""
+    path = str(tmp_path / "cache.db")
+    writer = SQLiteCacheBackend(path, max_bytes=1000)
+    reader = SQLiteCacheBackend(path, max_bytes=1000)
+
+    await writer.set("a", b"x" * 400, time.time() + 60)
+    assert await reader.get("a") == (b"x" * 400, pytest.approx(time.time() + 60, abs=5))
+
+    await writer.set("b", b"y" * 400, time.time() + 60)
+    await writer.set("c", b"z" * 400, time.time() + 60)
+    assert await reader.get("a") is None
+    assert await reader.get("c") is not None
+
+    await writer.delete_prefix("c")
+    assert await reader.get("c") is None
+
+
+@pytest.mark.asyncio
+async def test_cache_round_trips_models(tmp_path):
+    """Tests that cached pages validate back to equal models."""
+    cache = NotionCache(SQLiteCacheBackend(str(tmp_path / "cache.db")))
+    page = Page.model_validate(PAGE)
+
+    await cache.set("pages", "page_id", page)
+    cached, fresh = await cache.get("pages", "page_id", Page)
+
+    assert fresh
+    assert cached == page
+
+
+@pytest.mark.asyncio
+async def test_client_reads_through_and_serves_stale_during_outage():
+    """Tests read-through caching and the stale fallback of the client."""
+    responses = [
+        httpx.Response(200, json=PAGE),
+        httpx.Response(500, json={"message": "Down"}),
+    ]
+    calls = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        return responses.pop(0)
+
+    cache = NotionCache(MemoryCacheBackend(), ttl=60)
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http:
+        client = AsyncNotionClient("token", http, cache=cache)
+        first = await client.get_page("page_id")
+        second = await client.get_page("page_id")
+        assert calls == 1
+
+        cache.ttl = -1
+        await cache.set("pages", "page_id", first)
+        stale = await client.get_page("page_id")
+
+    assert second == first
+    assert stale == first
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_client_raises_without_a_cached_copy():
+    """Tests that outages still raise when nothing is cached."""
+    handler = lambda request: httpx.Response(500, json={"message": "Down"})
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http:
+        client = AsyncNotionClient(
+            "token",
+            http,
+            cache=NotionCache(MemoryCacheBackend()),
+            circuit_breakers=CircuitBreakerRegistry(),
+        )
+        with pytest.raises(NotionInternalServerError):
+            await client.get_page("page_id")
@@ -0,0 +1,113 @@
+"""Tests for the circuit breakers guarding Notion API requests."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.core.integrations.notion.circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakerRegistry,
+)
+from app.core.integrations.notion.client import AsyncNotionClient
+from app.core.integrations.notion.exceptions import (
+    NotionCircuitOpenError,
+    NotionInternalServerError,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_breaker_opens_fails_fast_and_recovers():
+    """Tests the closed, open, half-open and closed again cycle."""
+    clock = FakeClock()
+    breaker = CircuitBreaker(
+        "pages", window_size=4, minimum_calls=4, reset_timeout=30, clock=clock
+    )
+
+    for failed in (False, True, False, True):
+        breaker.before_call()
+        breaker.record(0.1, failed=failed)
+    assert breaker.state == "open"
+
+    with pytest.raises(NotionCircuitOpenError) as exc_info:
+        breaker.before_call()
+    assert exc_info.value.retry_after == 30
+
+    clock.now = 31
+    breaker.before_call()
+    assert breaker.state == "half_open"
+    # * Only one probe at a time
+    with pytest.raises(NotionCircuitOpenError):
+        breaker.before_call()
+    breaker.record(0.1, failed=False)
+    assert breaker.state == "closed"
+
+
+def test_breaker_opens_on_slow_calls():
+    """Tests that a latency spike trips the breaker without errors."""
+    breaker = CircuitBreaker(
+        "search", slow_call_duration=2.0, window_size=5, minimum_calls=5
+    )
+
+    for _ in range(4):
+        breaker.before_call()
+        breaker.record(3.0, failed=False)
+    breaker.before_call()
+    breaker.record(0.5, failed=False)
+
+    assert breaker.state == "open"
+
+
+
+def test_cancelled_probe_frees_its_slot_without_closing():
+    """Tests that a cancelled half-open probe is neither a success nor a failure."""
+    clock = FakeClock()
+    breaker = CircuitBreaker(
+        "pages", window_size=2, minimum_calls=2, reset_timeout=30, clock=clock
+    )
+    for _ in range(2):
+        breaker.before_call()
+        breaker.record(0.1, failed=True)
+    clock.now = 31
+
+    with pytest.raises(asyncio.CancelledError):
+        with breaker.track():
+            raise asyncio.CancelledError
+
+    assert breaker.state == "half_open"
+    # * The slot is free again for the next probe
+    with breaker.track():
+        pass
+    assert breaker.state == "closed"
+
+@pytest.mark.asyncio
+async def test_client_fails_fast_while_open():
+    """Tests that the client stops calling an endpoint class once it is open."""
+    calls: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        if request.url.path.startswith("/v1/pages"):
+            return httpx.Response(500, json={"message": "Internal error"})
+        return httpx.Response(200, json={"object": "user", "id": "me"})
+
+    breakers = CircuitBreakerRegistry(window_size=2, minimum_calls=2)
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http:
+        client = AsyncNotionClient("token", http, circuit_breakers=breakers)
+        for _ in range(2):
+            with pytest.raises(NotionInternalServerError):
+                await client.get_page("page_id")
+        with pytest.raises(NotionCircuitOpenError):
+            await client.get_page("page_id")
+        # * Other endpoint classes are unaffected
+        await client.get_me()
+
+    assert len(calls) == 3
+    assert breakers.states() == {"pages": "open", "users": "closed"}
@@ -34,7 +34,11 @@ async def test_list_comments_success(
     assert len(response.results) == 1
     assert response.results[0].id == "comment_id_1"
     mock_request.assert_called_once_with(
-        "GET", f"https://api.notion.com/v1/comments?block_id={block_id}", headers=async_notion_client.headers, json=None, params=None
+        "GET",
+        "https://api.notion.com/v1/comments",
+        headers=async_notion_client.headers,
+        json=None,
+        params={"block_id": block_id},
     )
 
 
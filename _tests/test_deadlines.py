@@ -0,0 +1,114 @@
+"""Tests for per-operation deadlines and hedged reads."""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.core.integrations.notion.client import AsyncNotionClient
+from app.core.integrations.notion.deadlines import deadline, time_remaining
+from app.core.integrations.notion.exceptions import NotionDeadlineExceededError
+from app.core.integrations.notion.hedging import HedgingPolicy
+from app.core.integrations.notion.rate_limit import AsyncRateLimiter
+
+USER = {"object": "user", "id": "me"}
+
+
+def test_nested_deadlines_never_extend():
+    """Tests that an inner deadline cannot outlive the outer one."""
+    assert time_remaining() is None
+    with deadline(0.5):
+        with deadline(10):
+            assert time_remaining() <= 0.5
+    assert time_remaining() is None
+
+
+@pytest.mark.asyncio
+async def test_deadline_cancels_slow_request():
+    """Tests that a slow response is abandoned when the deadline passes."""
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(1)
+        return httpx.Response(200, json=USER)
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http:
+        client = AsyncNotionClient("token", http)
+        start = time.monotonic()
+        with pytest.raises(NotionDeadlineExceededError):
+            with deadline(0.05):
+                await client.get_me()
+
+    assert time.monotonic() - start < 0.5
+
+
+@pytest.mark.asyncio
+async def test_deadline_stops_retry_backoff():
+    """Tests that retries give up instead of backing off past the deadline."""
+    calls = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        return httpx.Response(503, json={"message": "Unavailable"})
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http:
+        client = AsyncNotionClient("token", http)
+        start = time.monotonic()
+        with pytest.raises(NotionDeadlineExceededError):
+            with deadline(0.5):
+                await client.get_me()
+
+    assert calls == 1
+    assert time.monotonic() - start < 0.5
+
+
+@pytest.mark.asyncio
+async def test_hedged_read_takes_the_faster_response():
+    """Tests that a slow GET is hedged and the first response wins."""
+    calls = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            await asyncio.sleep(1)
+        return httpx.Response(200, json=USER)
+
+    hedging = HedgingPolicy(initial_delay=0.05)
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http:
+        client = AsyncNotionClient(
+            "token", http, rate_limiter=AsyncRateLimiter(rate=10), hedging=hedging
+        )
+        start = time.monotonic()
+        user = await client.get_me()
+
+    assert user.id == "me"
+    assert calls == 2
+    assert hedging.hedges_sent == 1
+    assert time.monotonic() - start < 0.5
+
+
+@pytest.mark.asyncio
+async def test_no_hedge_without_rate_limit_budget():
+    """Tests that hedges are skipped when no token is available."""
+    limiter = AsyncRateLimiter(rate=1, capacity=1)
+    await limiter.acquire()
+    hedging = HedgingPolicy(initial_delay=0.0)
+
+    async def send() -> str:
+        await asyncio.sleep(0.05)
+        return "primary"
+
+    assert await hedging.run("users", send, limiter) == "primary"
+    assert hedging.hedges_sent == 0
+
+
+def test_hedging_delay_follows_percentile():
+    """Tests that the delay is the configured latency percentile."""
+    hedging = HedgingPolicy(percentile=90, min_samples=10)
+    for latency in range(1, 11):
+        hedging.observe("pages", latency / 10)
+
+    assert hedging.delay("pages") == pytest.approx(0.9)
+    assert hedging.delay("blocks") == hedging.initial_delay
@@ -0,0 +1,75 @@
+"""Tests for batch comment fetching."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.core.integrations.notion.client import AsyncNotionClient
+from app.core.integrations.notion.discussions import fetch_discussions
+from app.core.integrations.notion.schemas import PaginatedCommentResponse
+
+
+def _comment(comment_id: str, discussion_id: str, minute: int) -> dict:
+    return {
+        "object": "comment",
+        "id": comment_id,
+        "parent": {"type": "page_id", "page_id": "page_id"},
+        "discussion_id": discussion_id,
+        "created_time": f"2024-01-01T00:{minute:02d}:00.000Z",
+        "last_edited_time": f"2024-01-01T00:{minute:02d}:00.000Z",
+        "created_by": {"object": "user", "id": "user_id"},
+        "rich_text": [],
+    }
+
+
+def _response(comments: list[dict], cursor: str | None) -> PaginatedCommentResponse:
+    return PaginatedCommentResponse.model_validate(
+        {"object": "list", "results": comments, "next_cursor": cursor, "has_more": cursor is not None}
+    )
+
+
+@pytest.mark.asyncio
+async def test_fetch_discussions_paginates_and_groups(
+    async_notion_client: AsyncNotionClient,
+):
+    """Tests that every page of comments is fetched and grouped by thread."""
+    pages = {
+        ("a", None): _response([_comment("1", "d1", 3), _comment("2", "d2", 1)], "next"),
+        ("a", "next"): _response([_comment("3", "d1", 5)], None),
+        ("b", None): _response([], None),
+    }
+
+    async def list_comments(block_id, start_cursor=None, page_size=None):
+        return pages[(block_id, start_cursor)]
+
+    with patch.object(
+        AsyncNotionClient, "list_comments", new_callable=AsyncMock, side_effect=list_comments
+    ) as mock_list:
+        result = await fetch_discussions(async_notion_client, ["a", "b", "a"])
+
+    assert mock_list.await_count == 3
+    assert list(result) == ["a", "b"]
+    assert list(result["a"]) == ["d2", "d1"]
+    assert [comment.id for comment in result["a"]["d1"]] == ["1", "3"]
+    assert result["b"] == {}
+
+
+@pytest.mark.asyncio
+async def test_fetch_discussions_accepts_block_parents(
+    async_notion_client: AsyncNotionClient,
+):
+    """Tests comments on blocks, whose parent is a block ID."""
+    comment = {
+        **_comment("1", "d1", 0),
+        "parent": {"type": "block_id", "block_id": "block_id"},
+    }
+    response = {"object": "list", "results": [comment], "next_cursor": None, "has_more": False}
+
+    with patch.object(
+        AsyncNotionClient, "_request", new_callable=AsyncMock, return_value=response
+    ):
+        result = await fetch_discussions(async_notion_client, ["block_id"])
+
+    (fetched,) = result["block_id"]["d1"]
+    assert fetched.parent.type == "block_id"
+    assert fetched.parent.block_id == "block_id"
@@ -0,0 +1,120 @@
+"""Tests for the file download manager."""
+
+import hashlib
+
+import httpx
+import pytest
+
+from app.core.integrations.notion.downloads import (
+    FileDownloader,
+    cache_key,
+    collect_file_urls,
+)
+from app.core.integrations.notion.schemas import FilesProperty
+
+CONTENT = b"0123456789" * 1000
+S3 = "https://prod-files-secure.s3.us-west-2.amazonaws.com/space/file"
+
+
+def _transport(calls: list[httpx.Request]) -> httpx.MockTransport:
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(200, content=CONTENT)
+
+    return httpx.MockTransport(handler)
+
+
+@pytest.mark.asyncio
+async def test_fetch_caches_and_deduplicates(tmp_path):
+    """Tests that repeat and identical downloads hit the cache."""
+    calls: list[httpx.Request] = []
+    async with httpx.AsyncClient(transport=_transport(calls)) as client:
+        downloader = FileDownloader(client, tmp_path, chunk_size=1024)
+
+        first = await downloader.fetch(f"{S3}/a.png?X-Amz-Date=1&X-Amz-Signature=1")
+        again = await downloader.fetch(f"{S3}/a.png?X-Amz-Date=2&X-Amz-Signature=2")
+        copy = await downloader.fetch("https://files.example.com/b.png")
+
+    assert first == again == copy
+    assert first.read_bytes() == CONTENT
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_fetches_share_one_download(tmp_path):
+    """Tests that simultaneous requests for one URL download it once."""
+    calls: list[httpx.Request] = []
+    async with httpx.AsyncClient(transport=_transport(calls)) as client:
+        downloader = FileDownloader(client, tmp_path)
+        paths = await downloader.fetch_many(["https://files.example.com/a.png"] * 5)
+
+    assert len(paths) == 1
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_read_range(tmp_path):
+    """Tests streaming an inclusive byte range from the cache."""
+    async with httpx.AsyncClient(transport=_transport([])) as client:
+        downloader = FileDownloader(client, tmp_path, chunk_size=7)
+        chunks = [
+            chunk
+            async for chunk in downloader.read_range("https://files.example.com/a.png", 5, 24)
+        ]
+
+    assert b"".join(chunks) == CONTENT[5:25]
+
+
+
+@pytest.mark.asyncio
+async def test_external_urls_are_keyed_with_their_query(tmp_path):
+    """Tests that external files differing only in their query are distinct."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=request.url.query)
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        downloader = FileDownloader(client, tmp_path)
+        first = await downloader.fetch("https://example.com/file?id=1")
+        second = await downloader.fetch("https://example.com/file?id=2")
+
+    assert (first.read_bytes(), second.read_bytes()) == (b"id=1", b"id=2")
+
+
+@pytest.mark.asyncio
+async def test_streamed_hash_names_the_stored_content(tmp_path):
+    """Tests the hash computed while streaming, including a resumed download."""
+    url = "https://files.example.com/a.png"
+    calls: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        start = int(request.headers["Range"].removeprefix("bytes=").rstrip("-"))
+        return httpx.Response(206, content=CONTENT[start:])
+
+    # * An interrupted download left the first bytes behind
+    (tmp_path / "partial").mkdir()
+    (tmp_path / "partial" / cache_key(url)).write_bytes(CONTENT[:3000])
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        downloader = FileDownloader(client, tmp_path, chunk_size=1024)
+        path = await downloader.fetch(url)
+
+    assert calls[0].headers["Range"] == "bytes=3000-"
+    assert path.name == hashlib.sha256(CONTENT).hexdigest()
+    assert path.read_bytes() == CONTENT
+    assert not (tmp_path / "partial" / cache_key(url)).exists()
+
+def test_collect_file_urls():
+    """Tests URL collection from a files property."""
+    prop = FilesProperty.model_validate(
+        {
+            "id": "f",
+            "type": "files",
+            "files": [
+                {"name": "a", "type": "external", "external": {"url": "https://example.com/a"}},
+                {"name": "b", "type": "file", "file": {"url": "https://s3.example.com/b", "expiry_time": "2024-01-01T00:00:00Z"}},
+            ],
+        }
+    )
+
+    assert collect_file_urls([prop]) == ["https://example.com/a", "https://s3.example.com/b"]
@@ -0,0 +1,159 @@
+"""Tests for the in-memory Notion API emulator."""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.core.integrations.notion.client import AsyncNotionClient
+from app.core.integrations.notion.emulator import NotionEmulator
+from app.core.integrations.notion.exceptions import (
+    NotionBadRequestError,
+    NotionInternalServerError,
+    NotionNotFoundError,
+)
+from app.core.integrations.notion.schemas import (
+    AppendBlockChildrenPayload,
+    QueryDatabasePayload,
+    UpdatePagePayload,
+)
+
+
+def title(text: str) -> dict:
+    return {"title": [{"text": {"content": text}}]}
+
+
+def paragraph(text: str) -> dict:
+    return {
+        "type": "paragraph",
+        "paragraph": {"rich_text": [{"text": {"content": text}}]},
+    }
+
+
+@pytest.mark.asyncio
+async def test_query_paginates_filters_and_writes_round_trip():
+    """Tests database queries across pages of results and page updates."""
+    emulator = NotionEmulator()
+    database = emulator.add_database(
+        "Tasks", {"Name": "title", "Points": "number", "Tags": "multi_select"}
+    )
+    for i in range(250):
+        emulator.add_page(
+            database["id"],
+            properties={"Name": title(f"Task {i}"), "Points": {"number": i}},
+        )
+
+    async with httpx.AsyncClient(transport=emulator.transport) as http:
+        client = AsyncNotionClient("token", http)
+        pages, cursor = [], None
+        while True:
+            response = await client.query_database(
+                database["id"], QueryDatabasePayload(start_cursor=cursor)
+            )
+            pages += response.results
+            if not response.has_more:
+                break
+            cursor = response.next_cursor
+
+        large = await client.query_database(
+            database["id"],
+            QueryDatabasePayload(
+                filter={
+                    "property": "Points",
+                    "number": {"greater_than_or_equal_to": 240},
+                },
+                sorts=[{"property": "Points", "direction": "descending"}],
+            ),
+        )
+        updated = await client.update_page(
+            pages[0].id,
+            UpdatePagePayload(
+                properties={"Tags": {"multi_select": [{"name": "urgent"}]}}
+            ),
+        )
+        fetched = await client.get_page(pages[0].id)
+
+        with pytest.raises(NotionBadRequestError):
+            await client.query_database(
+                database["id"], QueryDatabasePayload(page_size=101)
+            )
+
+    assert len(pages) == 250
+    assert len({page.id for page in pages}) == 250
+    assert [page.properties["Points"].number for page in large.results] == list(
+        range(249, 239, -1)
+    )
+    assert updated.properties["Tags"].multi_select[0].name == "urgent"
+    assert fetched.properties["Tags"] == updated.properties["Tags"]
+
+
+@pytest.mark.asyncio
+async def test_blocks_and_truncated_relations_behave_like_the_api():
+    """Tests block insertion after a sibling and paginated relation items."""
+    emulator = NotionEmulator()
+    database = emulator.add_database("Links", {"Name": "title", "Related": "relation"})
+    targets = [emulator.add_page(database["id"]) for _ in range(30)]
+    page = emulator.add_page(
+        database["id"],
+        properties={"Related": {"relation": [{"id": t["id"]} for t in targets]}},
+        children=[paragraph("First"), paragraph("Last")],
+    )
+    related_id = page["properties"]["Related"]["id"]
+
+    async with httpx.AsyncClient(transport=emulator.transport) as http:
+        client = AsyncNotionClient("token", http)
+        first = (await client.get_block_children(page["id"])).results[0]
+        await client.append_block_children(
+            page["id"],
+            AppendBlockChildrenPayload(children=[paragraph("Middle")], after=first.id),
+        )
+        children = await client.get_block_children(page["id"], page_size=2)
+        rest = await client.get_block_children(
+            page["id"], start_cursor=children.next_cursor
+        )
+        fetched = await client.get_page(page["id"])
+        related = await client.get_page_property(page["id"], related_id)
+        with pytest.raises(NotionNotFoundError):
+            await client.get_page("0" * 32)
+
+    texts = [
+        block.paragraph["rich_text"][0]["plain_text"]
+        for block in children.results + rest.results
+    ]
+    assert texts == ["First", "Middle", "Last"]
+    assert len(fetched.properties["Related"].relation) == 25
+    assert fetched.properties["Related"].has_more
+    assert len(related.relation) == 30
+
+
+@pytest.mark.asyncio
+async def test_injects_rate_limits_errors_and_latency():
+    """Tests 429 responses with Retry-After, scripted errors and latency."""
+    emulator = NotionEmulator(latency=0.05, rate_limit=1, burst=10)
+    headers = {"Authorization": "Bearer token"}
+
+    async with httpx.AsyncClient(transport=emulator.transport) as http:
+        start = time.monotonic()
+        responses = await asyncio.gather(
+            *(
+                http.get("https://api.notion.com/v1/users/me", headers=headers)
+                for _ in range(11)
+            )
+        )
+        elapsed = time.monotonic() - start
+
+        emulator.rate_limit = None
+        emulator.fail_next(500)
+        client = AsyncNotionClient("token", http)
+        with pytest.raises(NotionInternalServerError):
+            await client.get_me()
+        me = await client.get_me()
+
+    statuses = sorted(response.status_code for response in responses)
+    assert statuses == [200] * 10 + [429]
+    (limited,) = [response for response in responses if response.status_code == 429]
+    assert limited.headers["Retry-After"] == "1"
+    assert elapsed < 0.3
+    assert me.id == emulator.bot["id"]
+    assert [status for _, _, status in emulator.log[-2:]] == [500, 200]
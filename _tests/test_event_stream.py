@@ -0,0 +1,87 @@
+"""Tests for the webhook event broker and SSE stream."""
+
+import asyncio
+
+import pytest
+
+from app.core.integrations.notion.webhooks import router as webhook_router
+from app.core.integrations.notion.webhooks.broker import EventBroker
+from app.core.integrations.notion.webhooks.schemas import WebhookPayload
+
+PAGE_ID = "59833787-2cf9-4fdf-8782-e53db20768a5"
+DATABASE_ID = "b5b5d6a3-b6b4-4c8e-9e8e-1f2f3f4f5f6f"
+
+
+def _event(page_id: str, database_id: str = DATABASE_ID) -> WebhookPayload:
+    return WebhookPayload(
+        event_type="page.updated",
+        data={
+            "page_id": page_id,
+            "parent": {"type": "database_id", "database_id": database_id},
+        },
+    )
+
+
+@pytest.mark.asyncio
+async def test_broker_filters_by_page_and_database():
+    """Tests that subscribers only receive events about the objects they follow."""
+    broker = EventBroker()
+
+    async with (
+        broker.subscribe([PAGE_ID]) as by_page,
+        broker.subscribe([DATABASE_ID.replace("-", "")]) as by_database,
+        broker.subscribe(["other"]) as other,
+    ):
+        assert broker.publish(_event(PAGE_ID)) == 2
+        assert (await by_page.get()).data["page_id"] == PAGE_ID
+        assert (await by_database.get()).data["page_id"] == PAGE_ID
+        assert other._queue.empty()
+
+    assert len(broker) == 0
+
+
+@pytest.mark.asyncio
+async def test_slow_subscribers_drop_oldest_events():
+    """Tests that a full buffer drops the oldest event instead of blocking."""
+    broker = EventBroker()
+
+    async with broker.subscribe(buffer_size=2) as subscription:
+        for index in range(3):
+            broker.publish(_event(f"page-{index}"))
+
+        assert subscription.dropped == 1
+        assert (await subscription.get()).data["page_id"] == "page-1"
+
+
+class _Request:
+    def __init__(self):
+        self.disconnected = False
+
+    async def is_disconnected(self) -> bool:
+        return self.disconnected
+
+
+@pytest.mark.asyncio
+async def test_event_stream_formats_sse(monkeypatch):
+    """Tests that published events are sent as SSE messages, with lag notices."""
+    broker = EventBroker()
+    monkeypatch.setattr(webhook_router, "broker", broker)
+    request = _Request()
+    stream = webhook_router._event_stream(request, [PAGE_ID], buffer_size=1)
+
+    first = asyncio.ensure_future(anext(stream))
+    await asyncio.sleep(0)
+    broker.publish(_event(PAGE_ID))
+    message = await first
+
+    assert message.startswith("id: 1\nevent: page.updated\ndata: {")
+    assert message.endswith("\n\n")
+
+    broker.publish(_event(PAGE_ID))
+    broker.publish(_event(PAGE_ID))
+    assert (await anext(stream)).startswith('event: lagged\ndata: {"dropped": 1}')
+    assert (await anext(stream)).startswith("id: 2\n")
+
+    request.disconnected = True
+    await stream.aclose()
+    assert len(broker) == 0
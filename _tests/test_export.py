@@ -0,0 +1,134 @@
+"""Tests for streaming database exports."""
+
+import csv
+import json
+import threading
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.core.integrations.notion._tests.conftest import page_object, rich_text
+from app.core.integrations.notion.client import AsyncNotionClient
+from app.core.integrations.notion.export import _NdjsonWriter, export_database
+from app.core.integrations.notion.schemas import Database, PaginatedPageResponse
+
+DATABASE = {
+    "object": "database",
+    "id": "db_id",
+    "created_time": "2024-01-01T00:00:00.000Z",
+    "last_edited_time": "2024-01-01T00:00:00.000Z",
+    "title": [],
+    "description": [],
+    "properties": {
+        "Name": {"id": "title", "type": "title"},
+        "Tags": {"id": "tags", "type": "multi_select"},
+        "When": {"id": "when", "type": "date"},
+    },
+    "parent": {"type": "workspace", "workspace": True},
+    "url": "https://www.notion.so/db_id",
+    "archived": False,
+    "is_inline": False,
+}
+
+
+def _page(index: int) -> dict:
+    return page_object(
+        f"page_{index}",
+        {
+            "Name": {"id": "title", "type": "title", "title": rich_text(f"Row {index}")},
+            "Tags": {
+                "id": "tags",
+                "type": "multi_select",
+                "multi_select": [{"id": "a", "name": "alpha", "color": "red"}],
+            },
+            "When": {
+                "id": "when",
+                "type": "date",
+                "date": {"start": "2024-02-01", "end": "2024-02-03"},
+            },
+        },
+    )
+
+
+def _batches():
+    return [
+        PaginatedPageResponse.model_validate(
+            {"object": "list", "results": [_page(0), _page(1)], "next_cursor": "c", "has_more": True}
+        ),
+        PaginatedPageResponse.model_validate(
+            {"object": "list", "results": [_page(2)], "next_cursor": None, "has_more": False}
+        ),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_export_ndjson_streams_all_batches(
+    async_notion_client: AsyncNotionClient, tmp_path
+):
+    """Tests that every paginated batch is flattened into NDJSON lines."""
+    path = tmp_path / "export.ndjson"
+
+    with patch.object(
+        AsyncNotionClient, "get_database", new_callable=AsyncMock,
+        return_value=Database.model_validate(DATABASE),
+    ), patch.object(
+        AsyncNotionClient, "query_database", new_callable=AsyncMock,
+        side_effect=_batches(),
+    ) as mock_query:
+        count = await export_database(async_notion_client, "db_id", path)
+
+    rows = [json.loads(line) for line in path.read_text().splitlines()]
+    assert count == 3
+    assert mock_query.await_count == 2
+    assert rows[2]["Name"] == "Row 2"
+    assert rows[0]["Tags"] == ["alpha"]
+    assert rows[0]["When"].startswith("2024-02-01")
+    assert rows[0]["When:end"].startswith("2024-02-03")
+
+
+@pytest.mark.asyncio
+async def test_export_csv_joins_lists(async_notion_client: AsyncNotionClient, tmp_path):
+    """Tests CSV output with a header derived from the database schema."""
+    path = tmp_path / "export.csv"
+
+    with patch.object(
+        AsyncNotionClient, "get_database", new_callable=AsyncMock,
+        return_value=Database.model_validate(DATABASE),
+    ), patch.object(
+        AsyncNotionClient, "query_database", new_callable=AsyncMock,
+        side_effect=_batches(),
+    ):
+        await export_database(async_notion_client, "db_id", path, format="csv")
+
+    with open(path, newline="") as file:
+        rows = list(csv.DictReader(file))
+    assert list(rows[0]) == [
+        "id", "url", "created_time", "last_edited_time", "archived",
+        "Name", "Tags", "When", "When:end",
+    ]
+    assert rows[1]["Tags"] == "alpha"
+
+
+@pytest.mark.asyncio
+async def test_export_writes_off_the_event_loop(
+    async_notion_client: AsyncNotionClient, tmp_path
+):
+    """Tests that each batch is written in one call from a worker thread."""
+    threads = []
+    write = _NdjsonWriter.write
+
+    def record(writer, rows):
+        threads.append(threading.get_ident())
+        write(writer, rows)
+
+    with patch.object(
+        AsyncNotionClient, "get_database", new_callable=AsyncMock,
+        return_value=Database.model_validate(DATABASE),
+    ), patch.object(
+        AsyncNotionClient, "query_database", new_callable=AsyncMock,
+        side_effect=_batches(),
+    ), patch.object(_NdjsonWriter, "write", record):
+        await export_database(async_notion_client, "db_id", tmp_path / "export.ndjson")
+
+    assert len(threads) == 2
+    assert threading.get_ident() not in threads
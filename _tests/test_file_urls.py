@@ -0,0 +1,111 @@
+"""Tests for expiring file URL refresh."""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.core.integrations.notion._tests.conftest import page_object
+from app.core.integrations.notion.client import AsyncNotionClient
+from app.core.integrations.notion.file_urls import FileUrlRefresher, page_expiry
+from app.core.integrations.notion.schemas import FilesProperty, Page
+
+NOW = datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def _files(url: str, expires: datetime) -> dict:
+    return {
+        "id": "files_id",
+        "type": "files",
+        "files": [
+            {
+                "name": "cover.png",
+                "type": "file",
+                "file": {"url": url, "expiry_time": expires.isoformat()},
+            }
+        ],
+    }
+
+
+def _page(expires: datetime) -> Page:
+    return Page.model_validate(
+        page_object(
+            "page_id", {"Images": _files("https://s3.example.com/old", expires)}
+        )
+    )
+
+
+@pytest.mark.asyncio
+async def test_refresh_due_updates_expiring_pages(async_notion_client: AsyncNotionClient):
+    """Tests that pages expiring within the margin get fresh URLs in place."""
+    page = _page(NOW + timedelta(minutes=5))
+    fresh = FilesProperty.model_validate(
+        _files("https://s3.example.com/new", NOW + timedelta(hours=1))
+    )
+    refresher = FileUrlRefresher(async_notion_client, margin=timedelta(minutes=10))
+    refresher.track_page(page)
+
+    with patch.object(
+        AsyncNotionClient, "get_page_property", new_callable=AsyncMock, return_value=fresh
+    ) as mock_property:
+        refreshed = await refresher.refresh_due(now=NOW)
+
+    assert refreshed == 1
+    mock_property.assert_awaited_once_with("page_id", "files_id")
+    assert page.properties["Images"].files[0].file["url"] == "https://s3.example.com/new"
+    assert page_expiry(page) == NOW + timedelta(hours=1)
+
+
+@pytest.mark.asyncio
+async def test_refresh_due_skips_fresh_pages(async_notion_client: AsyncNotionClient):
+    """Tests that URLs outside the margin are left alone."""
+    refresher = FileUrlRefresher(async_notion_client, margin=timedelta(minutes=10))
+    refresher.track_page(_page(NOW + timedelta(minutes=50)))
+
+    with patch.object(
+        AsyncNotionClient, "get_page_property", new_callable=AsyncMock
+    ) as mock_property:
+        assert await refresher.refresh_due(now=NOW) == 0
+
+    mock_property.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_background_refresh_survives_unexpected_errors(
+    async_notion_client: AsyncNotionClient, caplog
+):
+    """Tests that one bad page is logged and does not stop later cycles."""
+    refresher = FileUrlRefresher(
+        async_notion_client, margin=timedelta(days=365 * 100), interval=0
+    )
+    bad = _page(NOW)
+    good = _page(NOW).model_copy(update={"id": "good_id"})
+    refresher.track_page(bad)
+    refresher.track_page(good)
+    calls: list[str] = []
+
+    async def get_page_property(page_id, property_id):
+        calls.append(page_id)
+        if page_id == "page_id":
+            raise KeyError("url")
+        return good.properties["Images"]
+
+    with patch.object(
+        AsyncNotionClient,
+        "get_page_property",
+        new_callable=AsyncMock,
+        side_effect=get_page_property,
+    ):
+        async def three_cycles():
+            while calls.count("good_id") < 3:
+                await asyncio.sleep(0.01)
+
+        refresher.start()
+        try:
+            await asyncio.wait_for(three_cycles(), timeout=1)
+        finally:
+            await refresher.stop()
+
+    assert calls.count("page_id") >= 2
+    assert "Failed to refresh file URLs" in caplog.text
@@ -0,0 +1,97 @@
+"""Tests for the local filter and sort compiler."""
+
+import pytest
+
+from app.core.integrations.notion._tests.conftest import page_object, rich_text
+from app.core.integrations.notion.filters import (
+    FilterError,
+    compile_filter,
+    query_pages,
+)
+from app.core.integrations.notion.schemas import Page, QueryDatabasePayload
+
+
+def _page(page_id: str, name: str, count: float | None, tags: list[str], due: str | None) -> Page:
+    return Page.model_validate(
+        page_object(
+            page_id,
+            {
+                "Name": {"id": "title", "type": "title", "title": rich_text(name)},
+                "Count": {"id": "cnt", "type": "number", "number": count},
+                "Tags": {
+                    "id": "tags",
+                    "type": "multi_select",
+                    "multi_select": [
+                        {"id": tag, "name": tag, "color": "default"} for tag in tags
+                    ],
+                },
+                "Due": {
+                    "id": "due",
+                    "type": "date",
+                    "date": {"start": due} if due else None,
+                },
+                "Done": {"id": "done", "type": "checkbox", "checkbox": count == 1},
+            },
+            last_edited_time="2024-01-02T00:00:00.000Z",
+        )
+    )
+
+
+PAGES = [
+    _page("a", "Alpha launch", 3, ["news"], "2024-03-01"),
+    _page("b", "Beta notes", None, ["news", "draft"], None),
+    _page("c", "Gamma", 1, [], "2024-02-15T10:00:00.000Z"),
+]
+
+
+def test_compound_filter():
+    """Tests nested and/or filters over several property types."""
+    predicate = compile_filter(
+        {
+            "or": [
+                {"property": "Tags", "multi_select": {"contains": "draft"}},
+                {
+                    "and": [
+                        {"property": "Count", "number": {"greater_than": 2}},
+                        {"property": "Name", "title": {"contains": "LAUNCH"}},
+                    ]
+                },
+            ]
+        }
+    )
+
+    assert [page.id for page in PAGES if predicate(page)] == ["a", "b"]
+
+
+def test_date_and_checkbox_filters():
+    """Tests date-only operands and checkbox conditions."""
+    before = compile_filter({"property": "Due", "date": {"before": "2024-03-01"}})
+    on_day = compile_filter({"property": "Due", "date": {"equals": "2024-02-15"}})
+    done = compile_filter({"property": "Done", "checkbox": {"equals": True}})
+
+    assert [page.id for page in PAGES if before(page)] == ["c"]
+    assert [page.id for page in PAGES if on_day(page)] == ["c"]
+    assert [page.id for page in PAGES if done(page)] == ["c"]
+
+
+def test_compiled_filters_are_reused():
+    """Tests that equal filters compile to the same predicate."""
+    first = compile_filter({"property": "Count", "number": {"is_empty": True}})
+    second = compile_filter({"property": "Count", "number": {"is_empty": True}})
+
+    assert first is second
+
+
+def test_query_pages_sorts_with_empty_values_last():
+    """Tests multi-key sorting with descending numbers."""
+    payload = QueryDatabasePayload(
+        sorts=[{"property": "Count", "direction": "descending"}]
+    )
+
+    assert [page.id for page in query_pages(PAGES, payload)] == ["a", "c", "b"]
+
+
+def test_unsupported_condition():
+    """Tests that unknown operators are rejected at compile time."""
+    with pytest.raises(FilterError):
+        compile_filter({"property": "Count", "number": {"between": [1, 2]}})
@@ -0,0 +1,80 @@
+"""Tests for columnar property frames."""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from app.core.integrations.notion._tests.conftest import page_object  # noqa: E402
+from app.core.integrations.notion.frame import (  # noqa: E402
+    CategoricalColumn,
+    MultiCategoricalColumn,
+    parse_dates,
+    to_frame,
+)
+from app.core.integrations.notion.schemas import Page  # noqa: E402
+
+
+def _page(index: int, status: str | None, tags: list[str], amount: float | None, due: str | None) -> Page:
+    return Page.model_validate(
+        page_object(
+            f"page_{index}",
+            {
+                "Status": {
+                    "id": "st",
+                    "type": "select",
+                    "select": {"id": status, "name": status, "color": "red"} if status else None,
+                },
+                "Tags": {
+                    "id": "tg",
+                    "type": "multi_select",
+                    "multi_select": [{"id": t, "name": t, "color": "red"} for t in tags],
+                },
+                "Amount": {"id": "am", "type": "number", "number": amount},
+                "Due": {"id": "du", "type": "date", "date": {"start": due} if due else None},
+            },
+            last_edited_time="2024-01-02T00:00:00.000Z",
+        )
+    )
+
+
+PAGES = [
+    _page(0, "open", ["a", "b"], 1.5, "2024-03-01"),
+    _page(1, None, [], None, None),
+    _page(2, "done", ["b"], 2.5, "2024-03-02T12:00:00.000-02:00"),
+    _page(3, "open", ["c"], 4.0, "2024-03-03T09:30:00.000Z"),
+]
+
+
+def test_columns_are_typed():
+    """Tests the dtype of each property column."""
+    frame = to_frame(PAGES)
+
+    assert len(frame) == 4
+    assert frame["Amount"].dtype == np.float64
+    assert np.nansum(frame["Amount"]) == 8.0
+    assert frame["Due"].dtype == np.dtype("datetime64[us]")
+    assert np.isnat(frame["Due"][1])
+    assert frame["Due"][2] == np.datetime64("2024-03-02T14:00:00")
+
+
+def test_selects_are_dictionary_encoded():
+    """Tests select and multi-select encodings and vectorized masks."""
+    frame = to_frame(PAGES)
+    status = frame["Status"]
+    tags = frame["Tags"]
+
+    assert isinstance(status, CategoricalColumn)
+    assert status.categories == ["open", "done"]
+    assert status.codes.tolist() == [0, -1, 1, 0]
+    assert status.value_counts() == {"open": 2, "done": 1}
+    assert isinstance(tags, MultiCategoricalColumn)
+    assert tags.contains("b").tolist() == [True, False, True, False]
+    assert tags.to_lists() == [["a", "b"], [], ["b"], ["c"]]
+
+
+def test_parse_dates_handles_offsets():
+    """Tests bulk parsing of mixed date formats."""
+    parsed = parse_dates(["2024-01-01", "2024-01-01T05:00:00+05:00", None])
+
+    assert parsed.tolist()[1].isoformat() == "2024-01-01T00:00:00"
+    assert np.isnat(parsed[2])
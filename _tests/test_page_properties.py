@@ -0,0 +1,82 @@
+"""Tests for paginated, typed page property retrieval."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.core.integrations.notion.client import AsyncNotionClient
+from app.core.integrations.notion.schemas import Number, Relation, Title
+
+
+def _relation_page(ids: list[str], cursor: str | None) -> dict:
+    return {
+        "object": "list",
+        "results": [
+            {"object": "property_item", "id": "rel", "type": "relation", "relation": {"id": i}}
+            for i in ids
+        ],
+        "next_cursor": cursor,
+        "has_more": cursor is not None,
+        "type": "property_item",
+        "property_item": {"id": "rel", "next_url": None, "type": "relation", "relation": {}},
+    }
+
+
+@pytest.mark.asyncio
+async def test_get_page_property_follows_cursors(async_notion_client: AsyncNotionClient):
+    """Tests that a relation longer than one page is fetched completely."""
+    responses = [
+        _relation_page([f"p{i}" for i in range(25)], "cursor_1"),
+        _relation_page(["p25", "p26"], None),
+    ]
+
+    with patch.object(
+        AsyncNotionClient, "_request", new_callable=AsyncMock, side_effect=responses
+    ) as mock_request:
+        prop = await async_notion_client.get_page_property("page_id", "rel")
+
+    assert isinstance(prop, Relation)
+    assert len(prop.relation) == 27
+    assert prop.relation[-1] == {"id": "p26"}
+    assert mock_request.await_args_list[1].kwargs["params"] == {"start_cursor": "cursor_1"}
+
+
+@pytest.mark.asyncio
+async def test_get_page_properties_validates_each_type(
+    async_notion_client: AsyncNotionClient,
+):
+    """Tests concurrent retrieval with a model per property type."""
+    title = {
+        "object": "list",
+        "results": [
+            {
+                "object": "property_item",
+                "id": "title",
+                "type": "title",
+                "title": {
+                    "type": "text",
+                    "text": {"content": "Hello"},
+                    "plain_text": "Hello",
+                    "annotations": {},
+                },
+            }
+        ],
+        "next_cursor": None,
+        "has_more": False,
+        "type": "property_item",
+        "property_item": {"id": "title", "next_url": None, "type": "title", "title": {}},
+    }
+    number = {"object": "property_item", "id": "num", "type": "number", "number": 4}
+
+    async def request(method, endpoint, payload=None, params=None):
+        return title if endpoint.endswith("/title") else number
+
+    with patch.object(
+        AsyncNotionClient, "_request", new_callable=AsyncMock, side_effect=request
+    ):
+        props = await async_notion_client.get_page_properties("page_id", ["title", "num"])
+
+    assert isinstance(props["title"], Title)
+    assert props["title"].title[0].plain_text == "Hello"
+    assert isinstance(props["num"], Number)
+    assert props["num"].number == 4
@@ -0,0 +1,71 @@
+"""Tests for the cross-process rate limiter."""
+
+import asyncio
+import sqlite3
+import time
+
+import pytest
+
+from app.core.integrations.notion.rate_limit import (
+    SharedRateLimiter,
+    SQLiteTokenBucketStore,
+    rate_limiter_from_env,
+)
+
+
+@pytest.mark.asyncio
+async def test_limiters_on_one_store_share_the_budget(tmp_path):
+    """Tests that limiters in different processes together stay under the rate."""
+    path = str(tmp_path / "rate_limit.db")
+    # * Separate stores stand in for separate processes
+    first = SharedRateLimiter(SQLiteTokenBucketStore(path), "a", rate=20, capacity=1)
+    second = SharedRateLimiter(SQLiteTokenBucketStore(path), "a", rate=20, capacity=1)
+
+    start = time.monotonic()
+    await asyncio.gather(*(limiter.acquire() for limiter in [first, second] * 3))
+    elapsed = time.monotonic() - start
+
+    # * One token up front, then five more at 20 per second
+    assert elapsed >= 0.24
+
+
+@pytest.mark.asyncio
+async def test_try_acquire_does_not_wait_or_overdraw(tmp_path):
+    """Tests that try_acquire only succeeds when a token is free."""
+    store = SQLiteTokenBucketStore(str(tmp_path / "rate_limit.db"))
+    limiter = SharedRateLimiter(store, key="integration", rate=1, capacity=2)
+
+    assert limiter.try_acquire()
+    assert limiter.try_acquire()
+    assert not limiter.try_acquire()
+    assert store.reserve("integration", 1, rate=1, capacity=2) == pytest.approx(
+        1, abs=0.1
+    )
+
+
+def test_try_acquire_gives_up_while_another_process_holds_the_lock(tmp_path):
+    """Tests that try_acquire does not block the event loop on a busy store."""
+    path = str(tmp_path / "rate_limit.db")
+    limiter = SharedRateLimiter(SQLiteTokenBucketStore(path), "a", rate=1, capacity=2)
+    other = sqlite3.connect(path, isolation_level=None)
+    other.execute("BEGIN IMMEDIATE")
+
+    start = time.monotonic()
+    try:
+        assert not limiter.try_acquire()
+    finally:
+        other.execute("ROLLBACK")
+    assert time.monotonic() - start < 1
+    assert limiter.try_acquire()
+
+
+def test_integrations_get_separate_buckets(monkeypatch, tmp_path):
+    """Tests that limiters of different tokens do not share a budget."""
+    monkeypatch.setenv("NOTION_RATE_LIMIT_PATH", str(tmp_path / "rate_limit.db"))
+    first = rate_limiter_from_env("secret_first")
+    second = rate_limiter_from_env("secret_second")
+
+    assert first.key == rate_limiter_from_env("secret_first").key != second.key
+    assert "secret" not in first.key
+    assert first.try_acquire() and not first.try_acquire(first.capacity)
+    assert second.try_acquire()
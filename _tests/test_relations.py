@@ -0,0 +1,128 @@
+"""Tests for the batched relation graph resolver."""
+
+import httpx
+import pytest
+
+from app.core.integrations.notion.client import AsyncNotionClient
+from app.core.integrations.notion.emulator import NotionEmulator
+from app.core.integrations.notion.relations import resolve_relations
+from app.core.integrations.notion.schemas import Page
+
+
+def title(text: str) -> dict:
+    return {"title": [{"text": {"content": text}}]}
+
+
+def relation(*pages: dict) -> dict:
+    return {"relation": [{"id": page["id"]} for page in pages]}
+
+
+def name(page: Page) -> str:
+    return page.properties["Name"].title[0].plain_text
+
+
+@pytest.fixture
+def workspace():
+    emulator = NotionEmulator()
+    teams = emulator.add_database("Teams", {"Name": "title"})
+    authors = emulator.add_database("Authors", {"Name": "title", "Team": "relation"})
+    tags = emulator.add_database("Tags", {"Name": "title"})
+    posts = emulator.add_database(
+        "Posts", {"Name": "title", "Authors": "relation", "Tags": "relation"}
+    )
+    team = emulator.add_page(teams["id"], properties={"Name": title("Core")})
+    people = [
+        emulator.add_page(
+            authors["id"],
+            properties={"Name": title(f"Author {i}"), "Team": relation(team)},
+        )
+        for i in range(3)
+    ]
+    labels = [
+        emulator.add_page(tags["id"], properties={"Name": title(f"Tag {i}")})
+        for i in range(30)
+    ]
+    for i in range(10):
+        emulator.add_page(
+            posts["id"],
+            properties={
+                "Name": title(f"Post {i}"),
+                "Authors": relation(people[i % 3], people[(i + 1) % 3]),
+                # * More than the 25 entries page objects carry
+                "Tags": relation(*labels) if i == 0 else relation(labels[i]),
+            },
+        )
+    return emulator, posts
+
+
+async def _query(client: AsyncNotionClient, database_id: str) -> list[Page]:
+    return (await client.query_database(database_id)).results
+
+
+def _gets(emulator: NotionEmulator, prefix: str) -> int:
+    return sum(
+        1
+        for method, path, _ in emulator.log
+        if method == "GET" and path.startswith(prefix)
+    )
+
+
+@pytest.mark.asyncio
+async def test_each_unique_related_page_is_fetched_once(workspace):
+    """Tests deduplication and the completion of truncated relations."""
+    emulator, posts = workspace
+
+    async with httpx.AsyncClient(transport=emulator.transport) as http:
+        client = AsyncNotionClient("token", http)
+        rows = await _query(client, posts["id"])
+        graph = await resolve_relations(client, rows)
+
+    # * 3 authors and 30 tags, not one fetch per row and relation
+    assert _gets(emulator, "/v1/pages/") == 33 + 1
+    assert len(graph) == 10 + 33
+    first = next(row for row in rows if name(row) == "Post 0")
+    assert len(graph.related(first, "Tags")) == 30
+    assert [name(author) for author in graph.related(first, "Authors")] == [
+        "Author 0",
+        "Author 1",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_depth_and_property_selection(workspace):
+    """Tests following relations of related pages and skipping properties."""
+    emulator, posts = workspace
+
+    async with httpx.AsyncClient(transport=emulator.transport) as http:
+        client = AsyncNotionClient("token", http)
+        rows = await _query(client, posts["id"])
+        graph = await resolve_relations(
+            client, rows, depth=2, properties=["Authors", "Team"]
+        )
+
+    author = graph.related(rows[0], "Authors")[0]
+    assert [name(team) for team in graph.related(author, "Team")] == ["Core"]
+    assert graph.related(rows[0], "Tags") == []
+    assert _gets(emulator, "/v1/pages/") == 3 + 1
+
+
+@pytest.mark.asyncio
+async def test_missing_related_pages_are_recorded():
+    """Tests that relations to deleted or unshared pages do not fail the batch."""
+    emulator = NotionEmulator()
+    database = emulator.add_database("Posts", {"Name": "title", "Links": "relation"})
+    target = emulator.add_page(database["id"], properties={"Name": title("Target")})
+    gone = "0" * 32
+    emulator.add_page(
+        database["id"],
+        properties={"Links": {"relation": [{"id": target["id"]}, {"id": gone}]}},
+    )
+
+    async with httpx.AsyncClient(transport=emulator.transport) as http:
+        client = AsyncNotionClient("token", http)
+        rows = await _query(client, database["id"])
+        graph = await resolve_relations(client, rows)
+
+    assert graph.missing == {gone}
+    source = next(row for row in rows if row.id != target["id"])
+    assert [page.id for page in graph.related(source, "Links")] == [target["id"]]
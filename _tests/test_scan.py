@@ -0,0 +1,94 @@
+"""Tests for sharded database scans."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.core.integrations.notion._tests.conftest import page_object
+from app.core.integrations.notion.client import AsyncNotionClient
+from app.core.integrations.notion.scan import scan_database, split_points
+from app.core.integrations.notion.schemas import (
+    PaginatedPageResponse,
+    QueryDatabasePayload,
+)
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _page(index: int, created: datetime) -> dict:
+    return page_object(f"page_{index}", created_time=created.isoformat())
+
+
+def _fake_query(rows: list[dict]):
+    """Builds a query_database stand-in that honors timestamp ranges and cursors."""
+
+    async def query(database_id: str, payload: QueryDatabasePayload):
+        conditions = []
+        if payload.filter:
+            conditions = payload.filter.get("and", [payload.filter])
+        selected = []
+        for row in rows:
+            created = datetime.fromisoformat(row["created_time"])
+            keep = True
+            for condition in conditions:
+                bound = condition["created_time"]
+                if "on_or_after" in bound:
+                    keep &= created >= datetime.fromisoformat(bound["on_or_after"])
+                if "before" in bound:
+                    keep &= created < datetime.fromisoformat(bound["before"])
+            if keep:
+                selected.append(row)
+        reverse = payload.sorts[0]["direction"] == "descending"
+        selected.sort(key=lambda row: row["created_time"], reverse=reverse)
+        start = int(payload.start_cursor or 0)
+        size = payload.page_size or 100
+        batch = selected[start : start + size]
+        has_more = start + size < len(selected)
+        return PaginatedPageResponse.model_validate(
+            {
+                "object": "list",
+                "results": batch,
+                "next_cursor": str(start + size) if has_more else None,
+                "has_more": has_more,
+            }
+        )
+
+    return query
+
+
+def test_split_points_follow_dense_regions():
+    """Tests that boundaries are placed where the sampled rows are."""
+    dense = [(START + timedelta(minutes=i), START + timedelta(minutes=i), 1.0) for i in range(90)]
+    sparse = [(START + timedelta(days=10), START + timedelta(days=10), 1.0)] * 10
+    end = START + timedelta(days=10)
+
+    points = split_points(dense + sparse, 4, START, end)
+
+    assert len(points) == 3
+    assert all(point < START + timedelta(hours=2) for point in points)
+    assert points == sorted(points)
+
+
+def test_split_points_single_shard():
+    """Tests that a single shard needs no boundaries."""
+    assert split_points([(START, START, 5.0)], 1, START, START) == []
+
+
+@pytest.mark.asyncio
+async def test_scan_database_returns_every_page_once(
+    async_notion_client: AsyncNotionClient,
+):
+    """Tests that a sharded scan returns all rows in timestamp order."""
+    rows = [_page(i, START + timedelta(minutes=i * 7)) for i in range(450)]
+
+    with patch.object(
+        AsyncNotionClient,
+        "query_database",
+        new_callable=AsyncMock,
+        side_effect=_fake_query(rows),
+    ) as mock_query:
+        pages = await scan_database(async_notion_client, "db_id", shards=4)
+
+    assert [page.id for page in pages] == [row["id"] for row in rows]
+    assert mock_query.await_count > 4
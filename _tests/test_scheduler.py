@@ -0,0 +1,115 @@
+"""Tests for priority-aware request scheduling."""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+from app.core.integrations.notion.client import AsyncNotionClient
+from app.core.integrations.notion.rate_limit import AsyncRateLimiter
+from app.core.integrations.notion.scheduler import RequestScheduler, request_priority
+
+
+async def _grant_order(scheduler: RequestScheduler, requests, order: list[str]):
+    async def acquire(label: str, tenant: str, priority: str):
+        await scheduler.acquire(tenant, priority)
+        order.append(label)
+
+    return [
+        asyncio.create_task(acquire(label, tenant, priority))
+        for label, tenant, priority in requests
+    ]
+
+
+@pytest.mark.asyncio
+async def test_interactive_requests_skip_queued_batch_work():
+    """Tests that an interactive request overtakes a backlog of batch requests."""
+    scheduler = RequestScheduler(AsyncRateLimiter(rate=100, capacity=1))
+    order: list[str] = []
+
+    tasks = await _grant_order(
+        scheduler, [(f"batch{i}", "t", "batch") for i in range(5)], order
+    )
+    await asyncio.sleep(0)
+    tasks += await _grant_order(scheduler, [("page", "t", "interactive")], order)
+    await asyncio.gather(*tasks)
+
+    assert order.index("page") <= 1
+    assert scheduler.waiting == 0
+
+
+@pytest.mark.asyncio
+async def test_tenants_share_by_weight():
+    """Tests weighted fair queuing across tenants of one priority class."""
+    scheduler = RequestScheduler(
+        AsyncRateLimiter(rate=1000, capacity=1), tenant_weights={"a": 2.0}
+    )
+    order: list[str] = []
+
+    requests = [("a", "a", "batch")] * 6 + [("b", "b", "batch")] * 6
+    await asyncio.gather(*await _grant_order(scheduler, requests, order))
+
+    assert order[:6].count("a") == 4
+    assert order[:6].count("b") == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiters_are_skipped():
+    """Tests that cancelling a queued request does not stall the queue."""
+    scheduler = RequestScheduler(AsyncRateLimiter(rate=100, capacity=1))
+    await scheduler.acquire()
+    cancelled = asyncio.create_task(scheduler.acquire())
+    await asyncio.sleep(0)
+    cancelled.cancel()
+
+    await asyncio.wait_for(scheduler.acquire(), timeout=1)
+
+    assert scheduler.waiting == 0
+
+
+@pytest.mark.asyncio
+async def test_limiter_errors_fail_the_waiter_without_stalling_the_queue():
+    """Tests that a failing limiter does not leave queued requests pending."""
+
+    class FlakyLimiter:
+        def __init__(self):
+            self.calls = 0
+
+        async def acquire(self):
+            self.calls += 1
+            if self.calls == 1:
+                raise OSError("database is locked")
+
+    scheduler = RequestScheduler(FlakyLimiter())
+    first = asyncio.create_task(scheduler.acquire())
+    second = asyncio.create_task(scheduler.acquire())
+
+    results = await asyncio.wait_for(
+        asyncio.gather(first, second, return_exceptions=True), timeout=1
+    )
+
+    assert isinstance(results[0], OSError)
+    assert results[1] is None
+    assert scheduler.waiting == 0
+
+
+@pytest.mark.asyncio
+async def test_client_schedules_with_its_tenant_and_priority():
+    """Tests that the client passes its tenant and the context's priority."""
+    handler = lambda request: httpx.Response(200, json={"object": "user", "id": "me"})
+    scheduler = RequestScheduler()
+
+    with patch.object(RequestScheduler, "acquire", new_callable=AsyncMock) as acquire:
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http:
+            client = AsyncNotionClient(
+                "token", http, scheduler=scheduler, priority="interactive", tenant="ws"
+            )
+            await client.get_me()
+            with request_priority("batch"):
+                await client.get_me()
+
+    assert [call.args for call in acquire.await_args_list] == [
+        ("ws", "interactive"),
+        ("ws", "batch"),
+    ]
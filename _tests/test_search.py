@@ -0,0 +1,183 @@
+"""Tests for the Search API and the local search index."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from httpx import Request, Response
+
+from app.core.integrations.notion._tests.conftest import page_object, rich_text
+from app.core.integrations.notion.client import AsyncNotionClient
+from app.core.integrations.notion.schemas import Page, SearchPayload
+from app.core.integrations.notion.search_index import SearchIndex
+
+
+def _page(page_id: str, title: str, body: str, edited: str) -> dict:
+    return page_object(
+        page_id,
+        {
+            "Name": {"id": "title", "type": "title", "title": rich_text(title)},
+            "Summary": {"id": "sum", "type": "rich_text", "rich_text": rich_text(body)},
+        },
+        last_edited_time=edited,
+        parent={"type": "workspace", "workspace": True},
+    )
+
+
+@pytest.mark.asyncio
+@patch("httpx.AsyncClient.request", new_callable=AsyncMock)
+async def test_search_success(
+    mock_request: AsyncMock, async_notion_client: AsyncNotionClient
+):
+    """Tests that search posts the payload and validates the results."""
+    mock_request.return_value = Response(
+        200,
+        json={
+            "object": "list",
+            "results": [
+                _page("page_1", "Roadmap", "Q3 goals", "2024-01-02T00:00:00.000Z")
+            ],
+            "next_cursor": None,
+            "has_more": False,
+        },
+        request=Request("POST", "https://api.notion.com/v1/search"),
+    )
+
+    response = await async_notion_client.search(SearchPayload(query="roadmap"))
+
+    assert isinstance(response.results[0], Page)
+    mock_request.assert_called_once_with(
+        "POST",
+        "https://api.notion.com/v1/search",
+        headers=async_notion_client.headers,
+        json={"query": "roadmap"},
+        params=None,
+    )
+
+
+def test_index_ranks_title_matches_first():
+    """Tests BM25 ranking with title boosting."""
+    index = SearchIndex()
+    index.add_page(Page.model_validate(_page("a", "Release notes", "pricing changes", "2024-01-02T00:00:00Z")))
+    index.add_page(Page.model_validate(_page("b", "Pricing", "plans and tiers", "2024-01-03T00:00:00Z")))
+
+    hits = index.search("pricing")
+
+    assert [hit.id for hit in hits] == ["b", "a"]
+    assert index.search("tiers")[0].title == "Pricing"
+
+
+def test_index_only_updates_newer_versions():
+    """Tests incremental updates keyed on last_edited_time."""
+    index = SearchIndex()
+    old = Page.model_validate(_page("a", "Draft", "first", "2024-01-02T00:00:00Z"))
+    new = Page.model_validate(_page("a", "Final", "second", "2024-01-03T00:00:00Z"))
+
+    assert index.add_page(new)
+    assert not index.add_page(old)
+    assert index.search("draft") == []
+    assert len(index) == 1
+
+
+
+@pytest.mark.asyncio
+async def test_refresh_reindexes_edits_within_the_same_minute(
+    async_notion_client: AsyncNotionClient,
+):
+    """Tests that an equal minute-precision timestamp does not hide an edit."""
+    index = SearchIndex()
+    index.add_page(Page.model_validate(_page("a", "Draft", "text", "2024-01-02T00:00:00Z")))
+    results = {
+        "object": "list",
+        "results": [_page("a", "Final", "text", "2024-01-02T00:00:00Z")],
+        "next_cursor": None,
+        "has_more": False,
+    }
+
+    with patch.object(
+        AsyncNotionClient, "_request", new_callable=AsyncMock, return_value=results
+    ):
+        assert await index.refresh(async_notion_client) == 1
+        # * Unchanged content at the same timestamp is not re-indexed
+        assert await index.refresh(async_notion_client) == 0
+
+    assert index.search("draft") == []
+    assert index.search("final")[0].id == "a"
+
+@pytest.mark.asyncio
+async def test_refresh_stops_at_watermark(async_notion_client: AsyncNotionClient):
+    """Tests that refresh only reads results edited since the last refresh."""
+    index = SearchIndex()
+    index.add_page(Page.model_validate(_page("a", "Old", "text", "2024-01-02T00:00:00Z")))
+    results = {
+        "object": "list",
+        "results": [
+            _page("b", "New", "text", "2024-01-05T00:00:00Z"),
+            _page("a", "Old", "text", "2024-01-02T00:00:00Z"),
+            _page("c", "Older", "text", "2024-01-01T00:00:00Z"),
+        ],
+        "next_cursor": None,
+        "has_more": False,
+    }
+
+    with patch.object(
+        AsyncNotionClient, "_request", new_callable=AsyncMock, return_value=results
+    ):
+        changed = await index.refresh(async_notion_client)
+
+    assert changed == 1
+    assert "b" in index and "c" not in index
+
+
+@pytest.mark.asyncio
+async def test_refresh_indexes_databases_with_icon_and_cover(
+    async_notion_client: AsyncNotionClient,
+):
+    """Tests that databases are told apart from pages by their object type."""
+    page = _page("p", "Roadmap", "text", "2024-01-02T00:00:00Z")
+    database = {
+        "object": "database",
+        "id": "d",
+        "created_time": "2024-01-01T00:00:00.000Z",
+        "last_edited_time": "2024-01-03T00:00:00.000Z",
+        "created_by": page["created_by"],
+        "last_edited_by": page["last_edited_by"],
+        "icon": {"type": "emoji", "emoji": "📚"},
+        "cover": {"type": "external", "external": {"url": "https://example.com/c.png"}},
+        "title": [
+            {
+                "type": "text",
+                "text": {"content": "Reading list"},
+                "plain_text": "Reading list",
+                "annotations": {},
+            }
+        ],
+        "description": [],
+        "properties": {"Name": {"id": "title", "type": "title", "title": {}}},
+        "parent": {"type": "page_id", "page_id": "p"},
+        "url": "https://www.notion.so/d",
+        "archived": False,
+        "is_inline": False,
+    }
+
+    async def respond(method: str, endpoint: str, **kwargs) -> dict:
+        if endpoint.startswith("blocks/"):
+            return {"object": "list", "results": [], "next_cursor": None, "has_more": False}
+        return {
+            "object": "list",
+            "results": [database, page],
+            "next_cursor": None,
+            "has_more": False,
+        }
+
+    index = SearchIndex()
+    with patch.object(
+        AsyncNotionClient, "_request", new_callable=AsyncMock, side_effect=respond
+    ) as request:
+        await index.refresh(async_notion_client, include_blocks=True)
+
+    assert [(hit.id, hit.object) for hit in index.search("reading")] == [
+        ("d", "database")
+    ]
+    # * Only the page's content is fetched, not the database's
+    endpoints = [call.args[1] for call in request.call_args_list]
+    assert [e for e in endpoints if e.startswith("blocks/")] == ["blocks/p/children"]
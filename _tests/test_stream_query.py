@@ -0,0 +1,91 @@
+"""Tests for the NDJSON streaming database query endpoint."""
+
+import json
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.core.integrations.notion._tests.conftest import page_object
+from app.core.integrations.notion.api.databases import databases
+from app.core.integrations.notion.client import AsyncNotionClient
+from app.core.integrations.notion.dependencies import get_notion_client
+from app.core.integrations.notion.exceptions import NotionInternalServerError
+from app.core.integrations.notion.schemas import PaginatedPageResponse
+
+
+def _response(ids: list[str], cursor: str | None) -> PaginatedPageResponse:
+    return PaginatedPageResponse.model_validate(
+        {
+            "object": "list",
+            "results": [page_object(page_id) for page_id in ids],
+            "next_cursor": cursor,
+            "has_more": cursor is not None,
+        }
+    )
+
+
+@pytest.fixture
+def app(async_notion_client: AsyncNotionClient) -> FastAPI:
+    app = FastAPI()
+    app.include_router(databases.router, prefix="/databases")
+    app.dependency_overrides[get_notion_client] = lambda: async_notion_client
+    return app
+
+
+async def _stream(app: FastAPI) -> httpx.Response:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+        return await http.post("/databases/db_id/query/stream", json={"page_size": 2})
+
+
+@pytest.mark.asyncio
+async def test_stream_query_follows_cursors(app: FastAPI):
+    """Tests that every page of every batch is streamed as one NDJSON line."""
+    with patch.object(
+        AsyncNotionClient,
+        "query_database",
+        new_callable=AsyncMock,
+        side_effect=[_response(["a", "b"], "next"), _response(["c"], None)],
+    ) as mock_query:
+        response = await _stream(app)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["id"] for line in lines] == ["a", "b", "c"]
+    assert mock_query.await_args_list[1].args[1].start_cursor == "next"
+
+
+@pytest.mark.asyncio
+async def test_stream_query_reports_errors_in_band(app: FastAPI):
+    """Tests that a failure after the first batch ends the stream with an error line."""
+    with patch.object(
+        AsyncNotionClient,
+        "query_database",
+        new_callable=AsyncMock,
+        side_effect=[_response(["a"], "next"), NotionInternalServerError("Down")],
+    ):
+        response = await _stream(app)
+
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines[0]["id"] == "a"
+    assert lines[-1]["object"] == "error"
+
+
+@pytest.mark.asyncio
+async def test_stream_query_maps_first_batch_errors_to_status(app: FastAPI):
+    """Tests that a query failing before streaming starts returns its status."""
+    error = httpx.Response(
+        400,
+        json={"object": "error", "status": 400, "code": "validation_error", "message": "Bad filter"},
+        request=httpx.Request("POST", "https://api.notion.com/v1/databases/db_id/query"),
+    )
+    with patch.object(
+        AsyncNotionClient, "_send", new_callable=AsyncMock, return_value=error
+    ):
+        response = await _stream(app)
+
+    assert response.status_code == 400
+    assert "Bad filter" in response.json()["detail"]
@@ -0,0 +1,104 @@
+"""Tests for the sync client facade."""
+
+import threading
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.core.integrations.notion import sync_client
+from app.core.integrations.notion.client import AsyncNotionClient
+from app.core.integrations.notion.schemas import User
+from app.core.integrations.notion.sync_client import (
+    EventLoopThread,
+    SyncNotionClient,
+    get_loop_thread,
+    get_sync_notion_client,
+)
+
+
+@pytest.fixture
+def loop_thread():
+    thread = EventLoopThread()
+    yield thread
+    thread.stop()
+
+
+def test_calls_run_on_one_loop_with_one_pool(loop_thread: EventLoopThread):
+    """Tests that sync calls share the loop thread and its connection pool."""
+    threads = []
+
+    async def request(method, endpoint, payload=None, params=None):
+        threads.append(threading.current_thread())
+        return {"object": "user", "id": endpoint.split("/")[-1]}
+
+    with patch.object(
+        AsyncNotionClient, "_request", new_callable=AsyncMock, side_effect=request
+    ):
+        with SyncNotionClient("token", loop_thread=loop_thread) as client:
+            pool = client.async_client.client
+            first = client.get_user("a")
+            second = client.get_user("b")
+            assert client.async_client.client is pool
+
+    assert isinstance(first, User)
+    assert (first.id, second.id) == ("a", "b")
+    assert threads == [loop_thread._thread, loop_thread._thread]
+    assert pool.is_closed
+
+
+def test_iter_methods_return_sync_iterators(loop_thread: EventLoopThread):
+    """Tests that async generators are exposed as regular iterators."""
+    pages = [
+        {
+            "object": "list",
+            "results": [{"object": "user", "id": "a"}],
+            "next_cursor": "c",
+            "has_more": True,
+        },
+        {
+            "object": "list",
+            "results": [{"object": "user", "id": "b"}],
+            "next_cursor": None,
+            "has_more": False,
+        },
+    ]
+
+    with patch.object(
+        AsyncNotionClient, "_request", new_callable=AsyncMock, side_effect=pages
+    ):
+        client = SyncNotionClient("token", loop_thread=loop_thread)
+        ids = [user.id for response in client.iter_users() for user in response.results]
+
+    assert ids == ["a", "b"]
+
+
+def test_get_loop_thread_is_shared():
+    """Tests that the process-wide loop thread is reused."""
+    assert get_loop_thread() is get_loop_thread()
+
+
+def test_shared_clients_are_kept_per_token(monkeypatch, loop_thread: EventLoopThread):
+    """Tests that a new token keeps other clients and closes those of old loops."""
+    monkeypatch.setattr(sync_client, "_sync_clients", {})
+    stale = SyncNotionClient("token", loop_thread=loop_thread)
+    sync_client._sync_clients[(id(loop_thread), "token")] = stale
+    locked = []
+    close = stale.close
+
+    def record_close():
+        locked.append(sync_client._loop_lock.locked())
+        close()
+
+    monkeypatch.setattr(stale, "close", record_close)
+
+    first = get_sync_notion_client("first")
+    second = get_sync_notion_client("second")
+
+    assert get_sync_notion_client("first") is first
+    assert get_sync_notion_client("second") is second
+    assert not first.async_client.client.is_closed
+    assert stale.async_client.client.is_closed
+    assert locked == [False]
+    assert stale not in sync_client._sync_clients.values()
+    first.close()
+    second.close()
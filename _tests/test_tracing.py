@@ -0,0 +1,146 @@
+"""Tests for the phase-level tracing of client calls."""
+
+import logging
+from contextlib import contextmanager
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+from app.core.integrations.notion.client import AsyncNotionClient
+from app.core.integrations.notion.emulator import NotionEmulator
+from app.core.integrations.notion.tracing import (
+    CallTrace,
+    OpenTelemetryTracer,
+    SlowCallLog,
+)
+
+
+class RecordingTracer:
+    """Keeps every traced call and its phases."""
+
+    def __init__(self):
+        self.calls: list[tuple[str, list[str], CallTrace | None]] = []
+
+    @contextmanager
+    def start_call(self, name):
+        phases: list[str] = []
+        record = [name, phases, None]
+
+        class Span:
+            def add_phase(self, phase, start_ns, end_ns, attributes):
+                assert end_ns >= start_ns
+                phases.append(phase)
+
+            def finish(self, trace):
+                record[2] = trace
+
+        yield Span()
+        self.calls.append(tuple(record))
+
+
+@pytest.mark.asyncio
+async def test_calls_report_each_phase_and_retry_sleeps():
+    """Tests the phases and counters of a call that is retried once."""
+    emulator = NotionEmulator()
+    database = emulator.add_database("Tasks", {"Name": "title"})
+    emulator.add_page(database["id"])
+    emulator.fail_next(503)
+    tracer = RecordingTracer()
+
+    async with httpx.AsyncClient(transport=emulator.transport) as http:
+        client = AsyncNotionClient("token", http, tracer=tracer)
+        with patch(
+            "app.core.integrations.notion.decorators.asyncio.sleep", AsyncMock()
+        ):
+            await client.query_database(database["id"])
+
+    ((name, phases, trace),) = tracer.calls
+    assert name == "query_database"
+    assert phases == [
+        "queue",
+        "first_byte",
+        "retry_sleep",
+        "queue",
+        "first_byte",
+        "decode",
+        "validate",
+    ]
+    assert trace.counts["requests"] == 2
+    assert trace.counts["retries"] == 1
+    assert trace.counts["response_bytes"] > 0
+    assert trace.error is None
+
+
+@pytest.mark.asyncio
+async def test_nested_calls_are_part_of_the_outer_call():
+    """Tests that paginated property items are traced as one call."""
+    emulator = NotionEmulator()
+    database = emulator.add_database("Tasks", {"Name": "title"})
+    page = emulator.add_page(database["id"])
+    tracer = RecordingTracer()
+
+    async with httpx.AsyncClient(transport=emulator.transport) as http:
+        client = AsyncNotionClient("token", http, tracer=tracer)
+        await client.get_page_property(page["id"], "title")
+
+    assert [name for name, _, _ in tracer.calls] == ["get_page_property"]
+
+
+@pytest.mark.asyncio
+async def test_slow_calls_are_logged_with_their_breakdown(caplog):
+    """Tests the slow-call log, including for failed calls."""
+    emulator = NotionEmulator()
+
+    async with httpx.AsyncClient(transport=emulator.transport) as http:
+        client = AsyncNotionClient("token", http, slow_calls=SlowCallLog(threshold=0))
+        with caplog.at_level(logging.WARNING, "app.core.integrations.notion.tracing"):
+            await client.get_me()
+            emulator.fail_next(404)
+            with pytest.raises(Exception):
+                await client.get_me()
+
+    messages = [r.getMessage() for r in caplog.records if "Slow Notion" in r.message]
+    assert len(messages) == 2
+    assert "get_me" in messages[0] and "validate" in messages[0]
+    assert "failed with NotionNotFoundError" in messages[1]
+
+
+def test_opentelemetry_tracer_nests_phase_spans():
+    """Tests that phases become child spans of the call span."""
+    pytest.importorskip("opentelemetry")
+    spans = []
+
+    class Span:
+        def __init__(self, name, **kwargs):
+            self.name, self.kwargs, self.attributes = name, kwargs, {}
+            spans.append(self)
+
+        def set_attributes(self, attributes):
+            self.attributes.update(attributes)
+
+        def end(self, end_time=None):
+            self.end_time = end_time
+
+    class Tracer:
+        @contextmanager
+        def start_as_current_span(self, name, **kwargs):
+            yield Span(name, **kwargs)
+
+        def start_span(self, name, **kwargs):
+            return Span(name, **kwargs)
+
+    tracer = OpenTelemetryTracer(Tracer())
+    trace = CallTrace("get_page", phases={"first_byte": 0.5}, counts={"requests": 1})
+    with tracer.start_call("get_page") as span:
+        span.add_phase("first_byte", 10, 20, {})
+        span.finish(trace)
+
+    call, phase = spans
+    assert call.name == "notion.get_page"
+    assert call.attributes == {
+        "notion.requests": 1,
+        "notion.phase.first_byte.seconds": 0.5,
+    }
+    assert phase.name == "notion.first_byte"
+    assert (phase.kwargs["start_time"], phase.end_time) == (10, 20)
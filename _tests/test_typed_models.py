@@ -0,0 +1,144 @@
+"""Tests for the typed page models generated from database schemas."""
+
+import httpx
+import pytest
+
+from app.core.integrations.notion.client import AsyncNotionClient
+from app.core.integrations.notion.emulator import NotionEmulator
+from app.core.integrations.notion.schemas import Database, Number, Select, Title
+from app.core.integrations.notion.typed_models import (
+    build_models,
+    database_models,
+    field_name,
+    model_source,
+)
+
+
+@pytest.fixture
+def tasks():
+    emulator = NotionEmulator()
+    database = emulator.add_database(
+        "My Tasks",
+        {
+            "Name": "title",
+            "Status": {"type": "select", "select": {"options": [{"name": "Done"}]}},
+            "Story Points": "number",
+            "class": "checkbox",
+            "2nd Owner": "people",
+        },
+    )
+    for i in range(3):
+        emulator.add_page(
+            database["id"],
+            properties={
+                "Name": {"title": [{"text": {"content": f"Task {i}"}}]},
+                "Status": {"select": {"name": "Done"}},
+                "Story Points": {"number": i},
+            },
+        )
+    return emulator, database
+
+
+def test_field_names_are_valid_and_unique():
+    """Tests deriving attribute names from arbitrary property names."""
+    taken: set[str] = set()
+    names = [
+        field_name(name, taken)
+        for name in ["Due Date", "due-date", "dueDate", "2nd", "class", "json", "✅"]
+    ]
+
+    assert names == [
+        "due_date",
+        "due_date_2",
+        "due_date_3",
+        "p_2nd",
+        "class_",
+        "json_",
+        "property",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_query_results_have_typed_attributes(tasks):
+    """Tests querying a database through its generated models."""
+    emulator, database = tasks
+
+    async with httpx.AsyncClient(transport=emulator.transport) as http:
+        client = AsyncNotionClient("token", http)
+        models = await database_models(client, database["id"])
+        rows = [
+            row
+            for response in [r async for r in models.iter_query(client)]
+            for row in response.results
+        ]
+
+    assert models.page.__name__ == "MyTasksPage"
+    assert models.fields == {
+        "Name": "name",
+        "Status": "status",
+        "Story Points": "story_points",
+        "class": "class_",
+        "2nd Owner": "p_2nd_owner",
+    }
+    assert len(rows) == 3
+    row = rows[0]
+    assert isinstance(row, models.page)
+    assert isinstance(row.properties.name, Title)
+    assert isinstance(row.properties.status, Select)
+    assert isinstance(row.properties.story_points, Number)
+    assert row.properties.status.select.name == "Done"
+    assert row.properties.class_.checkbox is False
+
+
+def test_emitted_source_matches_runtime_models(tasks):
+    """Tests that the emitted module validates pages like the runtime models."""
+    emulator, database = tasks
+    schema = Database.model_validate(database)
+    page = next(iter(emulator.pages.values()))
+
+    namespace: dict = {}
+    exec(compile(model_source(schema), "<generated>", "exec"), namespace)
+    runtime = build_models(schema)
+
+    assert namespace["DATABASE_ID"] == database["id"]
+    generated = namespace["MyTasksPage"].model_validate(page)
+    assert generated.model_dump() == runtime.validate_page(page).model_dump()
+
+
+def test_pages_missing_a_property_fail_validation(tasks):
+    """Tests that a renamed property is reported instead of silently dropped."""
+    emulator, database = tasks
+    models = build_models(Database.model_validate(database))
+    page = next(iter(emulator.pages.values()))
+    page = {**page, "properties": dict(page["properties"])}
+    page["properties"]["Points"] = page["properties"].pop("Story Points")
+
+    with pytest.raises(ValueError, match="Story Points"):
+        models.validate_page(page)
+
+
+def test_titles_with_mentions_and_equations_validate(tasks):
+    """Tests that rich text items other than plain text are accepted."""
+    emulator, database = tasks
+    models = build_models(Database.model_validate(database))
+    page = next(iter(emulator.pages.values()))
+    annotations = page["properties"]["Name"]["title"][0]["annotations"]
+    mention = {
+        "type": "mention",
+        "mention": {"type": "user", "user": {"object": "user", "id": "u1"}},
+        "plain_text": "@Ada",
+        "annotations": annotations,
+    }
+    equation = {
+        "type": "equation",
+        "equation": {"expression": "E = mc^2"},
+        "plain_text": "E = mc^2",
+        "annotations": annotations,
+    }
+    name = {**page["properties"]["Name"], "title": [mention, equation]}
+    page = {**page, "properties": {**page["properties"], "Name": name}}
+
+    row = models.validate_page(page)
+
+    assert [item.type for item in row.properties.name.title] == ["mention", "equation"]
+    assert row.properties.name.title[0].mention["user"]["id"] == "u1"
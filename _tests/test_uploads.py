@@ -0,0 +1,88 @@
+"""Tests for streaming file uploads."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from httpx import Request, Response
+
+from app.core.integrations.notion.client import AsyncNotionClient
+from app.core.integrations.notion.schemas import FileUpload
+from app.core.integrations.notion.uploads import attach_to_property, upload_file
+
+PENDING = FileUpload(object="file_upload", id="upload_id", status="pending", filename="a.bin")
+UPLOADED = PENDING.model_copy(update={"status": "uploaded"})
+
+
+async def _chunks(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+@pytest.mark.asyncio
+async def test_multi_part_upload_sends_every_part(async_notion_client: AsyncNotionClient):
+    """Tests that a large stream is re-chunked into numbered parts."""
+    data = bytes(range(256)) * 10
+
+    with patch.object(
+        AsyncNotionClient, "create_file_upload", new_callable=AsyncMock, return_value=PENDING
+    ) as mock_create, patch.object(
+        AsyncNotionClient, "send_file_upload", new_callable=AsyncMock, return_value=PENDING
+    ) as mock_send, patch.object(
+        AsyncNotionClient, "complete_file_upload", new_callable=AsyncMock, return_value=UPLOADED
+    ) as mock_complete:
+        with patch("app.core.integrations.notion.uploads.MAX_SINGLE_PART_SIZE", 1000):
+            result = await upload_file(
+                async_notion_client, _chunks(data, 300), "a.bin", size=len(data), part_size=1000
+            )
+
+    assert result.status == "uploaded"
+    assert mock_create.await_args.args[0].number_of_parts == 3
+    sent = sorted(mock_send.await_args_list, key=lambda call: call.args[4])
+    assert [call.args[4] for call in sent] == [1, 2, 3]
+    assert b"".join(call.args[1] for call in sent) == data
+    mock_complete.assert_awaited_once_with("upload_id")
+
+
+@pytest.mark.asyncio
+async def test_unsized_stream_larger_than_one_part(async_notion_client: AsyncNotionClient):
+    """Tests that multi-part uploads need the size up front."""
+    with patch.object(AsyncNotionClient, "create_file_upload", new_callable=AsyncMock):
+        with pytest.raises(ValueError):
+            await upload_file(
+                async_notion_client, _chunks(b"x" * 50, 10), "a.txt", part_size=20
+            )
+
+
+@pytest.mark.asyncio
+@patch("httpx.AsyncClient.request", new_callable=AsyncMock)
+async def test_send_file_upload_is_multipart(
+    mock_request: AsyncMock, async_notion_client: AsyncNotionClient
+):
+    """Tests that content is sent as form data without the JSON content type."""
+    mock_request.return_value = Response(
+        200,
+        json=UPLOADED.model_dump(mode="json"),
+        request=Request("POST", "https://api.notion.com/v1/file_uploads/upload_id/send"),
+    )
+
+    await async_notion_client.send_file_upload("upload_id", b"abc", "a.txt", "text/plain")
+
+    kwargs = mock_request.call_args.kwargs
+    assert kwargs["files"] == {"file": ("a.txt", b"abc", "text/plain")}
+    assert "Content-Type" not in kwargs["headers"]
+
+
+@pytest.mark.asyncio
+async def test_attach_to_property(async_notion_client: AsyncNotionClient):
+    """Tests that attaching references the upload by ID."""
+    with patch.object(AsyncNotionClient, "update_page", new_callable=AsyncMock) as mock_update:
+        await attach_to_property(async_notion_client, "page_id", "Files", [UPLOADED])
+
+    payload = mock_update.await_args.args[1]
+    assert payload.properties == {
+        "Files": {
+            "files": [
+                {"type": "file_upload", "file_upload": {"id": "upload_id"}, "name": "a.bin"}
+            ]
+        }
+    }
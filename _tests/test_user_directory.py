@@ -0,0 +1,72 @@
+"""Tests for the workspace user directory."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.core.integrations.notion._tests.conftest import page_object
+from app.core.integrations.notion.client import AsyncNotionClient
+from app.core.integrations.notion.exceptions import NotionNotFoundError
+from app.core.integrations.notion.schemas import Page, PaginatedUserResponse, User
+from app.core.integrations.notion.user_directory import UserDirectory
+
+
+def _user(user_id: str, name: str | None = None) -> dict:
+    return {"object": "user", "id": user_id, "name": name}
+
+
+def _page(page_id: str, author: str, people: list[str]) -> Page:
+    return Page.model_validate(
+        page_object(
+            page_id,
+            {
+                "Owners": {
+                    "id": "own",
+                    "type": "people",
+                    "people": [_user(person) for person in people],
+                }
+            },
+            user=_user(author),
+        )
+    )
+
+
+@pytest.mark.asyncio
+async def test_refresh_paginates_all_users(async_notion_client: AsyncNotionClient):
+    """Tests that refresh follows cursors through /users."""
+    batches = [
+        PaginatedUserResponse(object="list", results=[User(**_user("u1", "Ada"))], next_cursor="c", has_more=True),
+        PaginatedUserResponse(object="list", results=[User(**_user("u2", "Bo"))], next_cursor=None, has_more=False),
+    ]
+
+    with patch.object(
+        AsyncNotionClient, "list_users", new_callable=AsyncMock, side_effect=batches
+    ) as mock_list:
+        directory = UserDirectory(async_notion_client)
+        assert await directory.refresh() == 2
+
+    assert mock_list.await_args_list[1].kwargs["start_cursor"] == "c"
+    assert directory.get("u2").name == "Bo"
+
+
+@pytest.mark.asyncio
+async def test_hydrate_fetches_unknown_users_once(async_notion_client: AsyncNotionClient):
+    """Tests that a result set is hydrated with one fetch per unknown user."""
+    directory = UserDirectory(async_notion_client)
+    directory._users["u1"] = User(**_user("u1", "Ada"))
+    pages = [_page("p1", "u1", ["u2"]), _page("p2", "u2", ["u1", "gone"])]
+
+    async def get_user(user_id: str) -> User:
+        if user_id == "gone":
+            raise NotionNotFoundError("Not found")
+        return User(**_user(user_id, "Bo"))
+
+    with patch.object(
+        AsyncNotionClient, "get_user", new_callable=AsyncMock, side_effect=get_user
+    ) as mock_get:
+        hydrated = await directory.hydrate(pages)
+
+    assert sorted(call.args[0] for call in mock_get.await_args_list) == ["gone", "u2"]
+    assert hydrated == 6
+    assert pages[1].created_by.name == "Bo"
+    assert [user.name for user in pages[1].properties["Owners"].people] == ["Ada", None]
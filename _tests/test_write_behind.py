@@ -0,0 +1,117 @@
+"""Tests for write-behind coalescing of page updates."""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.core.integrations.notion.client import AsyncNotionClient
+from app.core.integrations.notion.exceptions import NotionConflictError
+from app.core.integrations.notion.schemas import Page, UpdatePagePayload
+from app.core.integrations.notion.write_behind import PageUpdateBuffer
+
+PAGE = {
+    "object": "page",
+    "id": "page_id",
+    "created_time": "2024-01-01T00:00:00.000Z",
+    "last_edited_time": "2024-01-01T00:00:00.000Z",
+    "created_by": {"object": "user", "id": "user_id"},
+    "last_edited_by": {"object": "user", "id": "user_id"},
+    "archived": False,
+    "properties": {},
+    "parent": {"type": "database_id", "database_id": "db_id"},
+    "url": "https://www.notion.so/page_id",
+}
+
+
+@pytest.mark.asyncio
+async def test_updates_are_merged_into_one_patch(
+    async_notion_client: AsyncNotionClient,
+):
+    """Tests that quick successive updates are sent as one merged PATCH."""
+    buffer = PageUpdateBuffer(async_notion_client, window=0.01)
+    page = Page.model_validate(PAGE)
+
+    with patch.object(
+        AsyncNotionClient, "update_page", new_callable=AsyncMock, return_value=page
+    ) as mock_update:
+        first = buffer.submit(
+            "page_id", UpdatePagePayload(properties={"Count": {"number": 1}})
+        )
+        second = buffer.submit(
+            "page_id",
+            UpdatePagePayload(
+                properties={
+                    "Count": {"number": 2},
+                    "Status": {"status": {"name": "Done"}},
+                }
+            ),
+        )
+        third = buffer.submit(
+            "page_id", UpdatePagePayload(properties={}, archived=True)
+        )
+
+        assert await first is page
+        assert await second is page
+        assert await third is page
+
+    mock_update.assert_awaited_once()
+    page_id, payload = mock_update.await_args.args
+    assert page_id == "page_id"
+    assert payload.model_dump(exclude_unset=True) == {
+        "properties": {"Count": {"number": 2}, "Status": {"status": {"name": "Done"}}},
+        "archived": True,
+    }
+
+
+@pytest.mark.asyncio
+async def test_close_flushes_and_propagates_errors(
+    async_notion_client: AsyncNotionClient,
+):
+    """Tests that close sends buffered updates and errors reach every caller."""
+    buffer = PageUpdateBuffer(async_notion_client, window=60)
+
+    with patch.object(
+        AsyncNotionClient,
+        "update_page",
+        new_callable=AsyncMock,
+        side_effect=NotionConflictError("Conflict"),
+    ) as mock_update:
+        future = buffer.submit(
+            "a", UpdatePagePayload(properties={"Count": {"number": 1}})
+        )
+        await buffer.close()
+
+    assert mock_update.await_count == 1
+    with pytest.raises(NotionConflictError):
+        await future
+    with pytest.raises(RuntimeError):
+        buffer.submit("a", UpdatePagePayload(properties={}))
+
+
+@pytest.mark.asyncio
+async def test_cancelled_flush_cancels_waiting_callers(
+    async_notion_client: AsyncNotionClient,
+):
+    """Tests that callers do not hang when a flush is cancelled, e.g. at shutdown."""
+    buffer = PageUpdateBuffer(async_notion_client, window=60)
+    started = asyncio.Event()
+
+    async def update_page(page_id, payload):
+        started.set()
+        await asyncio.sleep(60)
+
+    with patch.object(
+        AsyncNotionClient, "update_page", new_callable=AsyncMock, side_effect=update_page
+    ):
+        future = buffer.submit(
+            "a", UpdatePagePayload(properties={"Count": {"number": 1}})
+        )
+        flush = asyncio.create_task(buffer.flush())
+        await started.wait()
+        for task in list(buffer._inflight.values()):
+            task.cancel()
+        await flush
+
+    with pytest.raises(asyncio.CancelledError):
+        await asyncio.wait_for(future, timeout=1)
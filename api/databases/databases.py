@@ -1,9 +1,12 @@
 """API router for Notion database endpoints."""
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 
 from app.core.integrations.notion.client import AsyncNotionClient
 from app.core.integrations.notion.dependencies import get_notion_client
+from app.core.integrations.notion.exceptions import NotionAPIError
+from app.core.integrations.notion.export import stream_ndjson_pages
 from app.core.integrations.notion.schemas import (
     Database,
     PaginatedPageResponse,
@@ -30,3 +33,24 @@ async def query_database(
 ) -> PaginatedPageResponse:
     """Query a Notion database."""
     return await client.query_database(database_id, payload.dict(exclude_unset=True))
+
+
+@router.post("/{database_id}/query/stream", response_class=StreamingResponse)
+async def stream_query_database(
+    database_id: str,
+    payload: QueryDatabasePayload | None = None,
+    client: AsyncNotionClient = Depends(get_notion_client),
+) -> StreamingResponse:
+    """
+    Query a Notion database, streaming every matching page as NDJSON.
+
+    Cursors are followed server-side, so the response holds all results
+    regardless of `page_size`, which only sets the batch size. A query that
+    fails outright returns its error status; a failure after streaming has
+    started ends the stream with an error line.
+    """
+    try:
+        lines = await stream_ndjson_pages(client, database_id, payload)
+    except NotionAPIError as e:
+        raise HTTPException(status_code=e.status_code or 502, detail=str(e))
+    return StreamingResponse(lines, media_type="application/x-ndjson")
@@ -0,0 +1,390 @@
+"""Minimal-patch synchronization of a page's block tree with a desired tree."""
+
+import asyncio
+import json
+import logging
+from dataclasses import dataclass, field
+from typing import Any
+
+from app.core.integrations.notion.client import AsyncNotionClient
+from app.core.integrations.notion.schemas import AppendBlockChildrenPayload, Block
+
+# * Configure logging
+logger = logging.getLogger(__name__)
+
+# * Notion accepts at most 100 children per append request
+MAX_CHILDREN_PER_REQUEST = 100
+DEFAULT_MAX_CONCURRENCY = 4
+
+# * Deleting these blocks would archive a whole page or database, so they
+# * are never deleted or updated
+PINNED_TYPES = {"child_page", "child_database"}
+
+# * Response-only or derived keys ignored when comparing block content
+_IGNORED_KEYS = {"children", "plain_text", "href"}
+# * Values the API fills in when a request leaves them out
+_DEFAULTS: dict[str, Any] = {
+    "bold": False,
+    "italic": False,
+    "strikethrough": False,
+    "underline": False,
+    "code": False,
+    "color": "default",
+    "type": "text",
+}
+_MISSING = object()
+
+
+@dataclass
+class BlockNode:
+    """An existing block with its children, as fetched from the API."""
+
+    block: Block
+    children: list["BlockNode"] = field(default_factory=list)
+
+    @property
+    def content(self) -> dict[str, Any]:
+        return getattr(self.block, self.block.type, None) or {}
+
+
+@dataclass
+class UpdateBlock:
+    """Replaces the content of an existing block, keeping its ID."""
+
+    parent_id: str
+    block_id: str
+    type: str
+    content: dict[str, Any]
+
+
+@dataclass
+class DeleteBlock:
+    """Deletes an existing block and its children."""
+
+    parent_id: str
+    block_id: str
+
+
+@dataclass
+class InsertBlocks:
+    """Inserts new blocks after an existing child, or at the end if `after` is None."""
+
+    parent_id: str
+    after: str | None
+    children: list[dict[str, Any]]
+
+
+BlockOperation = UpdateBlock | DeleteBlock | InsertBlocks
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, list):
+        return [_normalize(item) for item in value]
+    if not isinstance(value, dict):
+        return value
+    normalized = {}
+    for key, item in value.items():
+        if key in _IGNORED_KEYS or item is None or _DEFAULTS.get(key, _MISSING) == item:
+            continue
+        item = _normalize(item)
+        if key == "annotations" and not item:
+            continue
+        normalized[key] = item
+    return normalized
+
+
+def content_signature(content: dict[str, Any]) -> str:
+    """
+    Returns a canonical form of block content for equality checks.
+
+    Children, response-only fields such as `plain_text`, and values equal to
+    the API's defaults are ignored, so a block written from a desired tree
+    compares equal to the block the API returns for it.
+    """
+    return json.dumps(_normalize(content), sort_keys=True)
+
+
+def _desired_content(block: dict[str, Any]) -> dict[str, Any]:
+    return block.get(block["type"]) or {}
+
+
+def _desired_children(block: dict[str, Any]) -> list[dict[str, Any]]:
+    return _desired_content(block).get("children") or []
+
+
+def _without_children(block: dict[str, Any]) -> dict[str, Any]:
+    content = {k: v for k, v in _desired_content(block).items() if k != "children"}
+    return {**block, block["type"]: content}
+
+
+async def fetch_block_tree(client: AsyncNotionClient, block_id: str) -> list[BlockNode]:
+    """
+    Fetches the children of a block recursively and concurrently.
+
+    The content of child pages and databases is not descended into.
+
+    Args:
+        client: The Notion client.
+        block_id: The ID of the page or block.
+
+    Returns:
+        The child blocks with their own children.
+    """
+    if client.cache is not None:
+        # * Diff against the current content, not a cached copy
+        await client.cache.invalidate("block_children", f"{block_id}:", prefix=True)
+    blocks: list[Block] = []
+    async for response in client.iter_block_children(block_id, page_size=100):
+        blocks.extend(response.results)
+
+    async def node(block: Block) -> BlockNode:
+        if not block.has_children or block.type in PINNED_TYPES:
+            return BlockNode(block)
+        return BlockNode(block, await fetch_block_tree(client, block.id))
+
+    return list(await asyncio.gather(*map(node, blocks)))
+
+
+# * States of the alignment: nothing kept yet, blocks inserted before anything
+# * was kept, and anchored after a kept block
+_EMPTY, _LEADING, _ANCHORED = range(3)
+_INFINITY = float("inf")
+
+
+def _align(
+    current: list[BlockNode], desired: list[dict[str, Any]]
+) -> list[tuple[str, int | None, int | None]]:
+    """
+    Aligns existing and desired blocks with the fewest operations.
+
+    A weighted edit distance where keeping an equal block is free, and
+    updating a block of the same type, deleting and inserting each cost one.
+    Notion can only insert after an existing block, so inserts before the
+    first kept block are not allowed unless nothing is kept.
+
+    Returns:
+        The steps as ("keep" | "update" | "delete" | "insert", current index,
+        desired index).
+    """
+    n, m = len(current), len(desired)
+    signatures = [content_signature(node.content) for node in current]
+    desired_signatures = [
+        content_signature(_desired_content(block)) for block in desired
+    ]
+    cost = [[[_INFINITY] * 3 for _ in range(m + 1)] for _ in range(n + 1)]
+    back: dict[tuple[int, int, int], tuple[str, int, int, int]] = {}
+    cost[0][0][_EMPTY] = 0
+
+    def relax(i: int, j: int, s: int, value: float, step: tuple[str, int, int, int]):
+        if value < cost[i][j][s]:
+            cost[i][j][s] = value
+            back[(i, j, s)] = step
+
+    for i in range(n + 1):
+        for j in range(m + 1):
+            for s in (_EMPTY, _LEADING, _ANCHORED):
+                value = cost[i][j][s]
+                if value == _INFINITY:
+                    continue
+                if i < n:
+                    node = current[i]
+                    if node.block.type in PINNED_TYPES:
+                        if s != _LEADING:
+                            relax(i + 1, j, _ANCHORED, value, ("skip", i, j, s))
+                    else:
+                        relax(i + 1, j, s, value + 1, ("delete", i, j, s))
+                if j < m:
+                    next_state = _ANCHORED if s == _ANCHORED else _LEADING
+                    relax(i, j + 1, next_state, value + 1, ("insert", i, j, s))
+                if i < n and j < m and s != _LEADING:
+                    if current[i].block.type == desired[j]["type"]:
+                        pinned = current[i].block.type in PINNED_TYPES
+                        if pinned or signatures[i] == desired_signatures[j]:
+                            relax(i + 1, j + 1, _ANCHORED, value, ("keep", i, j, s))
+                        else:
+                            relax(
+                                i + 1, j + 1, _ANCHORED, value + 1, ("update", i, j, s)
+                            )
+
+    state = min((_EMPTY, _LEADING, _ANCHORED), key=lambda s: cost[n][m][s])
+    steps: list[tuple[str, int | None, int | None]] = []
+    i, j = n, m
+    while (i, j) != (0, 0) or state != _EMPTY:
+        kind, i, j, state = back[(i, j, state)]
+        steps.append(
+            (
+                kind,
+                None if kind == "insert" else i,
+                None if kind in ("delete", "skip") else j,
+            )
+        )
+    steps.reverse()
+    return steps
+
+
+def diff_blocks(
+    parent_id: str,
+    current: list[BlockNode],
+    desired: list[dict[str, Any]],
+) -> list[BlockOperation]:
+    """
+    Computes a minimal edit script turning the current children into the
+    desired ones.
+
+    Blocks keep their IDs, and with them their comments, wherever possible:
+    a block of the same type with different content is updated in place
+    rather than replaced. Child pages and databases are never deleted.
+
+    Args:
+        parent_id: The ID of the page or block the children belong to.
+        current: The existing children, from `fetch_block_tree`.
+        desired: The desired children in the format of the append endpoint,
+            with nested children under `<type>.children`.
+
+    Returns:
+        The operations, which may be applied in any order.
+    """
+    operations: list[BlockOperation] = []
+    pending: list[dict[str, Any]] = []
+    after: str | None = None
+
+    def flush() -> None:
+        if pending:
+            operations.append(InsertBlocks(parent_id, after, list(pending)))
+            pending.clear()
+
+    for kind, i, j in _align(current, desired):
+        if kind == "insert":
+            pending.append(desired[j])
+            continue
+        node = current[i]
+        if kind == "delete":
+            operations.append(DeleteBlock(parent_id, node.block.id))
+            continue
+        flush()
+        after = node.block.id
+        if kind == "skip" or node.block.type in PINNED_TYPES:
+            continue
+        if kind == "update":
+            content = _without_children(desired[j])[node.block.type]
+            operations.append(
+                UpdateBlock(parent_id, node.block.id, node.block.type, content)
+            )
+        operations.extend(
+            diff_blocks(node.block.id, node.children, _desired_children(desired[j]))
+        )
+    flush()
+    return operations
+
+
+def _prepare_insert(
+    block: dict[str, Any],
+) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+    """
+    Splits a block to insert into what fits in one request and what must be
+    inserted under it afterwards, since Notion accepts two nesting levels.
+    """
+    children = _desired_children(block)
+    if all(not _desired_children(child) for child in children):
+        return block, []
+    return _without_children(block), children
+
+
+async def _insert(
+    client: AsyncNotionClient,
+    parent_id: str,
+    after: str | None,
+    blocks: list[dict[str, Any]],
+    semaphore: asyncio.Semaphore,
+) -> None:
+    deferred: list[tuple[str, list[dict[str, Any]]]] = []
+    for start in range(0, len(blocks), MAX_CHILDREN_PER_REQUEST):
+        chunk = [
+            _prepare_insert(block)
+            for block in blocks[start : start + MAX_CHILDREN_PER_REQUEST]
+        ]
+        payload = AppendBlockChildrenPayload(children=[block for block, _ in chunk])
+        if after is not None:
+            payload.after = after
+        async with semaphore:
+            response = await client.append_block_children(parent_id, payload)
+        for created, (_, children) in zip(response.results, chunk):
+            if children:
+                deferred.append((created.id, children))
+        # * Chain the next chunk after the last inserted block
+        after = response.results[-1].id if response.results else after
+    await asyncio.gather(
+        *(
+            _insert(client, block_id, None, children, semaphore)
+            for block_id, children in deferred
+        )
+    )
+
+
+async def apply_block_operations(
+    client: AsyncNotionClient,
+    operations: list[BlockOperation],
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+) -> None:
+    """
+    Applies an edit script with concurrent requests.
+
+    Args:
+        client: The Notion client.
+        operations: The operations from `diff_blocks`.
+        max_concurrency: The maximum number of requests in flight.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def apply(operation: BlockOperation) -> None:
+        if isinstance(operation, InsertBlocks):
+            await _insert(
+                client,
+                operation.parent_id,
+                operation.after,
+                operation.children,
+                semaphore,
+            )
+            return
+        async with semaphore:
+            if isinstance(operation, UpdateBlock):
+                await client.update_block(
+                    operation.block_id, {operation.type: operation.content}
+                )
+            else:
+                await client.delete_block(operation.block_id)
+
+    await asyncio.gather(*map(apply, operations))
+
+
+async def sync_blocks(
+    client: AsyncNotionClient,
+    block_id: str,
+    desired: list[dict[str, Any]],
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+) -> list[BlockOperation]:
+    """
+    Makes the content of a page or block match a desired block tree.
+
+    Only the differences are written, instead of deleting and re-appending
+    everything, so unchanged blocks keep their IDs and comments.
+
+    Args:
+        client: The Notion client.
+        block_id: The ID of the page or block.
+        desired: The desired children in the format of the append endpoint.
+        max_concurrency: The maximum number of requests in flight.
+
+    Returns:
+        The operations that were applied.
+    """
+    current = await fetch_block_tree(client, block_id)
+    operations = diff_blocks(block_id, current, desired)
+    await apply_block_operations(client, operations, max_concurrency)
+    if client.cache is not None:
+        for parent_id in {operation.parent_id for operation in operations}:
+            await client.cache.invalidate(
+                "block_children", f"{parent_id}:", prefix=True
+            )
+    logger.debug("Synced block %s with %d operations.", block_id, len(operations))
+    return operations
@@ -0,0 +1,305 @@
+"""Pluggable caches of Notion objects, including one shared across processes."""
+
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Protocol, TypeVar
+
+from pydantic import BaseModel
+
+# * Configure logging
+logger = logging.getLogger(__name__)
+
+M = TypeVar("M", bound=BaseModel)
+
+DEFAULT_TTL = 60.0
+DEFAULT_MAX_STALE = 24 * 60 * 60.0
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+class CacheBackend(Protocol):
+    """
+    Storage for serialized objects.
+
+    Entries keep their expiry time but are only removed by size-based
+    eviction or `delete`, so stale values stay available as a fallback.
+    """
+
+    async def get(self, key: str) -> tuple[bytes, float] | None:
+        """Returns the value and expiry time (Unix seconds) stored for a key."""
+        ...
+
+    async def set(self, key: str, value: bytes, expires_at: float) -> None:
+        """Stores a value."""
+        ...
+
+    async def delete(self, key: str) -> None:
+        """Removes a key."""
+        ...
+
+    async def delete_prefix(self, prefix: str) -> None:
+        """Removes every key starting with a prefix."""
+        ...
+
+
+class MemoryCacheBackend:
+    """A per-process LRU backend bounded by the total size of its values."""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Initializes the backend.
+
+        Args:
+            max_bytes: The maximum total size of the stored values.
+        """
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries: OrderedDict[str, tuple[bytes, float]] = OrderedDict()
+
+    async def get(self, key: str) -> tuple[bytes, float] | None:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    async def set(self, key: str, value: bytes, expires_at: float) -> None:
+        await self.delete(key)
+        self._entries[key] = (value, expires_at)
+        self.size += len(value)
+        while self.size > self.max_bytes and self._entries:
+            _, (evicted, _) = self._entries.popitem(last=False)
+            self.size -= len(evicted)
+
+    async def delete(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= len(entry[0])
+
+    async def delete_prefix(self, prefix: str) -> None:
+        for key in [key for key in self._entries if key.startswith(prefix)]:
+            await self.delete(key)
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at);
+CREATE TABLE IF NOT EXISTS stats (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    size INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO stats (id, size) VALUES (0, 0);
+CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries BEGIN
+    UPDATE stats SET size = size + NEW.size;
+END;
+CREATE TRIGGER IF NOT EXISTS entries_update AFTER UPDATE OF size ON entries BEGIN
+    UPDATE stats SET size = size + NEW.size - OLD.size;
+END;
+CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries BEGIN
+    UPDATE stats SET size = size - OLD.size;
+END;
+"""
+
+# * Reads refresh the LRU position at most this often, to keep reads cheap
+_ACCESS_RESOLUTION = 60.0
+
+
+class SQLiteCacheBackend:
+    """
+    A backend in one SQLite database file, shared by every process on a host.
+
+    The database runs in WAL mode, so readers in uvicorn and Celery workers
+    never block each other, and survives restarts, so a deploy or worker
+    recycle starts warm. When the total size exceeds `max_bytes`, the least
+    recently used entries are evicted down to 90% of it.
+    """
+
+    def __init__(self, path: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Initializes the backend, creating the database if needed.
+
+        Args:
+            path: The path of the database file.
+            max_bytes: The maximum total size of the stored values.
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._connection().executescript(_SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        # * SQLite connections must not be shared between threads
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def _get(self, key: str) -> tuple[bytes, float] | None:
+        connection = self._connection()
+        row = connection.execute(
+            "SELECT value, expires_at, accessed_at FROM entries WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        value, expires_at, accessed_at = row
+        now = time.time()
+        if now - accessed_at > _ACCESS_RESOLUTION:
+            connection.execute(
+                "UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+        return value, expires_at
+
+    def _set(self, key: str, value: bytes, expires_at: float) -> None:
+        connection = self._connection()
+        connection.execute(
+            """
+            INSERT INTO entries (key, value, size, expires_at, accessed_at)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (key) DO UPDATE SET
+                value = excluded.value,
+                size = excluded.size,
+                expires_at = excluded.expires_at,
+                accessed_at = excluded.accessed_at
+            """,
+            (key, value, len(value), expires_at, time.time()),
+        )
+        (size,) = connection.execute("SELECT size FROM stats").fetchone()
+        if size > self.max_bytes:
+            self._evict(size, int(self.max_bytes * 0.9))
+
+    def _evict(self, size: int, target: int) -> None:
+        # * Delete the least recently used entries until `size - target` bytes
+        # * are freed, in one statement so concurrent writers cannot interleave
+        cursor = self._connection().execute(
+            """
+            DELETE FROM entries WHERE key IN (
+                SELECT key FROM (
+                    SELECT key, size, SUM(size) OVER (
+                        ORDER BY accessed_at, key
+                    ) AS freed
+                    FROM entries
+                )
+                WHERE freed - size < ?
+            )
+            """,
+            (size - target,),
+        )
+        logger.debug("Evicted %d entries from the Notion cache.", cursor.rowcount)
+
+    def _delete(self, key: str) -> None:
+        self._connection().execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def _delete_prefix(self, prefix: str) -> None:
+        # * A range scan on the primary key, unlike LIKE
+        self._connection().execute(
+            "DELETE FROM entries WHERE key >= ? AND key < ?",
+            (prefix, prefix + "\U0010ffff"),
+        )
+
+    async def get(self, key: str) -> tuple[bytes, float] | None:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, value: bytes, expires_at: float) -> None:
+        await asyncio.to_thread(self._set, key, value, expires_at)
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(self._delete, key)
+
+    async def delete_prefix(self, prefix: str) -> None:
+        await asyncio.to_thread(self._delete_prefix, prefix)
+
+
+class NotionCache:
+    """
+    A typed cache of pages, databases and block children over a backend.
+
+    Models are stored as compressed JSON holding only the fields the API
+    returned. Entries are fresh for `ttl` seconds; stale entries are kept
+    and can be served for up to `max_stale` seconds when the API is down.
+    """
+
+    def __init__(
+        self,
+        backend: CacheBackend,
+        ttl: float = DEFAULT_TTL,
+        max_stale: float = DEFAULT_MAX_STALE,
+        namespace: str = "notion",
+    ):
+        """
+        Initializes the cache.
+
+        Args:
+            backend: The storage backend.
+            ttl: The number of seconds an entry is fresh.
+            max_stale: The number of seconds past expiry a stale entry may
+                still be served as a fallback.
+            namespace: A key prefix. Use one per integration token when
+                several tokens share a backend, since they see different
+                objects.
+        """
+        self.backend = backend
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.namespace = namespace
+
+    def key(self, kind: str, object_id: str) -> str:
+        return f"{self.namespace}:{kind}:{object_id}"
+
+    async def get(
+        self, kind: str, object_id: str, model: type[M]
+    ) -> tuple[M, bool] | None:
+        """
+        Reads an object.
+
+        Args:
+            kind: The kind of object, e.g. "pages".
+            object_id: The ID of the object.
+            model: The model to validate the object with.
+
+        Returns:
+            The object and whether it is still fresh, or None if it is
+            missing, too stale, or unreadable.
+        """
+        entry = await self.backend.get(self.key(kind, object_id))
+        if entry is None:
+            return None
+        value, expires_at = entry
+        now = time.time()
+        if now > expires_at + self.max_stale:
+            return None
+        try:
+            obj = model.model_validate_json(zlib.decompress(value))
+        except (zlib.error, ValueError) as e:
+            # * E.g. written by an older version of the models
+            logger.warning("Dropping unreadable cache entry %s: %s", object_id, e)
+            await self.backend.delete(self.key(kind, object_id))
+            return None
+        return obj, now <= expires_at
+
+    async def set(self, kind: str, object_id: str, obj: BaseModel) -> None:
+        """Stores an object."""
+        value = zlib.compress(obj.model_dump_json(exclude_unset=True).encode())
+        await self.backend.set(self.key(kind, object_id), value, time.time() + self.ttl)
+
+    async def invalidate(self, kind: str, object_id: str, prefix: bool = False) -> None:
+        """
+        Removes an object, or with `prefix`, every object whose ID starts with
+        `object_id`.
+        """
+        key = self.key(kind, object_id)
+        if prefix:
+            await self.backend.delete_prefix(key)
+        else:
+            await self.backend.delete(key)
@@ -0,0 +1,229 @@
+"""Circuit breakers that fail fast while the Notion API is degraded."""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Literal
+
+import httpx
+
+from app.core.integrations.notion.exceptions import (
+    NotionCircuitOpenError,
+    NotionInternalServerError,
+    NotionServiceUnavailableError,
+)
+
+# * Configure logging
+logger = logging.getLogger(__name__)
+
+CircuitState = Literal["closed", "open", "half_open"]
+
+
+def endpoint_class(endpoint: str) -> str:
+    """
+    Returns the class of an endpoint, i.e. its first path segment.
+
+    Args:
+        endpoint: The API endpoint, e.g. "databases/{id}/query".
+
+    Returns:
+        The endpoint class, e.g. "databases".
+    """
+    return endpoint.lstrip("/").split("/", 1)[0]
+
+
+def is_outage_error(exc: BaseException) -> bool:
+    """
+    Tells whether an error points to a degraded API rather than a bad request.
+
+    Server errors, timeouts and transport errors count; client errors such as
+    404s and 429s do not.
+    """
+    if isinstance(
+        exc,
+        (
+            NotionInternalServerError,
+            NotionServiceUnavailableError,
+            asyncio.TimeoutError,
+        ),
+    ):
+        return True
+    cause = exc.__cause__
+    if isinstance(cause, httpx.RequestError):
+        return True
+    return (
+        isinstance(cause, httpx.HTTPStatusError) and cause.response.status_code >= 500
+    )
+
+
+class CircuitBreaker:
+    """
+    A circuit breaker over a sliding window of recent calls.
+
+    The breaker is closed while the API is healthy. It opens when, over the
+    last `window_size` calls, the share of failed calls reaches
+    `failure_rate_threshold` or the share of calls slower than
+    `slow_call_duration` reaches `slow_call_rate_threshold`. While open, calls
+    fail immediately with `NotionCircuitOpenError`. After `reset_timeout`
+    seconds it lets `half_open_max_calls` probe calls through; the breaker
+    closes if they all succeed and opens again otherwise.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate_threshold: float = 0.5,
+        slow_call_rate_threshold: float = 0.8,
+        slow_call_duration: float = 5.0,
+        window_size: int = 20,
+        minimum_calls: int = 10,
+        reset_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initializes the circuit breaker.
+
+        Args:
+            name: The name used in errors and logs, e.g. the endpoint class.
+            failure_rate_threshold: The share of failed calls that opens the circuit.
+            slow_call_rate_threshold: The share of slow calls that opens the circuit.
+            slow_call_duration: The number of seconds after which a call is slow.
+            window_size: The number of recent calls the rates are computed over.
+            minimum_calls: The number of calls needed before the circuit can open.
+            reset_timeout: The number of seconds the circuit stays open.
+            half_open_max_calls: The number of probe calls allowed when half-open.
+            clock: The monotonic clock, replaceable in tests.
+        """
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.slow_call_duration = slow_call_duration
+        self.minimum_calls = minimum_calls
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.clock = clock
+        self.state: CircuitState = "closed"
+        # * (failed, slow) outcomes of the most recent calls
+        self._calls: deque[tuple[bool, bool]] = deque(maxlen=window_size)
+        self._opened_at = 0.0
+        self._probes = 0
+        self._probe_successes = 0
+
+    def _transition(self, state: CircuitState) -> None:
+        if state != self.state:
+            logger.warning(
+                "Circuit breaker '%s' changed from %s to %s.",
+                self.name,
+                self.state,
+                state,
+            )
+        self.state = state
+        self._calls.clear()
+        self._probes = 0
+        self._probe_successes = 0
+        if state == "open":
+            self._opened_at = self.clock()
+
+    def before_call(self) -> None:
+        """
+        Admits a call or fails fast.
+
+        Raises:
+            NotionCircuitOpenError: If the circuit is open, or half-open with
+                all probe slots taken.
+        """
+        if self.state == "open":
+            remaining = self._opened_at + self.reset_timeout - self.clock()
+            if remaining > 0:
+                raise NotionCircuitOpenError(self.name, retry_after=remaining)
+            self._transition("half_open")
+        if self.state == "half_open":
+            if self._probes >= self.half_open_max_calls:
+                raise NotionCircuitOpenError(self.name, retry_after=self.reset_timeout)
+            self._probes += 1
+
+    def record(self, duration: float, failed: bool) -> None:
+        """
+        Records the outcome of an admitted call.
+
+        Args:
+            duration: The number of seconds the call took.
+            failed: Whether the call failed because of the API.
+        """
+        slow = duration >= self.slow_call_duration
+        if self.state == "half_open":
+            if failed or slow:
+                self._transition("open")
+                return
+            self._probe_successes += 1
+            if self._probe_successes >= self.half_open_max_calls:
+                self._transition("closed")
+            return
+        if self.state == "open":
+            # * A call admitted before the circuit opened
+            return
+        self._calls.append((failed, slow))
+        if len(self._calls) < self.minimum_calls:
+            return
+        failure_rate = sum(failed for failed, _ in self._calls) / len(self._calls)
+        slow_rate = sum(slow for _, slow in self._calls) / len(self._calls)
+        if (
+            failure_rate >= self.failure_rate_threshold
+            or slow_rate >= self.slow_call_rate_threshold
+        ):
+            self._transition("open")
+
+    def release(self) -> None:
+        """Frees the slot of an admitted call that ended without an outcome."""
+        if self.state == "half_open" and self._probes > 0:
+            self._probes -= 1
+
+    @contextmanager
+    def track(self) -> Iterator[None]:
+        """
+        Guards a call: admits it, times it and records its outcome.
+
+        Raises:
+            NotionCircuitOpenError: If the call is not admitted.
+        """
+        self.before_call()
+        start = self.clock()
+        try:
+            yield
+        except asyncio.CancelledError:
+            # * E.g. a hedge loser or a client disconnect: no outcome to learn from
+            self.release()
+            raise
+        except BaseException as e:
+            self.record(self.clock() - start, failed=is_outage_error(e))
+            raise
+        self.record(self.clock() - start, failed=False)
+
+
+class CircuitBreakerRegistry:
+    """One lazily created circuit breaker per endpoint class."""
+
+    def __init__(self, **options):
+        """
+        Initializes the registry.
+
+        Args:
+            **options: Keyword arguments passed to every `CircuitBreaker`.
+        """
+        self.options = options
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    def get(self, endpoint: str) -> CircuitBreaker:
+        """Returns the circuit breaker guarding an endpoint."""
+        name = endpoint_class(endpoint)
+        if name not in self._breakers:
+            self._breakers[name] = CircuitBreaker(name, **self.options)
+        return self._breakers[name]
+
+    def states(self) -> dict[str, CircuitState]:
+        """Returns the state of every breaker created so far, e.g. for health checks."""
+        return {name: breaker.state for name, breaker in self._breakers.items()}
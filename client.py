@@ -1,36 +1,72 @@
 
 
+import asyncio
 import logging
-from typing import Any, Literal
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import nullcontext
+from typing import Any, Literal, TypeVar
 
 import httpx
+from pydantic import BaseModel
 
-from app.core.integrations.notion.decorators import retry
+from app.core.integrations.notion.cache import NotionCache
+from app.core.integrations.notion.circuit_breaker import (
+    CircuitBreakerRegistry,
+    endpoint_class,
+    is_outage_error,
+)
+from app.core.integrations.notion.deadlines import within_deadline
+from app.core.integrations.notion.decorators import retry, traced
 from app.core.integrations.notion.exceptions import (
     NotionAPIError,
     NotionAuthenticationError,
     NotionBadRequestError,
+    NotionCircuitOpenError,
     NotionConflictError,
+    NotionDeadlineExceededError,
     NotionInternalServerError,
     NotionNotFoundError,
     NotionRateLimitError,
     NotionServiceUnavailableError,
 )
+from app.core.integrations.notion.hedging import HedgingPolicy
+from app.core.integrations.notion.rate_limit import RateLimiter
+from app.core.integrations.notion.scheduler import (
+    Priority,
+    RequestScheduler,
+    current_priority,
+)
 from app.core.integrations.notion.schemas import (
     AppendBlockChildrenPayload,
     AppendBlockChildrenResponse,
+    Block,
     Comment,
     CreateCommentPayload,
+    CreateFileUploadPayload,
     Database,
-    FilesProperty,
+    FileUpload,
     Page,
     PaginatedBlockResponse,
     PaginatedCommentResponse,
     PaginatedPageResponse,
+    PaginatedPropertyItemResponse,
+    PaginatedSearchResponse,
     PaginatedUserResponse,
+    PropertyValue,
     QueryDatabasePayload,
+    SearchPayload,
     UpdatePagePayload,
     User,
+    validate_property,
+)
+from app.core.integrations.notion.tracing import (
+    NoopTracer,
+    SlowCallLog,
+    Tracer,
+    TransportTimer,
+    is_tracing,
+    phase,
+    validate,
 )
 from app.core.integrations.notion.utils import clean_id
 
@@ -41,20 +77,65 @@ logger = logging.getLogger(__name__)
 NOTION_API_VERSION = "2022-06-28"
 BASE_URL = "https://api.notion.com/v1"
 
+M = TypeVar("M", bound=BaseModel)
+
 
 class AsyncNotionClient:
     """An asynchronous client for the Notion API."""
 
-    def __init__(self, token: str, client: httpx.AsyncClient):
+    def __init__(
+        self,
+        token: str,
+        client: httpx.AsyncClient,
+        rate_limiter: RateLimiter | None = None,
+        circuit_breakers: CircuitBreakerRegistry | None = None,
+        hedging: HedgingPolicy | None = None,
+        scheduler: RequestScheduler | None = None,
+        priority: Priority = "default",
+        tenant: str | None = None,
+        cache: NotionCache | None = None,
+        tracer: Tracer | None = None,
+        slow_calls: SlowCallLog | None = None,
+    ):
         """
         Initializes the Notion client.
 
         Args:
             token: The Notion integration token.
             client: An httpx.AsyncClient instance.
+            rate_limiter: An optional rate limiter awaited before every request,
+                including retries. Share one instance between clients that use
+                the same integration token.
+            circuit_breakers: Optional circuit breakers, one per endpoint class,
+                that fail requests fast with `NotionCircuitOpenError` while
+                the API is degraded.
+            hedging: An optional policy that hedges slow GET requests with a
+                second request when the rate limit allows it.
+            scheduler: An optional scheduler that hands out its rate limiter's
+                tokens by priority and fairly across tenants. Replaces
+                `rate_limiter` when given.
+            priority: The priority of this client's requests, unless
+                overridden with `scheduler.request_priority`.
+            tenant: The tenant this client's requests are scheduled for.
+                Defaults to the integration token.
+            cache: An optional cache of pages, databases and block children.
+                Stale entries are served when the API is unavailable.
+            tracer: An optional tracer receiving the time each call spends
+                queueing, on the network, decoding and validating. Defaults to
+                a no-op tracer.
+            slow_calls: An optional log of slow calls with their breakdown.
         """
         self.token = token
         self.client = client
+        self.rate_limiter = rate_limiter
+        self.circuit_breakers = circuit_breakers
+        self.hedging = hedging
+        self.scheduler = scheduler
+        self.priority = priority
+        self.tenant = tenant or token
+        self.cache = cache
+        self.tracer = tracer if tracer is not None else NoopTracer()
+        self.slow_calls = slow_calls
         self.headers = {
             "Authorization": f"Bearer {self.token}",
             "Content-Type": "application/json",
@@ -68,54 +149,157 @@ class AsyncNotionClient:
         endpoint: str,
         payload: dict[str, Any] | None = None,
         params: dict[str, Any] | None = None,
+        files: dict[str, Any] | None = None,
     ) -> dict[str, Any]:
         """
         Makes an asynchronous request to the Notion API.
 
+        Requests made inside a `deadlines.deadline` block give up, including
+        retries, when the deadline passes.
+
         Args:
             method: The HTTP method to use.
             endpoint: The API endpoint to call (e.g., "/databases/{db_id}").
-            payload: The JSON payload for POST/PATCH requests.
+            payload: The JSON payload for POST/PATCH requests, or the form
+                fields when `files` is given.
             params: The URL query parameters.
+            files: Files to send as a multipart/form-data body.
 
         Returns:
             The JSON response from the API as a dictionary.
 
         Raises:
             NotionAPIError: For any API-related errors.
+            NotionCircuitOpenError: If the endpoint's circuit breaker is open.
+            NotionDeadlineExceededError: If the current deadline passes.
         """
         url = f"{BASE_URL}/{endpoint.lstrip('/')}"
+        with phase("queue"):
+            if self.scheduler is not None:
+                await within_deadline(
+                    self.scheduler.acquire(
+                        self.tenant, current_priority() or self.priority
+                    )
+                )
+            elif self.rate_limiter is not None:
+                await within_deadline(self.rate_limiter.acquire())
+        breaker = (
+            self.circuit_breakers.get(endpoint)
+            if self.circuit_breakers is not None
+            else None
+        )
+        with breaker.track() if breaker is not None else nullcontext():
+            try:
+                if files is not None:
+                    # * Let httpx set the multipart Content-Type with its boundary
+                    headers = {
+                        k: v for k, v in self.headers.items() if k != "Content-Type"
+                    }
+                    response = await within_deadline(
+                        self._send(
+                            method, url, headers=headers, data=payload, files=files
+                        )
+                    )
+                elif method == "GET" and self.hedging is not None:
+                    response = await within_deadline(
+                        self.hedging.run(
+                            endpoint_class(endpoint),
+                            lambda: self._send(
+                                method, url, headers=self.headers, params=params
+                            ),
+                            self.scheduler.rate_limiter
+                            if self.scheduler is not None
+                            else self.rate_limiter,
+                        )
+                    )
+                else:
+                    response = await within_deadline(
+                        self._send(
+                            method, url, headers=self.headers, json=payload, params=params
+                        )
+                    )
+                response.raise_for_status()
+                with phase("decode"):
+                    return response.json()
+            except httpx.HTTPStatusError as e:
+                status_code = e.response.status_code
+                error_details = e.response.json()
+                logger.error(
+                    "Notion API request failed with status %d: %s",
+                    status_code,
+                    error_details,
+                )
+                error_map = {
+                    400: NotionBadRequestError,
+                    401: NotionAuthenticationError,
+                    404: NotionNotFoundError,
+                    409: NotionConflictError,
+                    429: NotionRateLimitError,
+                    500: NotionInternalServerError,
+                    503: NotionServiceUnavailableError,
+                }
+                exception_class = error_map.get(status_code, NotionAPIError)
+                error = exception_class(
+                    f"Notion API Error ({status_code}): {error_details.get('message', 'Unknown error')}"
+                )
+                # * Subclasses take no status, so set it from the response
+                error.status_code = status_code
+                error.error_code = error_details.get("code", error.error_code)
+                raise error from e
+            except httpx.RequestError as e:
+                logger.error("HTTP request to Notion API failed: %s", e)
+                raise NotionAPIError(f"HTTP request failed: {e}") from e
+
+    async def _send(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """Sends one HTTP request, timing its network phases if the call is traced."""
+        if not is_tracing():
+            return await self.client.request(method, url, **kwargs)
+        timer = TransportTimer()
+        response = await self.client.request(
+            method, url, extensions={"trace": timer}, **kwargs
+        )
+        timer.finish(response)
+        return response
+
+    async def _cached(
+        self,
+        kind: str,
+        object_id: str,
+        model: type[M],
+        fetch: Callable[[], Awaitable[dict[str, Any]]],
+    ) -> M:
+        """
+        Reads an object through the cache, if one is configured.
+
+        Args:
+            kind: The kind of object, e.g. "pages".
+            object_id: The cache key of the object.
+            model: The model to validate the object with.
+            fetch: A function requesting the object from the API.
+
+        Returns:
+            The fresh cached object, the fetched object, or a stale cached
+            object if the API is unavailable or the deadline passed.
+        """
+        if self.cache is None:
+            return validate(model, await fetch())
+        cached = await self.cache.get(kind, object_id, model)
+        if cached is not None and cached[1]:
+            return cached[0]
         try:
-            response = await self.client.request(
-                method, url, headers=self.headers, json=payload, params=params
+            obj = validate(model, await fetch())
+        except NotionAPIError as e:
+            unavailable = is_outage_error(e) or isinstance(
+                e, (NotionCircuitOpenError, NotionDeadlineExceededError)
             )
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPStatusError as e:
-            status_code = e.response.status_code
-            error_details = e.response.json()
-            logger.error(
-                "Notion API request failed with status %d: %s",
-                status_code,
-                error_details,
-            )
-            error_map = {
-                400: NotionBadRequestError,
-                401: NotionAuthenticationError,
-                404: NotionNotFoundError,
-                409: NotionConflictError,
-                429: NotionRateLimitError,
-                500: NotionInternalServerError,
-                503: NotionServiceUnavailableError,
-            }
-            exception_class = error_map.get(status_code, NotionAPIError)
-            raise exception_class(
-                f"Notion API Error ({status_code}): {error_details.get('message', 'Unknown error')}"
-            ) from e
-        except httpx.RequestError as e:
-            logger.error("HTTP request to Notion API failed: %s", e)
-            raise NotionAPIError(f"HTTP request failed: {e}") from e
-
+            if cached is None or not unavailable:
+                raise
+            logger.warning("Serving stale %s %s from cache: %s", kind, object_id, e)
+            return cached[0]
+        await self.cache.set(kind, object_id, obj)
+        return obj
+
+    @traced
     async def get_database(self, database_id: str) -> Database:
         """
         Retrieves a database object.
@@ -127,9 +311,14 @@ class AsyncNotionClient:
             A dictionary representing the Notion Database object.
         """
         db_id = clean_id(database_id)
-        response = await self._request("GET", f"databases/{db_id}")
-        return Database.model_validate(response)
+        return await self._cached(
+            "databases",
+            db_id,
+            Database,
+            lambda: self._request("GET", f"databases/{db_id}"),
+        )
 
+    @traced
     async def query_database(
         self, database_id: str, payload: QueryDatabasePayload | None = None
     ) -> PaginatedPageResponse:
@@ -143,13 +332,57 @@ class AsyncNotionClient:
         Returns:
             A dictionary containing a list of page objects.
         """
+        return await self.query_database_as(database_id, PaginatedPageResponse, payload)
+
+    @traced
+    async def query_database_as(
+        self,
+        database_id: str,
+        model: type[M],
+        payload: QueryDatabasePayload | None = None,
+    ) -> M:
+        """
+        Queries a database, validating the response with a custom model.
+
+        Args:
+            database_id: The ID of the database to query.
+            model: The response model, e.g. one from `typed_models`.
+            payload: The query payload (for filtering, sorting, etc.).
+
+        Returns:
+            The response, validated with `model`.
+        """
         db_id = clean_id(database_id)
         dumped_payload = payload.model_dump(exclude_unset=True) if payload else None
         response = await self._request(
             "POST", f"databases/{db_id}/query", payload=dumped_payload
         )
-        return PaginatedPageResponse.model_validate(response)
+        return validate(model, response)
+
+    async def iter_query_database(
+        self, database_id: str, payload: QueryDatabasePayload | None = None
+    ) -> AsyncIterator[PaginatedPageResponse]:
+        """
+        Queries a database and follows `next_cursor` until all pages are fetched.
+
+        Args:
+            database_id: The ID of the database to query.
+            payload: The query payload (for filtering, sorting, etc.).
 
+        Yields:
+            Each batch of results as returned by the API.
+        """
+        payload = payload.model_copy() if payload else QueryDatabasePayload()
+        while True:
+            response = await self.query_database(database_id, payload)
+            yield response
+            if not response.has_more or not response.next_cursor:
+                return
+            payload = payload.model_copy(
+                update={"start_cursor": response.next_cursor}
+            )
+
+    @traced
     async def create_page(self, payload: Page) -> Page:
         """
         Creates a new page in Notion.
@@ -163,8 +396,9 @@ class AsyncNotionClient:
         response = await self._request(
             "POST", "pages", payload=payload.model_dump(exclude_unset=True)
         )
-        return Page.model_validate(response)
+        return validate(Page, response)
 
+    @traced
     async def get_page(self, page_id: str) -> Page:
         """
         Retrieves a page object.
@@ -176,9 +410,11 @@ class AsyncNotionClient:
             A dictionary representing the Page object.
         """
         p_id = clean_id(page_id)
-        response = await self._request("GET", f"pages/{p_id}")
-        return Page.model_validate(response)
+        return await self._cached(
+            "pages", p_id, Page, lambda: self._request("GET", f"pages/{p_id}")
+        )
 
+    @traced
     async def update_page(self, page_id: str, payload: UpdatePagePayload) -> Page:
         """
         Updates a page's properties.
@@ -194,21 +430,56 @@ class AsyncNotionClient:
         response = await self._request(
             "PATCH", f"pages/{p_id}", payload=payload.model_dump(exclude_unset=True)
         )
-        return Page.model_validate(response)
+        page = validate(Page, response)
+        if self.cache is not None:
+            await self.cache.set("pages", p_id, page)
+        return page
 
+    @traced
     async def get_block_children(
-        self, block_id: str, page_size: int | None = None
+        self,
+        block_id: str,
+        page_size: int | None = None,
+        start_cursor: str | None = None,
     ) -> PaginatedBlockResponse:
         """Retrieves a list of Block objects for a given block ID."""
         params = {}
         if page_size is not None:
             params["page_size"] = page_size
-
-        response = await self._request(
-            "GET", f"blocks/{block_id}/children", params=params
+        if start_cursor is not None:
+            params["start_cursor"] = start_cursor
+
+        return await self._cached(
+            "block_children",
+            f"{block_id}:{start_cursor or ''}:{page_size or ''}",
+            PaginatedBlockResponse,
+            lambda: self._request("GET", f"blocks/{block_id}/children", params=params),
         )
-        return PaginatedBlockResponse.model_validate(response)
 
+    async def iter_block_children(
+        self, block_id: str, page_size: int | None = None
+    ) -> AsyncIterator[PaginatedBlockResponse]:
+        """
+        Retrieves the children of a block, following `next_cursor`.
+
+        Args:
+            block_id: The ID of the parent block or page.
+            page_size: The number of blocks to request per call.
+
+        Yields:
+            Each batch of child blocks as returned by the API.
+        """
+        cursor = None
+        while True:
+            response = await self.get_block_children(
+                block_id, page_size=page_size, start_cursor=cursor
+            )
+            yield response
+            if not response.has_more or not response.next_cursor:
+                return
+            cursor = response.next_cursor
+
+    @traced
     async def append_block_children(
         self, block_id: str, payload: AppendBlockChildrenPayload
     ) -> AppendBlockChildrenResponse:
@@ -218,51 +489,337 @@ class AsyncNotionClient:
             f"blocks/{block_id}/children",
             payload=payload.model_dump(exclude_unset=True),
         )
-        return AppendBlockChildrenResponse.model_validate(response)
+        if self.cache is not None:
+            await self.cache.invalidate("block_children", f"{block_id}:", prefix=True)
+        return validate(AppendBlockChildrenResponse, response)
+
+    @traced
+    async def update_block(self, block_id: str, payload: dict[str, Any]) -> Block:
+        """
+        Updates the content of a block.
+
+        Args:
+            block_id: The ID of the block to update.
+            payload: The fields to update, keyed by the block type, e.g.
+                `{"paragraph": {"rich_text": [...]}}`.
+
+        Returns:
+            The updated Block object.
+        """
+        response = await self._request(
+            "PATCH", f"blocks/{clean_id(block_id)}", payload=payload
+        )
+        return validate(Block, response)
 
-    async def list_comments(self, block_id: str) -> PaginatedCommentResponse:
+    @traced
+    async def delete_block(self, block_id: str) -> Block:
+        """
+        Deletes (archives) a block and its children.
+
+        Args:
+            block_id: The ID of the block to delete.
+
+        Returns:
+            The archived Block object.
+        """
+        response = await self._request("DELETE", f"blocks/{clean_id(block_id)}")
+        return validate(Block, response)
+
+    @traced
+    async def search(
+        self, payload: SearchPayload | None = None
+    ) -> PaginatedSearchResponse:
+        """
+        Searches the pages and databases shared with the integration.
+
+        Args:
+            payload: The search payload (query, filter, sort, pagination).
+
+        Returns:
+            A paginated list of matching Page and Database objects.
+        """
+        dumped_payload = payload.model_dump(exclude_unset=True) if payload else None
+        response = await self._request("POST", "search", payload=dumped_payload)
+        return validate(PaginatedSearchResponse, response)
+
+    async def iter_search(
+        self, payload: SearchPayload | None = None
+    ) -> AsyncIterator[PaginatedSearchResponse]:
+        """
+        Searches the workspace and follows `next_cursor` until all results are fetched.
+
+        Args:
+            payload: The search payload (query, filter, sort).
+
+        Yields:
+            Each batch of results as returned by the API.
+        """
+        payload = payload.model_copy() if payload else SearchPayload()
+        while True:
+            response = await self.search(payload)
+            yield response
+            if not response.has_more or not response.next_cursor:
+                return
+            payload = payload.model_copy(
+                update={"start_cursor": response.next_cursor}
+            )
+
+    @traced
+    async def create_file_upload(
+        self, payload: CreateFileUploadPayload
+    ) -> FileUpload:
+        """
+        Creates a file upload to send content to.
+
+        Args:
+            payload: The upload mode, filename, content type and part count.
+
+        Returns:
+            The pending FileUpload object.
+        """
+        response = await self._request(
+            "POST", "file_uploads", payload=payload.model_dump(exclude_unset=True)
+        )
+        return validate(FileUpload, response)
+
+    @traced
+    async def send_file_upload(
+        self,
+        file_upload_id: str,
+        content: bytes,
+        filename: str,
+        content_type: str | None = None,
+        part_number: int | None = None,
+    ) -> FileUpload:
+        """
+        Sends the content, or one part of the content, of a file upload.
+
+        Args:
+            file_upload_id: The ID of the file upload.
+            content: The bytes to send.
+            filename: The name of the file.
+            content_type: The MIME type of the file.
+            part_number: The 1-based part number for multi-part uploads.
+
+        Returns:
+            The updated FileUpload object.
+        """
+        form = {"part_number": str(part_number)} if part_number is not None else None
+        response = await self._request(
+            "POST",
+            f"file_uploads/{file_upload_id}/send",
+            payload=form,
+            files={"file": (filename, content, content_type)},
+        )
+        return validate(FileUpload, response)
+
+    @traced
+    async def complete_file_upload(self, file_upload_id: str) -> FileUpload:
+        """
+        Completes a multi-part file upload after all parts were sent.
+
+        Args:
+            file_upload_id: The ID of the file upload.
+
+        Returns:
+            The uploaded FileUpload object.
+        """
+        response = await self._request(
+            "POST", f"file_uploads/{file_upload_id}/complete"
+        )
+        return validate(FileUpload, response)
+
+    @traced
+    async def list_comments(
+        self,
+        block_id: str,
+        start_cursor: str | None = None,
+        page_size: int | None = None,
+    ) -> PaginatedCommentResponse:
         """Retrieves a list of comments for a given block ID."""
-        response = await self._request("GET", f"comments?block_id={block_id}")
-        return PaginatedCommentResponse.model_validate(response)
+        params: dict[str, Any] = {"block_id": block_id}
+        if start_cursor is not None:
+            params["start_cursor"] = start_cursor
+        if page_size is not None:
+            params["page_size"] = page_size
+        response = await self._request("GET", "comments", params=params)
+        return validate(PaginatedCommentResponse, response)
+
+    async def iter_comments(
+        self, block_id: str, page_size: int | None = None
+    ) -> AsyncIterator[PaginatedCommentResponse]:
+        """
+        Retrieves the comments of a block or page, following `next_cursor`.
+
+        Args:
+            block_id: The ID of the block or page.
+            page_size: The number of comments to request per call.
+
+        Yields:
+            Each batch of comments as returned by the API.
+        """
+        cursor = None
+        while True:
+            response = await self.list_comments(
+                block_id, start_cursor=cursor, page_size=page_size
+            )
+            yield response
+            if not response.has_more or not response.next_cursor:
+                return
+            cursor = response.next_cursor
 
+    @traced
     async def create_comment(self, payload: CreateCommentPayload) -> Comment:
         """Creates a new comment."""
         response = await self._request(
             "POST", "comments", payload=payload.model_dump(exclude_unset=True)
         )
-        return Comment.model_validate(response)
+        return validate(Comment, response)
 
-    async def list_users(self) -> PaginatedUserResponse:
+    @traced
+    async def list_users(
+        self, start_cursor: str | None = None, page_size: int | None = None
+    ) -> PaginatedUserResponse:
         """Lists all users."""
-        response = await self._request("GET", "users")
-        return PaginatedUserResponse.model_validate(response)
+        params = {}
+        if start_cursor is not None:
+            params["start_cursor"] = start_cursor
+        if page_size is not None:
+            params["page_size"] = page_size
+        response = await self._request("GET", "users", params=params or None)
+        return validate(PaginatedUserResponse, response)
+
+    async def iter_users(
+        self, page_size: int | None = None
+    ) -> AsyncIterator[PaginatedUserResponse]:
+        """
+        Lists all users of the workspace, following `next_cursor`.
+
+        Args:
+            page_size: The number of users to request per call.
 
+        Yields:
+            Each batch of users as returned by the API.
+        """
+        cursor = None
+        while True:
+            response = await self.list_users(start_cursor=cursor, page_size=page_size)
+            yield response
+            if not response.has_more or not response.next_cursor:
+                return
+            cursor = response.next_cursor
+
+    @traced
     async def get_user(self, user_id: str) -> User:
         """Retrieves a user by their ID."""
         response = await self._request("GET", f"users/{user_id}")
-        return User.model_validate(response)
+        return validate(User, response)
 
+    @traced
     async def get_me(self) -> User:
         """Retrieves the bot user associated with the token."""
         response = await self._request("GET", "users/me")
-        return User.model_validate(response)
+        return validate(User, response)
 
-    async def get_page_property(
-        self, page_id: str, property_id: str
-    ) -> FilesProperty:
+    @traced
+    async def get_page_property_item(
+        self,
+        page_id: str,
+        property_id: str,
+        start_cursor: str | None = None,
+        page_size: int | None = None,
+    ) -> dict[str, Any]:
         """
-        Retrieves a single page property item.
+        Retrieves one page of a page property item, as returned by the API.
 
         Args:
             page_id: The ID of the page.
             property_id: The ID of the property.
+            start_cursor: The cursor of the page of items to fetch.
+            page_size: The number of items to request.
 
         Returns:
-            A dictionary representing the property item.
+            A property item object, or for title, rich text, relation, people
+            and rollup properties a paginated list of property items.
         """
         p_id = clean_id(page_id)
         prop_id = clean_id(property_id)
-        response = await self._request("GET", f"pages/{p_id}/properties/{prop_id}")
-        # ! Note: This currently only validates FilesProperty.
-        # TODO: Add a more robust validation for all property types.
-        return FilesProperty.model_validate(response)
+        params = {}
+        if start_cursor is not None:
+            params["start_cursor"] = start_cursor
+        if page_size is not None:
+            params["page_size"] = page_size
+        return await self._request(
+            "GET", f"pages/{p_id}/properties/{prop_id}", params=params or None
+        )
+
+    @traced
+    async def get_page_property(
+        self, page_id: str, property_id: str
+    ) -> PropertyValue:
+        """
+        Retrieves the complete value of a page property.
+
+        Paginated property items are followed to the end, so relations,
+        people, titles, rich text and rollups with more than 25 entries are not
+        truncated as they are in page objects.
+
+        Args:
+            page_id: The ID of the page.
+            property_id: The ID of the property.
+
+        Returns:
+            The property value, validated with the model for its type.
+        """
+        response = await self.get_page_property_item(page_id, property_id)
+        if response.get("object") != "list":
+            with phase("validate"):
+                return validate_property(response)
+
+        page = validate(PaginatedPropertyItemResponse, response)
+        items = list(page.results)
+        while page.has_more and page.next_cursor:
+            page = validate(
+                PaginatedPropertyItemResponse,
+                await self.get_page_property_item(
+                    page_id, property_id, start_cursor=page.next_cursor
+                ),
+            )
+            items.extend(page.results)
+        with phase("validate"):
+            return validate_property(
+                _assemble_property_item(page.property_item, items)
+            )
+
+    @traced
+    async def get_page_properties(
+        self, page_id: str, property_ids: list[str]
+    ) -> dict[str, PropertyValue]:
+        """
+        Retrieves the complete values of many properties of a page concurrently.
+
+        Args:
+            page_id: The ID of the page.
+            property_ids: The IDs of the properties.
+
+        Returns:
+            The property values by property ID.
+        """
+        values = await asyncio.gather(
+            *(self.get_page_property(page_id, prop_id) for prop_id in property_ids)
+        )
+        return dict(zip(property_ids, values))
+
+
+def _assemble_property_item(
+    property_item: dict[str, Any], items: list[dict[str, Any]]
+) -> dict[str, Any]:
+    """Rebuilds a property value from the items of a paginated property item."""
+    prop_type = property_item["type"]
+    if prop_type == "rollup":
+        value = dict(property_item.get("rollup") or {})
+        if value.get("type") in (None, "array", "incomplete"):
+            value.update(type="array", array=items)
+    else:
+        value = [item[item["type"]] for item in items]
+    return {"id": property_item["id"], "type": prop_type, prop_type: value}
@@ -0,0 +1,70 @@
+"""Per-operation deadlines that cover every request, retry and backoff."""
+
+import asyncio
+import time
+from collections.abc import Awaitable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TypeVar
+
+from app.core.integrations.notion.exceptions import NotionDeadlineExceededError
+
+T = TypeVar("T")
+
+# * The absolute deadline of the current operation, on the monotonic clock
+_deadline: ContextVar[float | None] = ContextVar("notion_deadline", default=None)
+
+
+@contextmanager
+def deadline(timeout: float) -> Iterator[None]:
+    """
+    Bounds every Notion request made inside the block by one time budget.
+
+    The budget covers rate limiting, retries and their backoff. Nested
+    deadlines never extend an outer one.
+
+        with deadline(0.5):
+            page = await client.get_page(page_id)
+
+    Args:
+        timeout: The budget in seconds.
+    """
+    expires = time.monotonic() + timeout
+    outer = _deadline.get()
+    token = _deadline.set(expires if outer is None else min(outer, expires))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def time_remaining() -> float | None:
+    """Returns the seconds left before the current deadline, or None if unbounded."""
+    expires = _deadline.get()
+    return None if expires is None else expires - time.monotonic()
+
+
+async def within_deadline(awaitable: Awaitable[T]) -> T:
+    """
+    Awaits something, giving up when the current deadline passes.
+
+    Args:
+        awaitable: The awaitable to wait for.
+
+    Returns:
+        Its result.
+
+    Raises:
+        NotionDeadlineExceededError: If the deadline passes first.
+    """
+    remaining = time_remaining()
+    if remaining is None:
+        return await awaitable
+    if remaining <= 0:
+        if asyncio.iscoroutine(awaitable):
+            awaitable.close()
+        raise NotionDeadlineExceededError()
+    try:
+        return await asyncio.wait_for(awaitable, remaining)
+    except asyncio.TimeoutError as e:
+        raise NotionDeadlineExceededError() from e
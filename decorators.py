@@ -6,10 +6,13 @@ from collections.abc import Callable, Coroutine
 from functools import wraps
 from typing import Any
 
+from app.core.integrations.notion.deadlines import time_remaining
 from app.core.integrations.notion.exceptions import (
+    NotionDeadlineExceededError,
     NotionRateLimitError,
     NotionServiceUnavailableError,
 )
+from app.core.integrations.notion.tracing import NoopTracer, count, phase, trace_call
 
 # * Configure logging
 logger = logging.getLogger(__name__)
@@ -52,6 +55,13 @@ def retry(
                         )
                         raise e
 
+                    remaining = time_remaining()
+                    if remaining is not None and remaining <= delay:
+                        # * No point in backing off past the caller's deadline
+                        raise NotionDeadlineExceededError(
+                            f"Deadline exceeded while retrying {func.__name__}"
+                        ) from e
+
                     logger.warning(
                         "Attempt %d/%d failed for %s. Retrying in %.2f seconds...",
                         attempt + 1,
@@ -59,9 +69,37 @@ def retry(
                         func.__name__,
                         delay,
                     )
-                    await asyncio.sleep(delay)
+                    count("retries")
+                    with phase("retry_sleep", attempt=attempt + 1):
+                        await asyncio.sleep(delay)
                     delay *= backoff_factor
 
         return wrapper
 
     return decorator
+
+
+def traced(
+    func: Callable[..., Coroutine[Any, Any, Any]],
+) -> Callable[..., Coroutine[Any, Any, Any]]:
+    """
+    A decorator to trace a client method as one call.
+
+    Uses the client's `tracer` and `slow_calls`, and does nothing when
+    neither is configured.
+
+    Args:
+        func: The client coroutine method.
+
+    Returns:
+        A decorated coroutine function.
+    """
+
+    @wraps(func)
+    async def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+        if self.slow_calls is None and isinstance(self.tracer, NoopTracer):
+            return await func(self, *args, **kwargs)
+        with trace_call(func.__name__, self.tracer, self.slow_calls):
+            return await func(self, *args, **kwargs)
+
+    return wrapper
@@ -6,11 +6,36 @@ from collections.abc import AsyncGenerator
 import httpx
 from fastapi import Depends, HTTPException, status
 
+from app.core.integrations.notion.cache import NotionCache, SQLiteCacheBackend
+from app.core.integrations.notion.circuit_breaker import CircuitBreakerRegistry
 from app.core.integrations.notion.client import AsyncNotionClient
+from app.core.integrations.notion.rate_limit import rate_limiter_from_env
+from app.core.integrations.notion.scheduler import RequestScheduler
+from app.core.integrations.notion.tracing import SlowCallLog
 
 # * Global httpx client for connection pooling
 _httpx_client = httpx.AsyncClient()
 
+# * Global rate limiter, since Notion's limit applies to the whole integration.
+# * Set NOTION_RATE_LIMIT_PATH to share it with every process on the host that
+# * uses the same NOTION_API_TOKEN.
+_rate_limiter = rate_limiter_from_env()
+
+# * Global scheduler, so page loads overtake background jobs sharing the limit
+_scheduler = RequestScheduler(_rate_limiter)
+
+# * Global circuit breakers, so an outage seen by one request fails the rest fast
+_circuit_breakers = CircuitBreakerRegistry()
+
+# * Optional cache shared by every worker process on the host
+_cache_path = os.getenv("NOTION_CACHE_PATH")
+_cache = NotionCache(SQLiteCacheBackend(_cache_path)) if _cache_path else None
+
+# * Optional log of calls slower than NOTION_SLOW_CALL_SECONDS, with where the
+# * time went
+_slow_call_seconds = os.getenv("NOTION_SLOW_CALL_SECONDS")
+_slow_calls = SlowCallLog(float(_slow_call_seconds)) if _slow_call_seconds else None
+
 
 async def get_notion_token() -> str:
     """Retrieves the Notion API token from environment variables."""
@@ -32,4 +57,12 @@ async def get_notion_client(
     Yields:
         An instance of the AsyncNotionClient.
     """
-    yield AsyncNotionClient(token=token, client=_httpx_client)
+    yield AsyncNotionClient(
+        token=token,
+        client=_httpx_client,
+        circuit_breakers=_circuit_breakers,
+        scheduler=_scheduler,
+        priority="interactive",
+        cache=_cache,
+        slow_calls=_slow_calls,
+    )
@@ -0,0 +1,83 @@
+"""Concurrent, fully paginated comment fetching across many blocks."""
+
+import asyncio
+import logging
+from collections.abc import Iterable
+
+from app.core.integrations.notion.client import AsyncNotionClient
+from app.core.integrations.notion.schemas import Comment
+from app.core.integrations.notion.utils import clean_id
+
+# * Configure logging
+logger = logging.getLogger(__name__)
+
+# * Comments of one block, grouped by discussion ID in order of appearance
+Discussions = dict[str, list[Comment]]
+
+DEFAULT_MAX_CONCURRENCY = 8
+
+
+def group_by_discussion(comments: Iterable[Comment]) -> Discussions:
+    """
+    Groups comments into discussion threads ordered by creation time.
+
+    Args:
+        comments: The comments to group.
+
+    Returns:
+        A mapping of discussion ID to its comments, oldest first. Threads are
+        ordered by their first comment.
+    """
+    discussions: Discussions = {}
+    for comment in sorted(comments, key=lambda comment: comment.created_time):
+        discussions.setdefault(comment.discussion_id, []).append(comment)
+    return discussions
+
+
+async def fetch_comments(client: AsyncNotionClient, block_id: str) -> list[Comment]:
+    """
+    Fetches every comment of a block or page, following all cursors.
+
+    Args:
+        client: The Notion client.
+        block_id: The ID of the block or page.
+
+    Returns:
+        All comments on the block.
+    """
+    comments: list[Comment] = []
+    async for response in client.iter_comments(block_id, page_size=100):
+        comments.extend(response.results)
+    return comments
+
+
+async def fetch_discussions(
+    client: AsyncNotionClient,
+    block_ids: Iterable[str],
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+) -> dict[str, Discussions]:
+    """
+    Fetches the comments of many blocks or pages concurrently.
+
+    Each block is paginated to the end. At most `max_concurrency` blocks are
+    fetched at once, and every request still goes through the client's rate
+    limiter.
+
+    Args:
+        client: The Notion client.
+        block_ids: The IDs of the blocks or pages. Duplicates are fetched once.
+        max_concurrency: The maximum number of blocks fetched at once.
+
+    Returns:
+        A mapping of each block ID, as given, to its discussions.
+    """
+    unique = list(dict.fromkeys(block_ids))
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def fetch(block_id: str) -> Discussions:
+        async with semaphore:
+            return group_by_discussion(await fetch_comments(client, clean_id(block_id)))
+
+    results = await asyncio.gather(*map(fetch, unique))
+    logger.debug("Fetched comments of %d blocks.", len(unique))
+    return dict(zip(unique, results))
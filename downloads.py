@@ -0,0 +1,276 @@
+"""Concurrent file downloads with a content-addressed disk cache."""
+
+import asyncio
+import hashlib
+import logging
+import os
+from collections.abc import AsyncIterator, Iterable
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import httpx
+
+from app.core.integrations.notion.exceptions import NotionError
+from app.core.integrations.notion.schemas import Block, File, FilesProperty
+
+# * Configure logging
+logger = logging.getLogger(__name__)
+
+# * Block types that carry a file object
+FILE_BLOCK_TYPES = ("file", "image", "pdf", "video", "audio")
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+# * Notion serves uploaded files from presigned URLs on this host suffix
+_S3_HOST_SUFFIX = ".amazonaws.com"
+
+
+class NotionDownloadError(NotionError):
+    """Raised when a file cannot be downloaded."""
+
+
+def file_url(file: File | dict) -> str | None:
+    """
+    Returns the download URL of a Notion file object.
+
+    Args:
+        file: A `File` model or a raw file object, e.g. from a block.
+
+    Returns:
+        The URL, or None if the object has none.
+    """
+    if isinstance(file, dict):
+        content = file.get(file.get("type")) or {}
+    else:
+        content = (file.external if file.type == "external" else file.file) or {}
+    url = content.get("url")
+    return str(url) if url else None
+
+
+def collect_file_urls(items: Iterable[FilesProperty | Block | File]) -> list[str]:
+    """
+    Collects the distinct file URLs of files properties, file blocks and files.
+
+    Args:
+        items: Files properties, blocks (non-file blocks are skipped) or files.
+
+    Returns:
+        The URLs in first-seen order.
+    """
+    urls: dict[str, None] = {}
+    for item in items:
+        if isinstance(item, FilesProperty):
+            candidates = [file_url(file) for file in item.files]
+        elif isinstance(item, Block):
+            content = getattr(item, item.type, None) if item.type in FILE_BLOCK_TYPES else None
+            candidates = [file_url(content)] if content else []
+        else:
+            candidates = [file_url(item)]
+        urls.update((url, None) for url in candidates if url)
+    return list(urls)
+
+
+def cache_key(url: str) -> str:
+    """
+    Derives the cache key of a URL.
+
+    Notion-hosted files are served from presigned S3 URLs whose signing
+    parameters (`X-Amz-*`) change every time they are re-issued, so those
+    parameters are ignored and a file keeps its cache entry across URL
+    refreshes. Any other URL, e.g. of an external file, is keyed as a whole.
+
+    Args:
+        url: The file URL.
+
+    Returns:
+        A hex digest identifying the file.
+    """
+    parts = urlsplit(url)
+    if (parts.hostname or "").endswith(_S3_HOST_SUFFIX):
+        query = [
+            (name, value)
+            for name, value in parse_qsl(parts.query, keep_blank_values=True)
+            if not name.lower().startswith("x-amz-")
+        ]
+        url = urlunsplit(parts._replace(query=urlencode(query), fragment=""))
+    return hashlib.sha256(url.encode()).hexdigest()
+
+
+class FileDownloader:
+    """
+    Downloads files to a content-addressed cache on disk.
+
+    Files are stored once per SHA-256 of their content under `objects/`, and
+    each URL maps to its content through a small key file under `keys/`, so
+    the same image attached to many pages takes up disk space once. Repeat
+    requests for a URL are served from disk without touching the network, and
+    concurrent requests for the same URL share one download.
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        cache_dir: str | os.PathLike,
+        max_concurrency: int = 4,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ):
+        """
+        Initializes the downloader.
+
+        Args:
+            client: The httpx client used for downloads. It should not carry
+                the Notion authorization header, since file URLs are presigned.
+            cache_dir: The directory holding the cache.
+            max_concurrency: The maximum number of simultaneous downloads.
+            chunk_size: The size of the chunks streamed to and from disk.
+        """
+        self.client = client
+        self.cache_dir = Path(cache_dir)
+        self.chunk_size = chunk_size
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._in_flight: dict[str, asyncio.Task[Path]] = {}
+        for directory in ("objects", "keys", "partial"):
+            (self.cache_dir / directory).mkdir(parents=True, exist_ok=True)
+
+    def _object_path(self, digest: str) -> Path:
+        return self.cache_dir / "objects" / digest[:2] / digest
+
+    def _key_path(self, key: str) -> Path:
+        return self.cache_dir / "keys" / key
+
+    def cached_path(self, url: str) -> Path | None:
+        """
+        Returns the cached file for a URL without downloading it.
+
+        Args:
+            url: The file URL.
+
+        Returns:
+            The path of the cached content, or None if it is not cached.
+        """
+        key_path = self._key_path(cache_key(url))
+        if not key_path.exists():
+            return None
+        path = self._object_path(key_path.read_text().strip())
+        return path if path.exists() else None
+
+    async def fetch(self, url: str) -> Path:
+        """
+        Returns the local copy of a file, downloading it if needed.
+
+        Args:
+            url: The file URL.
+
+        Returns:
+            The path of the cached content.
+
+        Raises:
+            NotionDownloadError: If the download fails.
+        """
+        cached = self.cached_path(url)
+        if cached is not None:
+            return cached
+
+        key = cache_key(url)
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._download(url, key))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def fetch_many(self, urls: Iterable[str]) -> dict[str, Path]:
+        """
+        Fetches many files concurrently, within the concurrency limit.
+
+        Args:
+            urls: The file URLs.
+
+        Returns:
+            A mapping of each URL to its cached path.
+        """
+        unique = list(dict.fromkeys(urls))
+        paths = await asyncio.gather(*(self.fetch(url) for url in unique))
+        return dict(zip(unique, paths))
+
+    def _hash_file(self, path: Path, digest: "hashlib._Hash") -> None:
+        with open(path, "rb") as file:
+            while chunk := file.read(self.chunk_size):
+                digest.update(chunk)
+
+    def _store(self, partial: Path, key: str, digest: str) -> Path:
+        path = self._object_path(digest)
+        if path.exists():
+            partial.unlink()
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(partial, path)
+        self._key_path(key).write_text(digest)
+        return path
+
+    async def _download(self, url: str, key: str) -> Path:
+        # * Interrupted downloads leave a partial file that is resumed with Range
+        partial = self.cache_dir / "partial" / key
+        offset = partial.stat().st_size if partial.exists() else 0
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+        # * Hashed as the bytes arrive, and disk I/O runs in worker threads, so
+        # * concurrent downloads are not stalled
+        digest = hashlib.sha256()
+        async with self._semaphore:
+            try:
+                async with self.client.stream("GET", url, headers=headers) as response:
+                    # ! Note: 416 means the partial file already holds every byte.
+                    complete = bool(offset) and response.status_code == 416
+                    if not complete:
+                        response.raise_for_status()
+                    resume = complete or response.status_code == 206
+                    if resume:
+                        await asyncio.to_thread(self._hash_file, partial, digest)
+                    if not complete:
+                        file = await asyncio.to_thread(
+                            open, partial, "ab" if resume else "wb"
+                        )
+                        try:
+                            async for chunk in response.aiter_bytes(self.chunk_size):
+                                digest.update(chunk)
+                                await asyncio.to_thread(file.write, chunk)
+                        finally:
+                            await asyncio.to_thread(file.close)
+            except httpx.HTTPError as e:
+                logger.error("Download of %s failed: %s", url, e)
+                raise NotionDownloadError(f"Download failed: {e}") from e
+
+        return await asyncio.to_thread(self._store, partial, key, digest.hexdigest())
+
+    async def read_range(
+        self, url: str, start: int = 0, end: int | None = None
+    ) -> AsyncIterator[bytes]:
+        """
+        Streams a byte range of a file from the cache, downloading it if needed.
+
+        This is meant for proxying files to HTTP clients that send `Range`
+        headers, e.g. for video seeking.
+
+        Args:
+            url: The file URL.
+            start: The first byte to read.
+            end: The last byte to read (inclusive), or None for the end of file.
+
+        Yields:
+            The requested bytes, in chunks.
+        """
+        path = await self.fetch(url)
+        remaining = None if end is None else end - start + 1
+        file = await asyncio.to_thread(open, path, "rb")
+        try:
+            await asyncio.to_thread(file.seek, start)
+            while remaining is None or remaining > 0:
+                size = self.chunk_size if remaining is None else min(self.chunk_size, remaining)
+                chunk = await asyncio.to_thread(file.read, size)
+                if not chunk:
+                    return
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+        finally:
+            await asyncio.to_thread(file.close)
@@ -0,0 +1,1019 @@
+"""A stateful in-memory emulator of the Notion API for offline load tests."""
+
+import asyncio
+import json
+import logging
+import math
+import random
+import re
+import time
+import uuid
+from collections import deque
+from collections.abc import Callable, Iterable
+from datetime import datetime, timezone
+from typing import Any
+from urllib.parse import unquote
+
+import httpx
+from pydantic import ValidationError
+
+from app.core.integrations.notion.filters import FilterError, query_pages
+from app.core.integrations.notion.schemas import Page, QueryDatabasePayload
+from app.core.integrations.notion.utils import clean_id
+
+# * Configure logging
+logger = logging.getLogger(__name__)
+
+MAX_PAGE_SIZE = 100
+MAX_CHILDREN_PER_REQUEST = 100
+# * Page objects include at most this many relation or people entries
+PROPERTY_ITEM_LIMIT = 25
+# * Appended blocks may nest children this many levels deep
+MAX_NESTING_DEPTH = 2
+
+# * Property types whose property item endpoint returns a paginated list
+_PAGINATED_TYPES = {"title", "rich_text", "relation", "people"}
+_RICH_TEXT_TYPES = {"title", "rich_text"}
+_OPTION_TYPES = {"select", "status"}
+_LIST_TYPES = {"title", "rich_text", "multi_select", "people", "relation", "files"}
+_READ_ONLY_TYPES = {
+    "created_time",
+    "last_edited_time",
+    "created_by",
+    "last_edited_by",
+    "formula",
+    "rollup",
+    "unique_id",
+}
+# * Block types whose content has a color and rich text
+_TEXT_BLOCK_TYPES = {
+    "paragraph",
+    "heading_1",
+    "heading_2",
+    "heading_3",
+    "bulleted_list_item",
+    "numbered_list_item",
+    "to_do",
+    "toggle",
+    "quote",
+    "callout",
+}
+_ERROR_CODES = {
+    400: "validation_error",
+    401: "unauthorized",
+    404: "object_not_found",
+    409: "conflict_error",
+    429: "rate_limited",
+    500: "internal_server_error",
+    502: "bad_gateway",
+    503: "service_unavailable",
+    504: "gateway_timeout",
+}
+_DEFAULT_ANNOTATIONS = {
+    "bold": False,
+    "italic": False,
+    "strikethrough": False,
+    "underline": False,
+    "code": False,
+    "color": "default",
+}
+
+
+class _APIError(Exception):
+    """An error response of the emulated API."""
+
+    def __init__(
+        self, status: int, message: str, headers: dict[str, str] | None = None
+    ):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.headers = headers or {}
+
+    def response(self) -> httpx.Response:
+        return httpx.Response(
+            self.status,
+            headers=self.headers,
+            json={
+                "object": "error",
+                "status": self.status,
+                "code": _ERROR_CODES.get(self.status, "internal_server_error"),
+                "message": self.message,
+            },
+        )
+
+
+def _now() -> str:
+    return (
+        datetime.now(timezone.utc)
+        .isoformat(timespec="milliseconds")
+        .replace("+00:00", "Z")
+    )
+
+
+def _user_ref(user_id: str) -> dict[str, Any]:
+    return {"object": "user", "id": user_id}
+
+
+def _complete_rich_text(items: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Adds the fields the API returns to rich text written in request format."""
+    completed = []
+    for item in items:
+        item_type = item.get("type", "text")
+        content = dict(item.get(item_type) or {})
+        if item_type == "text":
+            content.setdefault("link", None)
+            plain_text = content.get("content", "")
+        else:
+            plain_text = content.get("expression", item.get("plain_text", ""))
+        completed.append(
+            {
+                "type": item_type,
+                item_type: content,
+                "annotations": {**_DEFAULT_ANNOTATIONS, **item.get("annotations", {})},
+                "plain_text": plain_text,
+                "href": (content.get("link") or {}).get("url"),
+            }
+        )
+    return completed
+
+
+def _plain_text(items: list[dict[str, Any]]) -> str:
+    return "".join(item.get("plain_text", "") for item in items)
+
+
+def _page_size(value: Any) -> int:
+    if value is None:
+        return MAX_PAGE_SIZE
+    try:
+        size = int(value)
+    except (TypeError, ValueError):
+        raise _APIError(400, "page_size should be a number.") from None
+    if not 1 <= size <= MAX_PAGE_SIZE:
+        raise _APIError(400, f"page_size should be between 1 and {MAX_PAGE_SIZE}.")
+    return size
+
+
+def _paginate(
+    items: list[Any],
+    start_cursor: str | None,
+    page_size: Any,
+    cursor_of: Callable[[Any], str] | None = None,
+) -> dict[str, Any]:
+    """
+    Returns one page of a list the way the API does.
+
+    Cursors are the ID of the first item of the next page, or its position
+    for items without an ID.
+    """
+    size = _page_size(page_size)
+    cursors = [cursor_of(item) if cursor_of else str(i) for i, item in enumerate(items)]
+    start = 0
+    if start_cursor is not None:
+        try:
+            start = cursors.index(start_cursor)
+        except ValueError:
+            raise _APIError(400, "start_cursor provided is invalid.") from None
+    end = start + size
+    has_more = end < len(items)
+    return {
+        "object": "list",
+        "results": items[start:end],
+        "next_cursor": cursors[end] if has_more else None,
+        "has_more": has_more,
+    }
+
+
+class NotionEmulator:
+    """
+    An in-memory Notion workspace served through `httpx.MockTransport`.
+
+    Emulates the endpoints `AsyncNotionClient` uses for users, databases,
+    pages, page properties, blocks, search and comments, with pagination,
+    validation errors and truncated page properties like the real API. File
+    uploads are not emulated. Latency, rate limiting and server errors can
+    be injected to load-test client features locally:
+
+        emulator = NotionEmulator(latency=0.05, rate_limit=3, seed=1)
+        database = emulator.add_database("Tasks", {"Name": "title"})
+        async with httpx.AsyncClient(transport=emulator.transport) as http:
+            client = AsyncNotionClient("token", http)
+            await client.query_database(database["id"])
+
+    Rate limiting is a token bucket on the wall clock, so with it enabled the
+    responses depend on timing. Everything else is deterministic for a seed.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        rate_limit: float | None = None,
+        burst: float | None = None,
+        error_rate: float = 0.0,
+        error_statuses: Iterable[int] = (500, 503),
+        seed: int | None = None,
+    ):
+        """
+        Initializes an empty workspace with a bot user.
+
+        Args:
+            latency: The number of seconds each response is delayed.
+            jitter: The maximum number of seconds randomly added to `latency`.
+            rate_limit: The number of requests per second allowed before
+                responding with 429 and a `Retry-After` header, or None for
+                no limit.
+            burst: The number of requests allowed at once. Defaults to
+                `rate_limit`, and at least one.
+            error_rate: The probability of answering a request with a random
+                status from `error_statuses`.
+            error_statuses: The server errors injected by `error_rate`.
+            seed: The seed of the random number generator behind `jitter` and
+                `error_rate`.
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit = rate_limit
+        self.burst = burst if burst is not None else max(1.0, rate_limit or 0.0)
+        self.error_rate = error_rate
+        self.error_statuses = tuple(error_statuses)
+        self.random = random.Random(seed)
+        # * Method, path and status of every request handled
+        self.log: list[tuple[str, str, int]] = []
+
+        self.users: dict[str, dict[str, Any]] = {}
+        self.databases: dict[str, dict[str, Any]] = {}
+        self.pages: dict[str, dict[str, Any]] = {}
+        self.blocks: dict[str, dict[str, Any]] = {}
+        self.comments: list[dict[str, Any]] = []
+        # * Ordered child block IDs of each page and block
+        self._children: dict[str, list[str]] = {}
+        # * Validated pages for local query evaluation, dropped on write
+        self._page_models: dict[str, Page] = {}
+        self._unique_ids: dict[str, int] = {}
+        self._faults: deque[int] = deque()
+        self._tokens = self.burst
+        self._refilled_at = time.monotonic()
+
+        self.bot = self.add_user("Emulator", user_type="bot")
+        self._routes: list[tuple[str, re.Pattern[str], Callable[..., Any]]] = [
+            (method, re.compile(pattern), handler)
+            for method, pattern, handler in [
+                ("GET", r"users/me", self._get_me),
+                ("GET", r"users/(?P<user_id>[^/]+)", self._get_user),
+                ("GET", r"users", self._list_users),
+                ("GET", r"databases/(?P<database_id>[^/]+)", self._get_database),
+                (
+                    "POST",
+                    r"databases/(?P<database_id>[^/]+)/query",
+                    self._query_database,
+                ),
+                ("POST", r"pages", self._create_page),
+                ("GET", r"pages/(?P<page_id>[^/]+)", self._get_page),
+                ("PATCH", r"pages/(?P<page_id>[^/]+)", self._update_page),
+                (
+                    "GET",
+                    r"pages/(?P<page_id>[^/]+)/properties/(?P<property_id>[^/]+)",
+                    self._get_property_item,
+                ),
+                ("GET", r"blocks/(?P<block_id>[^/]+)/children", self._list_children),
+                (
+                    "PATCH",
+                    r"blocks/(?P<block_id>[^/]+)/children",
+                    self._append_children,
+                ),
+                ("GET", r"blocks/(?P<block_id>[^/]+)", self._get_block),
+                ("PATCH", r"blocks/(?P<block_id>[^/]+)", self._update_block),
+                ("DELETE", r"blocks/(?P<block_id>[^/]+)", self._delete_block),
+                ("POST", r"search", self._search),
+                ("GET", r"comments", self._list_comments),
+                ("POST", r"comments", self._create_comment),
+            ]
+        ]
+
+    @property
+    def transport(self) -> httpx.MockTransport:
+        """A transport for `httpx.AsyncClient` answering from this workspace."""
+        return httpx.MockTransport(self.handle)
+
+    def fail_next(self, status: int, count: int = 1) -> None:
+        """
+        Answers the next requests with an error, regardless of `error_rate`.
+
+        Args:
+            status: The HTTP status, e.g. 429 or 503.
+            count: The number of requests to fail.
+        """
+        self._faults.extend([status] * count)
+
+    # * Seeding
+
+    def add_user(
+        self, name: str, user_type: str = "person", email: str | None = None
+    ) -> dict[str, Any]:
+        """Adds a person or bot user to the workspace."""
+        user_id = str(uuid.uuid4())
+        user = {
+            "object": "user",
+            "id": user_id,
+            "name": name,
+            "avatar_url": None,
+            "type": user_type,
+            user_type: {"email": email} if user_type == "person" else {},
+        }
+        self.users[clean_id(user_id)] = user
+        return user
+
+    def add_database(
+        self,
+        title: str,
+        properties: dict[str, str | dict[str, Any]],
+        parent_page_id: str | None = None,
+    ) -> dict[str, Any]:
+        """
+        Adds a database.
+
+        Args:
+            title: The title of the database.
+            properties: The schema, mapping each property name to its type or
+                to a configuration such as
+                `{"type": "select", "select": {"options": [{"name": "Done"}]}}`.
+                Exactly one property must be a title.
+            parent_page_id: The page containing the database, or None for
+                the workspace.
+
+        Returns:
+            The database object.
+        """
+        schema = {}
+        for name, config in properties.items():
+            if isinstance(config, str):
+                config = {"type": config}
+            prop_type = config["type"]
+            prop_config = dict(config.get(prop_type) or {})
+            if prop_type in _OPTION_TYPES | {"multi_select"}:
+                prop_config["options"] = [
+                    self._new_option(option)
+                    for option in prop_config.get("options", [])
+                ]
+            schema[name] = {
+                "id": "title" if prop_type == "title" else uuid.uuid4().hex[:4],
+                "name": name,
+                "type": prop_type,
+                prop_type: prop_config,
+            }
+        if [prop["type"] for prop in schema.values()].count("title") != 1:
+            raise ValueError("A database needs exactly one title property.")
+
+        database_id = str(uuid.uuid4())
+        now = _now()
+        database = {
+            "object": "database",
+            "id": database_id,
+            "created_time": now,
+            "last_edited_time": now,
+            "created_by": _user_ref(self.bot["id"]),
+            "last_edited_by": _user_ref(self.bot["id"]),
+            "title": _complete_rich_text([{"text": {"content": title}}]),
+            "description": [],
+            "properties": schema,
+            "parent": self._parent(parent_page_id),
+            "url": f"https://www.notion.so/{clean_id(database_id)}",
+            "archived": False,
+            "is_inline": False,
+        }
+        self.databases[clean_id(database_id)] = database
+        if parent_page_id is not None:
+            self._add_child_object(parent_page_id, database_id, "child_database", title)
+        return database
+
+    def add_page(
+        self,
+        database_id: str | None = None,
+        parent_page_id: str | None = None,
+        properties: dict[str, Any] | None = None,
+        children: list[dict[str, Any]] | None = None,
+    ) -> dict[str, Any]:
+        """
+        Adds a page, as if created through the API.
+
+        Args:
+            database_id: The database to add the page to.
+            parent_page_id: The page to add the page under, if not in a
+                database.
+            properties: The property values in request format.
+            children: The content blocks in request format.
+
+        Returns:
+            The page object.
+        """
+        parent = (
+            {"database_id": database_id}
+            if database_id is not None
+            else {"page_id": parent_page_id}
+        )
+        body = {"parent": parent, "properties": properties or {}}
+        if children:
+            body["children"] = children
+        return self._create_page(body)
+
+    def add_blocks(
+        self, parent_id: str, children: list[dict[str, Any]]
+    ) -> list[dict[str, Any]]:
+        """Appends blocks in request format to a page or block."""
+        return self._append(parent_id, children)
+
+    # * Transport
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        """Answers a request, after the configured latency."""
+        delay = self.latency + (
+            self.random.uniform(0, self.jitter) if self.jitter else 0
+        )
+        if delay > 0:
+            await asyncio.sleep(delay)
+        try:
+            response = self._respond(request)
+        except _APIError as e:
+            response = e.response()
+        self.log.append((request.method, request.url.path, response.status_code))
+        return response
+
+    def _respond(self, request: httpx.Request) -> httpx.Response:
+        if not request.headers.get("Authorization", "").startswith("Bearer "):
+            raise _APIError(401, "API token is invalid.")
+        wait = self._throttle()
+        if wait is not None:
+            raise _APIError(
+                429,
+                "You have been rate limited. Please try again in a few minutes.",
+                {"Retry-After": str(math.ceil(wait))},
+            )
+        status = self._fault()
+        if status is not None:
+            headers = {"Retry-After": "1"} if status == 429 else None
+            raise _APIError(status, "Injected failure.", headers)
+
+        path = request.url.path.removeprefix("/v1/")
+        for method, pattern, handler in self._routes:
+            match = pattern.fullmatch(path)
+            if match and method == request.method:
+                break
+        else:
+            raise _APIError(400, f"Invalid request URL: {request.method} {path}")
+        try:
+            body = json.loads(request.content) if request.content else {}
+        except ValueError:
+            raise _APIError(400, "Error parsing JSON body.") from None
+        params = {key: unquote(value) for key, value in match.groupdict().items()}
+        query = dict(request.url.params)
+        return httpx.Response(200, json=handler(body, query, **params))
+
+    def _throttle(self) -> float | None:
+        """Takes a token from the bucket, or returns the seconds until one is free."""
+        if self.rate_limit is None:
+            return None
+        now = time.monotonic()
+        self._tokens = min(
+            self.burst, self._tokens + (now - self._refilled_at) * self.rate_limit
+        )
+        self._refilled_at = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return None
+        return (1 - self._tokens) / self.rate_limit
+
+    def _fault(self) -> int | None:
+        if self._faults:
+            return self._faults.popleft()
+        if self.error_rate and self.random.random() < self.error_rate:
+            return self.random.choice(self.error_statuses)
+        return None
+
+    # * Lookups
+
+    def _lookup(self, store: dict[str, dict[str, Any]], object_id: str, kind: str):
+        obj = store.get(clean_id(object_id))
+        if obj is None:
+            raise _APIError(
+                404,
+                f"Could not find {kind} with ID: {object_id}. Make sure the "
+                "relevant pages and databases are shared with your integration.",
+            )
+        return obj
+
+    def _container(self, block_id: str) -> str:
+        """Returns the clean ID of a page or block that can have children."""
+        cid = clean_id(block_id)
+        if cid not in self.pages and cid not in self.blocks:
+            self._lookup(self.blocks, block_id, "block")
+        return cid
+
+    def _parent(self, parent_page_id: str | None) -> dict[str, Any]:
+        if parent_page_id is None:
+            return {"type": "workspace", "workspace": True}
+        page = self._lookup(self.pages, parent_page_id, "page")
+        return {"type": "page_id", "page_id": page["id"]}
+
+    # * Users
+
+    def _get_me(self, body: dict, query: dict) -> dict[str, Any]:
+        return self.bot
+
+    def _get_user(self, body: dict, query: dict, user_id: str) -> dict[str, Any]:
+        return self._lookup(self.users, user_id, "user")
+
+    def _list_users(self, body: dict, query: dict) -> dict[str, Any]:
+        return _paginate(
+            list(self.users.values()),
+            query.get("start_cursor"),
+            query.get("page_size"),
+            lambda user: user["id"],
+        )
+
+    # * Databases and pages
+
+    def _get_database(
+        self, body: dict, query: dict, database_id: str
+    ) -> dict[str, Any]:
+        return self._lookup(self.databases, database_id, "database")
+
+    def _query_database(
+        self, body: dict, query: dict, database_id: str
+    ) -> dict[str, Any]:
+        database = self._lookup(self.databases, database_id, "database")
+        try:
+            payload = QueryDatabasePayload.model_validate(body)
+        except ValidationError as e:
+            raise _APIError(400, str(e)) from None
+        pages = [
+            self._page_model(cid)
+            for cid, page in self.pages.items()
+            if page["parent"].get("database_id") == database["id"]
+            and not page["archived"]
+        ]
+        try:
+            matches = query_pages(pages, payload)
+        except FilterError as e:
+            raise _APIError(400, str(e)) from None
+        response = _paginate(
+            matches, payload.start_cursor, payload.page_size, lambda page: page.id
+        )
+        response["results"] = [
+            self._render_page(self.pages[clean_id(page.id)])
+            for page in response["results"]
+        ]
+        return response
+
+    def _page_model(self, cid: str) -> Page:
+        model = self._page_models.get(cid)
+        if model is None:
+            model = Page.model_validate(
+                self._render_page(self.pages[cid], truncate=False)
+            )
+            self._page_models[cid] = model
+        return model
+
+    def _create_page(self, body: dict, query: dict | None = None) -> dict[str, Any]:
+        parent = body.get("parent") or {}
+        if parent.get("database_id"):
+            database = self._lookup(self.databases, parent["database_id"], "database")
+            schema = database["properties"]
+            page_parent = {"type": "database_id", "database_id": database["id"]}
+        elif parent.get("page_id"):
+            parent_page = self._lookup(self.pages, parent["page_id"], "page")
+            schema = {"title": {"id": "title", "name": "title", "type": "title"}}
+            page_parent = {"type": "page_id", "page_id": parent_page["id"]}
+        else:
+            raise _APIError(400, "body.parent should be a page or database.")
+
+        page_id = str(uuid.uuid4())
+        cid = clean_id(page_id)
+        now = _now()
+        page = {
+            "object": "page",
+            "id": page_id,
+            "created_time": now,
+            "last_edited_time": now,
+            "created_by": _user_ref(self.bot["id"]),
+            "last_edited_by": _user_ref(self.bot["id"]),
+            "cover": body.get("cover"),
+            "icon": body.get("icon"),
+            "parent": page_parent,
+            "archived": False,
+            "properties": {
+                name: self._initial_value(page_parent, prop)
+                for name, prop in schema.items()
+            },
+            "url": f"https://www.notion.so/{cid}",
+        }
+        self._set_properties(page, schema, body.get("properties") or {})
+        self.pages[cid] = page
+        self._children[cid] = []
+        if page_parent["type"] == "page_id":
+            title = _plain_text(page["properties"]["title"]["title"])
+            self._add_child_object(page_parent["page_id"], page_id, "child_page", title)
+        if body.get("children"):
+            self._append(page_id, body["children"])
+        return self._render_page(page)
+
+    def _get_page(self, body: dict, query: dict, page_id: str) -> dict[str, Any]:
+        return self._render_page(self._lookup(self.pages, page_id, "page"))
+
+    def _update_page(self, body: dict, query: dict, page_id: str) -> dict[str, Any]:
+        page = self._lookup(self.pages, page_id, "page")
+        if page["archived"] and body.get("archived") is not False:
+            raise _APIError(400, "Can't edit block that is archived.")
+        if page["parent"]["type"] == "database_id":
+            schema = self.databases[clean_id(page["parent"]["database_id"])][
+                "properties"
+            ]
+        else:
+            schema = {"title": {"id": "title", "name": "title", "type": "title"}}
+        self._set_properties(page, schema, body.get("properties") or {})
+        for key in ("archived", "icon", "cover"):
+            if key in body:
+                page[key] = body[key]
+        page["last_edited_time"] = _now()
+        self._page_models.pop(clean_id(page["id"]), None)
+        return self._render_page(page)
+
+    def _initial_value(
+        self, parent: dict[str, Any], prop: dict[str, Any]
+    ) -> dict[str, Any]:
+        prop_type = prop["type"]
+        if prop_type in _LIST_TYPES:
+            value: Any = []
+        elif prop_type == "checkbox":
+            value = False
+        elif prop_type == "formula":
+            value = {"type": "string", "string": None}
+        elif prop_type == "rollup":
+            value = {"type": "array", "array": [], "function": "show_original"}
+        elif prop_type == "unique_id":
+            database_id = parent["database_id"]
+            self._unique_ids[database_id] = self._unique_ids.get(database_id, 0) + 1
+            value = {"prefix": None, "number": self._unique_ids[database_id]}
+        else:
+            value = None
+        initial = {"id": prop["id"], "type": prop_type, prop_type: value}
+        if prop_type == "relation":
+            initial["has_more"] = False
+        return initial
+
+    def _set_properties(
+        self,
+        page: dict[str, Any],
+        schema: dict[str, dict[str, Any]],
+        values: dict[str, Any],
+    ) -> None:
+        """Writes property values in request format, validating them like the API."""
+        by_id = {prop["id"]: name for name, prop in schema.items()}
+        for key, value in values.items():
+            name = key if key in schema else by_id.get(key)
+            if name is None:
+                raise _APIError(400, f"{key} is not a property that exists.")
+            prop = schema[name]
+            prop_type = prop["type"]
+            if prop_type in _READ_ONLY_TYPES:
+                raise _APIError(400, f"{name} is a read-only property.")
+            if not isinstance(value, dict) or prop_type not in value:
+                raise _APIError(400, f"{name} is expected to be {prop_type}.")
+            raw = value[prop_type]
+            if prop_type in _RICH_TEXT_TYPES:
+                raw = _complete_rich_text(raw)
+            elif prop_type in _OPTION_TYPES:
+                raw = None if raw is None else self._option(prop, raw)
+            elif prop_type == "multi_select":
+                raw = [self._option(prop, option) for option in raw]
+            elif prop_type == "people":
+                raw = [_user_ref(user["id"]) for user in raw]
+            elif prop_type == "relation":
+                raw = [{"id": related["id"]} for related in raw]
+            page["properties"][name] = {**page["properties"][name], prop_type: raw}
+
+    def _new_option(self, option: dict[str, Any]) -> dict[str, Any]:
+        return {
+            "id": option.get("id") or str(uuid.uuid4()),
+            "name": option["name"],
+            "color": option.get("color", "default"),
+        }
+
+    def _option(self, prop: dict[str, Any], value: dict[str, Any]) -> dict[str, Any]:
+        """Finds a select option by ID or name, adding it to the schema if new."""
+        options = prop.setdefault(prop["type"], {}).setdefault("options", [])
+        for option in options:
+            if option["id"] == value.get("id") or option["name"] == value.get("name"):
+                return option
+        if prop["type"] == "status" or "name" not in value:
+            raise _APIError(400, f"Invalid option for {prop['name']}.")
+        option = self._new_option(value)
+        options.append(option)
+        return option
+
+    def _render_page(
+        self, page: dict[str, Any], truncate: bool = True
+    ) -> dict[str, Any]:
+        """Returns a page object, with read-only properties filled in."""
+        properties = {}
+        for name, value in page["properties"].items():
+            prop_type = value["type"]
+            if prop_type in (
+                "created_time",
+                "last_edited_time",
+                "created_by",
+                "last_edited_by",
+            ):
+                value = {**value, prop_type: page[prop_type]}
+            elif truncate and prop_type in ("relation", "people"):
+                if len(value[prop_type]) > PROPERTY_ITEM_LIMIT:
+                    value = {
+                        **value,
+                        prop_type: value[prop_type][:PROPERTY_ITEM_LIMIT],
+                        "has_more": True,
+                    }
+            properties[name] = value
+        return {**page, "properties": properties}
+
+    def _get_property_item(
+        self, body: dict, query: dict, page_id: str, property_id: str
+    ) -> dict[str, Any]:
+        page = self._render_page(
+            self._lookup(self.pages, page_id, "page"), truncate=False
+        )
+        for value in page["properties"].values():
+            if value["id"] == property_id:
+                break
+        else:
+            raise _APIError(404, f"Could not find property with ID: {property_id}.")
+        prop_type = value["type"]
+        if prop_type not in _PAGINATED_TYPES:
+            return {"object": "property_item", **value}
+        items = [
+            {
+                "object": "property_item",
+                "id": property_id,
+                "type": prop_type,
+                prop_type: item,
+            }
+            for item in value[prop_type]
+        ]
+        response = _paginate(items, query.get("start_cursor"), query.get("page_size"))
+        response["type"] = "property_item"
+        response["property_item"] = {
+            "id": property_id,
+            "type": prop_type,
+            prop_type: {},
+            "next_url": None,
+        }
+        return response
+
+    # * Blocks
+
+    def _block_content(
+        self, block_type: str, content: dict[str, Any]
+    ) -> dict[str, Any]:
+        content = {key: value for key, value in content.items() if key != "children"}
+        for key in ("rich_text", "caption"):
+            if key in content:
+                content[key] = _complete_rich_text(content[key])
+        if block_type in _TEXT_BLOCK_TYPES:
+            content.setdefault("rich_text", [])
+            content.setdefault("color", "default")
+        if block_type == "to_do":
+            content.setdefault("checked", False)
+        return content
+
+    def _new_block(
+        self, block_id: str, parent_cid: str, block_type: str, content: dict[str, Any]
+    ) -> dict[str, Any]:
+        now = _now()
+        if parent_cid in self.pages:
+            parent = {"type": "page_id", "page_id": self.pages[parent_cid]["id"]}
+        else:
+            parent = {"type": "block_id", "block_id": self.blocks[parent_cid]["id"]}
+        block = {
+            "object": "block",
+            "id": block_id,
+            "parent": parent,
+            "created_time": now,
+            "last_edited_time": now,
+            "created_by": _user_ref(self.bot["id"]),
+            "last_edited_by": _user_ref(self.bot["id"]),
+            "has_children": False,
+            "archived": False,
+            "type": block_type,
+            block_type: content,
+        }
+        self.blocks[clean_id(block_id)] = block
+        self._children.setdefault(clean_id(block_id), [])
+        return block
+
+    def _add_child_object(
+        self, parent_page_id: str, object_id: str, block_type: str, title: str
+    ) -> None:
+        """Adds the child_page or child_database block of a new page or database."""
+        parent_cid = self._container(parent_page_id)
+        self._new_block(object_id, parent_cid, block_type, {"title": title})
+        self._children[parent_cid].append(clean_id(object_id))
+
+    def _append(
+        self,
+        parent_id: str,
+        children: list[dict[str, Any]],
+        after: str | None = None,
+        depth: int = 0,
+    ) -> list[dict[str, Any]]:
+        if len(children) > MAX_CHILDREN_PER_REQUEST:
+            raise _APIError(
+                400,
+                f"body.children.length should be ≤ {MAX_CHILDREN_PER_REQUEST}, "
+                f"instead was {len(children)}.",
+            )
+        if depth > MAX_NESTING_DEPTH:
+            raise _APIError(
+                400, "Blocks may only be nested two levels deep per request."
+            )
+        parent_cid = self._container(parent_id)
+        siblings = self._children.setdefault(parent_cid, [])
+        index = len(siblings)
+        if after is not None:
+            try:
+                index = siblings.index(clean_id(after)) + 1
+            except ValueError:
+                raise _APIError(
+                    400, f"Block {after} is not a child of {parent_id}."
+                ) from None
+
+        created = []
+        for child in children:
+            block_type = child.get("type") or next(
+                (key for key in child if key != "object"), None
+            )
+            if block_type is None or not isinstance(child.get(block_type), dict):
+                raise _APIError(400, "body.children should define a block type.")
+            if block_type in ("child_page", "child_database"):
+                raise _APIError(400, f"{block_type} blocks cannot be appended.")
+            content = child[block_type]
+            block = self._new_block(
+                str(uuid.uuid4()),
+                parent_cid,
+                block_type,
+                self._block_content(block_type, content),
+            )
+            siblings.insert(index, clean_id(block["id"]))
+            index += 1
+            if content.get("children"):
+                self._append(block["id"], content["children"], depth=depth + 1)
+            created.append(self._render_block(block))
+        return created
+
+    def _render_block(self, block: dict[str, Any]) -> dict[str, Any]:
+        children = self._children.get(clean_id(block["id"]), [])
+        has_children = any(not self.blocks[cid]["archived"] for cid in children)
+        return {**block, "has_children": has_children}
+
+    def _list_children(self, body: dict, query: dict, block_id: str) -> dict[str, Any]:
+        cid = self._container(block_id)
+        children = [
+            self._render_block(self.blocks[child])
+            for child in self._children.get(cid, [])
+            if not self.blocks[child]["archived"]
+        ]
+        return _paginate(
+            children,
+            query.get("start_cursor"),
+            query.get("page_size"),
+            lambda block: block["id"],
+        )
+
+    def _append_children(
+        self, body: dict, query: dict, block_id: str
+    ) -> dict[str, Any]:
+        if not isinstance(body.get("children"), list):
+            raise _APIError(400, "body.children should be an array.")
+        created = self._append(block_id, body["children"], body.get("after"))
+        return {
+            "object": "list",
+            "results": created,
+            "next_cursor": None,
+            "has_more": False,
+        }
+
+    def _get_block(self, body: dict, query: dict, block_id: str) -> dict[str, Any]:
+        return self._render_block(self._lookup(self.blocks, block_id, "block"))
+
+    def _update_block(self, body: dict, query: dict, block_id: str) -> dict[str, Any]:
+        block = self._lookup(self.blocks, block_id, "block")
+        if block["archived"] and body.get("archived") is not False:
+            raise _APIError(400, "Can't edit block that is archived.")
+        block_type = block["type"]
+        for key in body:
+            if key not in (block_type, "archived", "type"):
+                raise _APIError(
+                    400, f"body.{key} is not valid for a {block_type} block."
+                )
+        if block_type in body:
+            block[block_type] = {
+                **block[block_type],
+                **self._block_content(block_type, body[block_type]),
+            }
+        if "archived" in body:
+            block["archived"] = body["archived"]
+        block["last_edited_time"] = _now()
+        return self._render_block(block)
+
+    def _delete_block(self, body: dict, query: dict, block_id: str) -> dict[str, Any]:
+        block = self._lookup(self.blocks, block_id, "block")
+        block["archived"] = True
+        block["last_edited_time"] = _now()
+        return self._render_block(block)
+
+    # * Search and comments
+
+    def _search(self, body: dict, query: dict) -> dict[str, Any]:
+        text = (body.get("query") or "").lower()
+        kind = (body.get("filter") or {}).get("value")
+        objects: list[dict[str, Any]] = []
+        if kind in (None, "page"):
+            for page in self.pages.values():
+                title = next(
+                    value["title"]
+                    for value in page["properties"].values()
+                    if value["type"] == "title"
+                )
+                if not page["archived"] and text in _plain_text(title).lower():
+                    objects.append(self._render_page(page))
+        if kind in (None, "database"):
+            objects += [
+                database
+                for database in self.databases.values()
+                if text in _plain_text(database["title"]).lower()
+            ]
+        sort = body.get("sort")
+        if sort:
+            objects.sort(
+                key=lambda obj: obj[sort.get("timestamp", "last_edited_time")],
+                reverse=sort.get("direction") != "ascending",
+            )
+        return _paginate(
+            objects,
+            body.get("start_cursor"),
+            body.get("page_size"),
+            lambda obj: obj["id"],
+        )
+
+    def _list_comments(self, body: dict, query: dict) -> dict[str, Any]:
+        if "block_id" not in query:
+            raise _APIError(400, "block_id should be defined.")
+        cid = self._container(query["block_id"])
+        comments = [
+            comment
+            for comment in self.comments
+            if clean_id(
+                comment["parent"].get("page_id")
+                or comment["parent"].get("block_id", "")
+            )
+            == cid
+        ]
+        return _paginate(
+            comments,
+            query.get("start_cursor"),
+            query.get("page_size"),
+            lambda comment: comment["id"],
+        )
+
+    def _create_comment(self, body: dict, query: dict) -> dict[str, Any]:
+        if body.get("discussion_id"):
+            thread = next(
+                (
+                    c
+                    for c in self.comments
+                    if c["discussion_id"] == body["discussion_id"]
+                ),
+                None,
+            )
+            if thread is None:
+                raise _APIError(
+                    404, f"Could not find discussion: {body['discussion_id']}."
+                )
+            parent, discussion_id = thread["parent"], body["discussion_id"]
+        elif (body.get("parent") or {}).get("page_id"):
+            page = self._lookup(self.pages, body["parent"]["page_id"], "page")
+            parent = {"type": "page_id", "page_id": page["id"]}
+            discussion_id = str(uuid.uuid4())
+        else:
+            raise _APIError(400, "body.parent or body.discussion_id should be defined.")
+        now = _now()
+        comment = {
+            "object": "comment",
+            "id": str(uuid.uuid4()),
+            "parent": parent,
+            "discussion_id": discussion_id,
+            "created_time": now,
+            "last_edited_time": now,
+            "created_by": _user_ref(self.bot["id"]),
+            "rich_text": _complete_rich_text(body.get("rich_text") or []),
+        }
+        self.comments.append(comment)
+        return comment
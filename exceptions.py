@@ -68,3 +68,20 @@ class NotionServiceUnavailableError(NotionAPIError):
 
     pass
 
+
+class NotionCircuitOpenError(NotionAPIError):
+    """Raised without calling the API while a circuit breaker is open."""
+
+    def __init__(self, endpoint_class: str, retry_after: float | None = None):
+        super().__init__(
+            f"Circuit breaker for '{endpoint_class}' is open", error_code="circuit_open"
+        )
+        self.endpoint_class = endpoint_class
+        self.retry_after = retry_after
+
+
+class NotionDeadlineExceededError(NotionAPIError):
+    """Raised when an operation runs out of its deadline, including retries."""
+
+    def __init__(self, message: str = "Deadline exceeded"):
+        super().__init__(message, error_code="deadline_exceeded")
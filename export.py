@@ -0,0 +1,366 @@
+"""Streaming export of Notion databases to NDJSON, CSV and Parquet."""
+
+import asyncio
+import csv
+import json
+import logging
+import os
+from collections.abc import AsyncIterator
+from datetime import datetime
+from typing import Any, Literal
+
+from app.core.integrations.notion.client import AsyncNotionClient
+from app.core.integrations.notion.exceptions import NotionAPIError
+from app.core.integrations.notion.filters import parse_datetime, property_value
+from app.core.integrations.notion.schemas import (
+    Database,
+    Page,
+    PaginatedPageResponse,
+    QueryDatabasePayload,
+)
+
+# * Configure logging
+logger = logging.getLogger(__name__)
+
+ExportFormat = Literal["ndjson", "csv", "parquet"]
+
+# * Columns every exported row starts with
+BASE_COLUMNS = {
+    "id": "text",
+    "url": "text",
+    "created_time": "datetime",
+    "last_edited_time": "datetime",
+    "archived": "boolean",
+}
+
+# * Maps Notion property types to the column kind they are flattened into
+_COLUMN_KINDS = {
+    "title": "text",
+    "rich_text": "text",
+    "select": "text",
+    "status": "text",
+    "url": "text",
+    "email": "text",
+    "phone_number": "text",
+    "unique_id": "text",
+    "formula": "text",
+    "rollup": "text",
+    "number": "number",
+    "checkbox": "boolean",
+    "date": "datetime",
+    "created_time": "datetime",
+    "last_edited_time": "datetime",
+    "multi_select": "list",
+    "people": "list",
+    "relation": "list",
+    "files": "list",
+    "created_by": "text",
+    "last_edited_by": "text",
+}
+
+# * Date properties also get a column for the end of the range
+DATE_END_SUFFIX = ":end"
+
+
+def export_columns(database: Database) -> dict[str, str]:
+    """
+    Derives the exported columns and their kinds from a database schema.
+
+    Args:
+        database: The database being exported.
+
+    Returns:
+        An ordered mapping of column name to kind: "text", "number",
+        "boolean", "datetime" or "list".
+    """
+    columns = dict(BASE_COLUMNS)
+    for name, prop in database.properties.items():
+        kind = _COLUMN_KINDS.get(prop.type, "text")
+        columns[name] = kind
+        if prop.type == "date":
+            columns[name + DATE_END_SUFFIX] = kind
+    return columns
+
+
+def _file_url(file: Any) -> str | None:
+    content = file.external if file.type == "external" else file.file
+    return str(content.get("url")) if content else None
+
+
+def flatten_property(prop: Any) -> Any:
+    """
+    Flattens a typed property value into a single column value.
+
+    Args:
+        prop: A property model from `Page.properties`.
+
+    Returns:
+        A string, number, bool, datetime, list of strings or None.
+    """
+    if prop.type == "files":
+        return [url for url in map(_file_url, prop.files) if url]
+    if prop.type == "multi_select":
+        return [option.name for option in prop.multi_select]
+    if prop.type in ("created_by", "last_edited_by"):
+        return getattr(prop, prop.type).id
+    if prop.type == "unique_id":
+        prefix, number = prop.unique_id.get("prefix"), prop.unique_id.get("number")
+        return f"{prefix}-{number}" if prefix else number
+    value = property_value(prop)
+    if prop.type in ("formula", "rollup") and isinstance(value, list):
+        return json.dumps(value, default=str)
+    return value
+
+
+def flatten_page(page: Page) -> dict[str, Any]:
+    """
+    Flattens a page into a row of column values.
+
+    Args:
+        page: The page to flatten.
+
+    Returns:
+        A dictionary with the base columns and one column per property, plus
+        an end column for each date property.
+    """
+    row: dict[str, Any] = {
+        "id": page.id,
+        "url": str(page.url),
+        "created_time": page.created_time,
+        "last_edited_time": page.last_edited_time,
+        "archived": page.archived,
+    }
+    for name, prop in page.properties.items():
+        row[name] = flatten_property(prop)
+        if prop.type == "date":
+            end = prop.date.get("end") if prop.date else None
+            row[name + DATE_END_SUFFIX] = parse_datetime(end)
+    return row
+
+
+class _NdjsonWriter:
+    def __init__(self, path: str | os.PathLike, columns: dict[str, str]):
+        self._file = open(path, "w", encoding="utf-8")
+        self._columns = columns
+
+    def write(self, rows: list[dict[str, Any]]) -> None:
+        self._file.write(
+            "".join(
+                json.dumps(
+                    {column: row.get(column) for column in self._columns},
+                    default=_json_default,
+                )
+                + "\n"
+                for row in rows
+            )
+        )
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class _CsvWriter:
+    def __init__(self, path: str | os.PathLike, columns: dict[str, str]):
+        self._file = open(path, "w", encoding="utf-8", newline="")
+        self._columns = columns
+        self._writer = csv.DictWriter(self._file, fieldnames=list(columns))
+        self._writer.writeheader()
+
+    def write(self, rows: list[dict[str, Any]]) -> None:
+        self._writer.writerows(
+            {column: _csv_value(row.get(column)) for column in self._columns}
+            for row in rows
+        )
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class _ParquetWriter:
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        columns: dict[str, str],
+        row_group_size: int,
+    ):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError(
+                "Parquet export requires pyarrow. Install it with `pip install pyarrow`."
+            ) from e
+
+        kinds = {
+            "text": pa.string(),
+            "number": pa.float64(),
+            "boolean": pa.bool_(),
+            "datetime": pa.timestamp("us", tz="UTC"),
+            "list": pa.list_(pa.string()),
+        }
+        self._pa = pa
+        self._schema = pa.schema(
+            [(column, kinds[kind]) for column, kind in columns.items()]
+        )
+        self._columns = columns
+        self._writer = pq.ParquetWriter(str(path), self._schema)
+        self._buffer: list[dict[str, Any]] = []
+        self._row_group_size = row_group_size
+
+    def write(self, rows: list[dict[str, Any]]) -> None:
+        self._buffer.extend(rows)
+        if len(self._buffer) >= self._row_group_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._buffer:
+            return
+        data = {
+            column: [_arrow_value(row.get(column), kind) for row in self._buffer]
+            for column, kind in self._columns.items()
+        }
+        table = self._pa.Table.from_pydict(data, schema=self._schema)
+        self._writer.write_table(table)
+        self._buffer = []
+
+    def close(self) -> None:
+        self._flush()
+        self._writer.close()
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _csv_value(value: Any) -> Any:
+    if isinstance(value, list):
+        return ", ".join(map(str, value))
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _arrow_value(value: Any, kind: str) -> Any:
+    if value is None:
+        return None
+    if kind == "text" and not isinstance(value, str):
+        return str(value)
+    if kind == "number":
+        return float(value)
+    if kind == "list":
+        return [str(item) for item in value]
+    return value
+
+
+async def export_database(
+    client: AsyncNotionClient,
+    database_id: str,
+    path: str | os.PathLike,
+    format: ExportFormat = "ndjson",
+    payload: QueryDatabasePayload | None = None,
+    row_group_size: int = 10_000,
+) -> int:
+    """
+    Streams a database's pages into a file, one batch of results at a time.
+
+    Only the current batch of pages (and for Parquet, one row group) is held
+    in memory, so databases of any size can be exported. Each batch is written
+    in a worker thread, so file I/O does not block the event loop.
+
+    Args:
+        client: The Notion client to query with.
+        database_id: The ID of the database to export.
+        path: The file to write.
+        format: The output format. Parquet requires `pyarrow`.
+        payload: An optional query payload to filter or sort the export.
+        row_group_size: The number of rows per Parquet row group.
+
+    Returns:
+        The number of rows written.
+    """
+    database = await client.get_database(database_id)
+    columns = export_columns(database)
+    if format == "ndjson":
+        writer = await asyncio.to_thread(_NdjsonWriter, path, columns)
+    elif format == "csv":
+        writer = await asyncio.to_thread(_CsvWriter, path, columns)
+    elif format == "parquet":
+        writer = await asyncio.to_thread(
+            _ParquetWriter, path, columns, row_group_size
+        )
+    else:
+        raise ValueError(f"Unsupported export format: {format}")
+
+    count = 0
+    try:
+        async for response in client.iter_query_database(database_id, payload):
+            rows = [flatten_page(page) for page in response.results]
+            await asyncio.to_thread(writer.write, rows)
+            count += len(rows)
+    finally:
+        await asyncio.to_thread(writer.close)
+    logger.info("Exported %d rows of database %s to %s.", count, database_id, path)
+    return count
+
+
+async def stream_ndjson_pages(
+    client: AsyncNotionClient,
+    database_id: str,
+    payload: QueryDatabasePayload | None = None,
+) -> AsyncIterator[str]:
+    """
+    Queries a database and returns its raw pages as a stream of NDJSON.
+
+    The first batch is fetched before returning, so a query that fails
+    outright, e.g. with an invalid filter, raises here while the HTTP status
+    can still report it. Cursors are then followed, and the next batch is
+    fetched while the current one is being consumed. A later API error ends
+    the stream with a line whose `object` is "error", since a streamed HTTP
+    response can no longer change its status code.
+
+    Args:
+        client: The Notion client to query with.
+        database_id: The ID of the database to query.
+        payload: The query payload (for filtering, sorting, etc.).
+
+    Returns:
+        An iterator over the NDJSON lines of each batch, concatenated.
+
+    Raises:
+        NotionAPIError: If the first batch cannot be fetched.
+    """
+    responses = client.iter_query_database(database_id, payload)
+    try:
+        first = await anext(responses, None)
+    except BaseException:
+        await responses.aclose()
+        raise
+    return _ndjson_batches(database_id, responses, first)
+
+
+async def _ndjson_batches(
+    database_id: str,
+    responses: AsyncIterator[PaginatedPageResponse],
+    response: PaginatedPageResponse | None,
+) -> AsyncIterator[str]:
+    next_batch: asyncio.Future | None = None
+    try:
+        while response is not None:
+            next_batch = asyncio.ensure_future(anext(responses, None))
+            yield "".join(
+                page.model_dump_json(exclude_unset=True) + "\n"
+                for page in response.results
+            )
+            response = await next_batch
+    except NotionAPIError as e:
+        logger.error("Streaming query of database %s failed: %s", database_id, e)
+        error = {"object": "error", "status": e.status_code, "message": str(e)}
+        yield json.dumps(error) + "\n"
+    finally:
+        if next_batch is not None:
+            # * Wait for a cancelled prefetch before closing the generator it runs
+            next_batch.cancel()
+            await asyncio.wait({next_batch})
+        await responses.aclose()
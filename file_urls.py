@@ -0,0 +1,208 @@
+"""Background refresh of expiring Notion-hosted file URLs."""
+
+import asyncio
+import logging
+from collections.abc import Iterable
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from app.core.integrations.notion.client import AsyncNotionClient
+from app.core.integrations.notion.downloads import FILE_BLOCK_TYPES
+from app.core.integrations.notion.exceptions import NotionAPIError
+from app.core.integrations.notion.filters import parse_datetime
+from app.core.integrations.notion.schemas import Block, Page
+
+# * Configure logging
+logger = logging.getLogger(__name__)
+
+# * Notion-hosted URLs are valid for about an hour
+DEFAULT_MARGIN = timedelta(minutes=10)
+DEFAULT_INTERVAL = 60.0
+
+
+def expiry_time(file: Any) -> datetime | None:
+    """
+    Returns when a Notion-hosted file URL expires.
+
+    Args:
+        file: A `File` or `InternalFile` model, or a raw file object.
+
+    Returns:
+        The expiry time, or None for external files that do not expire.
+    """
+    content = file.get("file") if isinstance(file, dict) else getattr(file, "file", None)
+    if not content or not content.get("expiry_time"):
+        return None
+    return parse_datetime(content["expiry_time"])
+
+
+def page_expiry(page: Page) -> datetime | None:
+    """Returns the earliest expiry among the files properties of a page."""
+    expiries = [
+        expiry
+        for prop in page.properties.values()
+        if prop.type == "files"
+        for expiry in map(expiry_time, prop.files)
+        if expiry is not None
+    ]
+    return min(expiries, default=None)
+
+
+def block_expiry(block: Block) -> datetime | None:
+    """Returns when the file of a file, image, pdf, video or audio block expires."""
+    if block.type not in FILE_BLOCK_TYPES:
+        return None
+    content = getattr(block, block.type, None)
+    return expiry_time(content) if content else None
+
+
+def _due(expiry: datetime | None, deadline: datetime) -> bool:
+    return expiry is not None and expiry <= deadline
+
+
+class FileUrlRefresher:
+    """
+    Keeps the signed file URLs of cached pages and blocks from expiring.
+
+    Tracked objects are updated in place shortly before their URLs expire, so
+    a cache holding them keeps serving working links. Pages are refreshed with
+    one `get_page_property` call per files property, issued concurrently, and
+    blocks with one children listing per parent, which refreshes every file
+    block of that parent at once.
+    """
+
+    def __init__(
+        self,
+        client: AsyncNotionClient,
+        margin: timedelta = DEFAULT_MARGIN,
+        interval: float = DEFAULT_INTERVAL,
+    ):
+        """
+        Initializes the refresher.
+
+        Args:
+            client: The Notion client to refresh with.
+            margin: How long before expiry a URL is refreshed.
+            interval: The number of seconds between background checks.
+        """
+        self.client = client
+        self.margin = margin
+        self.interval = interval
+        self._pages: dict[str, Page] = {}
+        self._blocks: dict[str, dict[str, Block]] = {}
+        self._task: asyncio.Task[None] | None = None
+
+    def track_page(self, page: Page) -> None:
+        """Starts refreshing the files properties of a page."""
+        if page_expiry(page) is not None:
+            self._pages[page.id] = page
+
+    def track_blocks(self, parent_id: str, blocks: Iterable[Block]) -> None:
+        """Starts refreshing the file blocks among the children of a block."""
+        tracked = self._blocks.setdefault(parent_id, {})
+        for block in blocks:
+            if block_expiry(block) is not None:
+                tracked[block.id] = block
+        if not tracked:
+            del self._blocks[parent_id]
+
+    def untrack(self, object_id: str) -> None:
+        """Stops refreshing a page, or the file blocks under a parent."""
+        self._pages.pop(object_id, None)
+        self._blocks.pop(object_id, None)
+
+    async def refresh_page(self, page: Page) -> None:
+        """
+        Re-fetches the files properties of a page and updates it in place.
+
+        Args:
+            page: The page to refresh.
+        """
+        names = [name for name, prop in page.properties.items() if prop.type == "files"]
+        fresh = await asyncio.gather(
+            *(
+                self.client.get_page_property(page.id, page.properties[name].id)
+                for name in names
+            )
+        )
+        for name, prop in zip(names, fresh):
+            page.properties[name] = prop.model_copy(
+                update={"id": page.properties[name].id}
+            )
+
+    async def refresh_blocks(self, parent_id: str) -> None:
+        """
+        Re-lists the children of a block and updates its tracked file blocks.
+
+        Args:
+            parent_id: The ID of the parent block or page.
+        """
+        tracked = self._blocks.get(parent_id, {})
+        async for response in self.client.iter_block_children(parent_id):
+            for fresh in response.results:
+                block = tracked.get(fresh.id)
+                if block is not None and fresh.type == block.type:
+                    setattr(block, block.type, getattr(fresh, fresh.type))
+
+    async def refresh_due(self, now: datetime | None = None) -> int:
+        """
+        Refreshes every tracked object whose URLs expire within the margin.
+
+        Args:
+            now: The current time. Defaults to the system clock.
+
+        Returns:
+            The number of pages and parents that were refreshed.
+        """
+        deadline = (now or datetime.now(timezone.utc)) + self.margin
+        pages = [
+            page
+            for page in self._pages.values()
+            if _due(page_expiry(page), deadline)
+        ]
+        parents = [
+            parent_id
+            for parent_id, blocks in self._blocks.items()
+            if any(_due(block_expiry(block), deadline) for block in blocks.values())
+        ]
+        results = await asyncio.gather(
+            *map(self.refresh_page, pages),
+            *map(self.refresh_blocks, parents),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, NotionAPIError):
+                logger.warning("Failed to refresh file URLs: %s", result)
+            elif isinstance(result, Exception):
+                # * E.g. an odd file object: skip it, the others are refreshed
+                logger.exception("Failed to refresh file URLs", exc_info=result)
+            elif isinstance(result, BaseException):
+                raise result
+        return len(results)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                refreshed = await self.refresh_due()
+            except Exception:
+                # ! Note: Keep refreshing, or every cached URL silently expires
+                logger.exception("File URL refresh cycle failed.")
+            else:
+                if refreshed:
+                    logger.debug("Refreshed file URLs of %d objects.", refreshed)
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """Starts refreshing in a background task on the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stops the background task."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
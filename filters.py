@@ -0,0 +1,435 @@
+"""Local evaluation of Notion database query filters and sorts."""
+
+import json
+from collections.abc import Callable, Iterable
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any
+
+from app.core.integrations.notion.schemas import Page, QueryDatabasePayload
+
+Predicate = Callable[[Page], bool]
+SortKey = Callable[[Page], tuple[Any, ...]]
+
+# * Condition keys that hold text and compare as strings
+_TEXT_TYPES = {"title", "rich_text", "url", "email", "phone_number", "string"}
+# * Condition keys whose values are lists matched with contains
+_LIST_TYPES = {"multi_select", "people", "relation", "created_by", "last_edited_by"}
+_DATE_TYPES = {"date", "created_time", "last_edited_time"}
+
+_RELATIVE_DATES = {
+    "past_week": timedelta(days=-7),
+    "past_month": timedelta(days=-30),
+    "past_year": timedelta(days=-365),
+    "next_week": timedelta(days=7),
+    "next_month": timedelta(days=30),
+    "next_year": timedelta(days=365),
+}
+
+
+class FilterError(ValueError):
+    """Raised when a filter or sort cannot be compiled."""
+
+
+def _get(obj: Any, key: str) -> Any:
+    """Reads a field from either a model or a raw API dictionary."""
+    if isinstance(obj, dict):
+        return obj.get(key)
+    return getattr(obj, key, None)
+
+
+def parse_datetime(value: Any) -> datetime | None:
+    """Parses a Notion date into an aware datetime, assuming UTC when naive."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    elif isinstance(value, date) and not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _plain_text(items: Any) -> str:
+    return "".join(_get(item, "plain_text") or "" for item in items or [])
+
+
+def property_value(prop: Any) -> Any:
+    """
+    Extracts the comparable Python value of a property.
+
+    Args:
+        prop: A property model from `Page.properties`, or the equivalent raw
+            dictionary (as found in rollup arrays).
+
+    Returns:
+        A string for text properties, a float for numbers, a bool for
+        checkboxes, an aware datetime for dates (the start of a range), a list
+        of names or IDs for multi-value properties, or None when empty.
+    """
+    prop_type = _get(prop, "type")
+    raw = _get(prop, prop_type)
+    if prop_type in ("title", "rich_text"):
+        return _plain_text(raw)
+    if prop_type in ("select", "status"):
+        return _get(raw, "name") if raw else None
+    if prop_type == "multi_select":
+        return [_get(option, "name") for option in raw or []]
+    if prop_type == "date":
+        return parse_datetime(_get(raw, "start")) if raw else None
+    if prop_type in ("created_time", "last_edited_time"):
+        return parse_datetime(raw)
+    if prop_type == "people":
+        return [_get(user, "id") for user in raw or []]
+    if prop_type in ("created_by", "last_edited_by"):
+        return [_get(raw, "id")] if raw else []
+    if prop_type == "relation":
+        return [_get(item, "id") for item in raw or []]
+    if prop_type == "files":
+        return list(raw or [])
+    if prop_type == "unique_id":
+        return _get(raw, "number") if raw else None
+    if prop_type in ("formula", "rollup"):
+        return property_value(raw) if raw else None
+    if prop_type == "array":
+        return list(raw or [])
+    return raw
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or value == "" or value == []
+
+
+def _text_condition(condition: dict[str, Any]) -> Callable[[Any], bool]:
+    (operator, operand), = condition.items()
+    if operator == "is_empty":
+        return _is_empty
+    if operator == "is_not_empty":
+        return lambda value: not _is_empty(value)
+    if operator == "equals":
+        return lambda value: value == operand
+    if operator == "does_not_equal":
+        return lambda value: value != operand
+    # * Substring matches are case-insensitive, like Notion's
+    needle = str(operand).lower()
+    if operator == "contains":
+        return lambda value: needle in (value or "").lower()
+    if operator == "does_not_contain":
+        return lambda value: needle not in (value or "").lower()
+    if operator == "starts_with":
+        return lambda value: (value or "").lower().startswith(needle)
+    if operator == "ends_with":
+        return lambda value: (value or "").lower().endswith(needle)
+    raise FilterError(f"Unsupported text condition: {operator}")
+
+
+def _number_condition(condition: dict[str, Any]) -> Callable[[Any], bool]:
+    (operator, operand), = condition.items()
+    comparisons: dict[str, Callable[[Any], bool]] = {
+        "is_empty": lambda value: value is None,
+        "is_not_empty": lambda value: value is not None,
+        "equals": lambda value: value == operand,
+        "does_not_equal": lambda value: value != operand,
+        "greater_than": lambda value: value is not None and value > operand,
+        "less_than": lambda value: value is not None and value < operand,
+        "greater_than_or_equal_to": lambda value: value is not None
+        and value >= operand,
+        "less_than_or_equal_to": lambda value: value is not None
+        and value <= operand,
+    }
+    if operator not in comparisons:
+        raise FilterError(f"Unsupported number condition: {operator}")
+    return comparisons[operator]
+
+
+def _checkbox_condition(condition: dict[str, Any]) -> Callable[[Any], bool]:
+    (operator, operand), = condition.items()
+    if operator == "equals":
+        return lambda value: bool(value) == operand
+    if operator == "does_not_equal":
+        return lambda value: bool(value) != operand
+    raise FilterError(f"Unsupported checkbox condition: {operator}")
+
+
+def _select_condition(condition: dict[str, Any]) -> Callable[[Any], bool]:
+    (operator, operand), = condition.items()
+    if operator == "equals":
+        return lambda value: value == operand
+    if operator == "does_not_equal":
+        return lambda value: value != operand
+    if operator == "is_empty":
+        return _is_empty
+    if operator == "is_not_empty":
+        return lambda value: not _is_empty(value)
+    raise FilterError(f"Unsupported select condition: {operator}")
+
+
+def _list_condition(condition: dict[str, Any]) -> Callable[[Any], bool]:
+    (operator, operand), = condition.items()
+    if operator == "contains":
+        return lambda value: operand in (value or [])
+    if operator == "does_not_contain":
+        return lambda value: operand not in (value or [])
+    if operator == "is_empty":
+        return _is_empty
+    if operator == "is_not_empty":
+        return lambda value: not _is_empty(value)
+    raise FilterError(f"Unsupported list condition: {operator}")
+
+
+def _date_bounds(operand: str) -> tuple[datetime, datetime]:
+    """Returns the half-open interval a date or datetime operand covers."""
+    start = parse_datetime(operand)
+    if "T" in operand:
+        return start, start + timedelta(microseconds=1)
+    return start, start + timedelta(days=1)
+
+
+def _date_condition(condition: dict[str, Any]) -> Callable[[Any], bool]:
+    (operator, operand), = condition.items()
+    if operator == "is_empty":
+        return lambda value: value is None
+    if operator == "is_not_empty":
+        return lambda value: value is not None
+    if operator in _RELATIVE_DATES:
+        delta = _RELATIVE_DATES[operator]
+
+        def relative(value: datetime | None) -> bool:
+            now = datetime.now(timezone.utc)
+            lower, upper = sorted((now, now + delta))
+            return value is not None and lower <= value <= upper
+
+        return relative
+    if operator == "this_week":
+
+        def this_week(value: datetime | None) -> bool:
+            today = datetime.now(timezone.utc).isocalendar()
+            return value is not None and value.isocalendar()[:2] == today[:2]
+
+        return this_week
+
+    lower, upper = _date_bounds(operand)
+    comparisons: dict[str, Callable[[datetime], bool]] = {
+        "equals": lambda value: lower <= value < upper,
+        "before": lambda value: value < lower,
+        "after": lambda value: value >= upper,
+        "on_or_before": lambda value: value < upper,
+        "on_or_after": lambda value: value >= lower,
+    }
+    if operator not in comparisons:
+        raise FilterError(f"Unsupported date condition: {operator}")
+    compare = comparisons[operator]
+    return lambda value: value is not None and compare(value)
+
+
+def _files_condition(condition: dict[str, Any]) -> Callable[[Any], bool]:
+    (operator, _), = condition.items()
+    if operator == "is_empty":
+        return _is_empty
+    if operator == "is_not_empty":
+        return lambda value: not _is_empty(value)
+    raise FilterError(f"Unsupported files condition: {operator}")
+
+
+def _value_condition(type_key: str, condition: dict[str, Any]) -> Callable[[Any], bool]:
+    """Compiles a condition on an already extracted property value."""
+    if type_key in _TEXT_TYPES:
+        return _text_condition(condition)
+    if type_key in ("number", "unique_id"):
+        return _number_condition(condition)
+    if type_key == "checkbox":
+        return _checkbox_condition(condition)
+    if type_key in ("select", "status"):
+        return _select_condition(condition)
+    if type_key in _LIST_TYPES:
+        return _list_condition(condition)
+    if type_key in _DATE_TYPES:
+        return _date_condition(condition)
+    if type_key == "files":
+        return _files_condition(condition)
+    raise FilterError(f"Unsupported property condition type: {type_key}")
+
+
+def _property_condition(filter: dict[str, Any]) -> Callable[[Any], bool]:
+    """Compiles a condition on a property model, including formulas and rollups."""
+    type_key = next(key for key in filter if key != "property")
+    condition = filter[type_key]
+
+    if type_key == "formula":
+        (result_type, inner), = condition.items()
+        test = _value_condition(result_type, inner)
+        return lambda prop: test(property_value(_get(prop, "formula")))
+
+    if type_key == "rollup":
+        (operator, inner), = condition.items()
+        if operator in ("number", "date"):
+            test = _value_condition(operator, inner)
+            return lambda prop: test(property_value(_get(prop, "rollup")))
+        (item_type, item_condition), = inner.items()
+        item_test = _property_condition({item_type: item_condition})
+        aggregate = {"any": any, "every": all}.get(operator)
+        if operator == "none":
+            return lambda prop: not any(map(item_test, _rollup_items(prop)))
+        if aggregate is None:
+            raise FilterError(f"Unsupported rollup condition: {operator}")
+        return lambda prop: aggregate(map(item_test, _rollup_items(prop)))
+
+    test = _value_condition(type_key, condition)
+    return lambda prop: test(property_value(prop))
+
+
+def _rollup_items(prop: Any) -> list[Any]:
+    rollup = _get(prop, "rollup") or {}
+    return list(_get(rollup, "array") or [])
+
+
+def _find_property(page: Page, name: str) -> Any:
+    prop = page.properties.get(name)
+    if prop is not None:
+        return prop
+    # * Filters may also reference a property by its ID
+    return next((p for p in page.properties.values() if p.id == name), None)
+
+
+def _compile(filter: dict[str, Any]) -> Predicate:
+    if "and" in filter:
+        parts = [_compile(part) for part in filter["and"]]
+        return lambda page: all(part(page) for part in parts)
+    if "or" in filter:
+        parts = [_compile(part) for part in filter["or"]]
+        return lambda page: any(part(page) for part in parts)
+    if "timestamp" in filter:
+        timestamp = filter["timestamp"]
+        test = _date_condition(filter[timestamp])
+        return lambda page: test(parse_datetime(getattr(page, timestamp)))
+    if "property" in filter:
+        name = filter["property"]
+        test = _property_condition(filter)
+
+        def predicate(page: Page) -> bool:
+            prop = _find_property(page, name)
+            return prop is not None and test(prop)
+
+        return predicate
+    raise FilterError(f"Unrecognized filter: {filter}")
+
+
+@lru_cache(maxsize=256)
+def _compile_cached(key: str) -> Predicate:
+    return _compile(json.loads(key))
+
+
+def compile_filter(filter: dict[str, Any] | None) -> Predicate:
+    """
+    Compiles a Notion query filter into a predicate over pages.
+
+    Compiled predicates are cached, so compiling the same filter again is a
+    dictionary lookup.
+
+    Args:
+        filter: The `filter` of a `QueryDatabasePayload`.
+
+    Returns:
+        A function returning True for pages the filter matches.
+
+    Raises:
+        FilterError: If the filter uses a condition that is not supported.
+    """
+    if not filter:
+        return lambda page: True
+    return _compile_cached(json.dumps(filter, sort_keys=True))
+
+
+class _Descending:
+    """Inverts the ordering of a wrapped value for descending sorts."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+    def __lt__(self, other: "_Descending") -> bool:
+        return other.value < self.value
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _Descending) and other.value == self.value
+
+
+def _sort_value(value: Any) -> Any:
+    if isinstance(value, str):
+        return value.lower()
+    if isinstance(value, list):
+        return tuple(str(item).lower() for item in value)
+    return value
+
+
+def _compile_sort(sort: dict[str, Any]) -> Callable[[Page], tuple[bool, Any]]:
+    descending = sort.get("direction") == "descending"
+    if "timestamp" in sort:
+        timestamp = sort["timestamp"]
+
+        def extract(page: Page) -> Any:
+            return parse_datetime(getattr(page, timestamp))
+
+    elif "property" in sort:
+        name = sort["property"]
+
+        def extract(page: Page) -> Any:
+            prop = _find_property(page, name)
+            return property_value(prop) if prop is not None else None
+
+    else:
+        raise FilterError(f"Unrecognized sort: {sort}")
+
+    def key(page: Page) -> tuple[bool, Any]:
+        value = _sort_value(extract(page))
+        # * Empty values sort last in either direction
+        if _is_empty(value) or value == ():
+            return (True, None)
+        return (False, _Descending(value) if descending else value)
+
+    return key
+
+
+@lru_cache(maxsize=256)
+def _compile_sorts_cached(key: str) -> SortKey:
+    parts = [_compile_sort(sort) for sort in json.loads(key)]
+    return lambda page: tuple(part(page) for part in parts)
+
+
+def compile_sorts(sorts: list[dict[str, Any]] | None) -> SortKey:
+    """
+    Compiles Notion query sorts into a key function for `sorted`.
+
+    Args:
+        sorts: The `sorts` of a `QueryDatabasePayload`.
+
+    Returns:
+        A key function ordering pages as the API would.
+
+    Raises:
+        FilterError: If a sort is malformed.
+    """
+    return _compile_sorts_cached(json.dumps(sorts or [], sort_keys=True))
+
+
+def query_pages(
+    pages: Iterable[Page], payload: QueryDatabasePayload | None = None
+) -> list[Page]:
+    """
+    Answers a database query from pages already in memory.
+
+    Args:
+        pages: The pages to query, e.g. a cached or snapshotted database.
+        payload: The query to answer. Pagination fields are ignored.
+
+    Returns:
+        The matching pages, in the requested order.
+    """
+    if payload is None:
+        return list(pages)
+    matches = filter(compile_filter(payload.filter), pages)
+    if not payload.sorts:
+        return list(matches)
+    return sorted(matches, key=compile_sorts(payload.sorts))
@@ -0,0 +1,357 @@
+"""Columnar, vectorized views over database query results."""
+
+from collections.abc import AsyncIterator, Iterable
+from datetime import datetime, timezone
+from typing import Any
+
+from app.core.integrations.notion.client import AsyncNotionClient
+from app.core.integrations.notion.filters import property_value
+from app.core.integrations.notion.schemas import (
+    Page,
+    PaginatedPageResponse,
+    QueryDatabasePayload,
+)
+
+try:
+    import numpy as np
+except ImportError as e:  # pragma: no cover
+    raise ImportError(
+        "Property frames require numpy. Install it with `pip install numpy`."
+    ) from e
+
+# * Property types stored as one dictionary-encoded value per row
+_CATEGORICAL_TYPES = {"select", "status"}
+# * Property types parsed into datetime64 columns
+_DATE_TYPES = {"date", "created_time", "last_edited_time"}
+_TEXT_TYPES = {"title", "rich_text", "url", "email", "phone_number"}
+
+
+class CategoricalColumn:
+    """
+    A dictionary-encoded column: integer codes into a list of categories.
+
+    Missing values have the code -1.
+    """
+
+    __slots__ = ("codes", "categories")
+
+    def __init__(self, codes: np.ndarray, categories: list[str]):
+        self.codes = codes
+        self.categories = categories
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def equals(self, value: str) -> np.ndarray:
+        """Returns a boolean mask of the rows holding `value`."""
+        if value not in self.categories:
+            return np.zeros(len(self.codes), dtype=bool)
+        return self.codes == self.categories.index(value)
+
+    def value_counts(self) -> dict[str, int]:
+        """Counts the rows holding each category."""
+        counts = np.bincount(self.codes[self.codes >= 0], minlength=len(self.categories))
+        return dict(zip(self.categories, counts.tolist()))
+
+    def to_numpy(self) -> np.ndarray:
+        """Decodes the column into an object array of names and None."""
+        lookup = np.array([*self.categories, None], dtype=object)
+        return lookup[self.codes]
+
+
+class MultiCategoricalColumn:
+    """
+    A dictionary-encoded list column in Arrow's layout.
+
+    The values of row `i` are `codes[offsets[i]:offsets[i + 1]]`.
+    """
+
+    __slots__ = ("offsets", "codes", "categories")
+
+    def __init__(self, offsets: np.ndarray, codes: np.ndarray, categories: list[str]):
+        self.offsets = offsets
+        self.codes = codes
+        self.categories = categories
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def _rows(self) -> np.ndarray:
+        return np.repeat(np.arange(len(self)), np.diff(self.offsets))
+
+    def contains(self, value: str) -> np.ndarray:
+        """Returns a boolean mask of the rows whose lists contain `value`."""
+        mask = np.zeros(len(self), dtype=bool)
+        if value in self.categories:
+            hits = self.codes == self.categories.index(value)
+            mask[self._rows()[hits]] = True
+        return mask
+
+    def value_counts(self) -> dict[str, int]:
+        """Counts the rows holding each category."""
+        counts = np.bincount(self.codes, minlength=len(self.categories))
+        return dict(zip(self.categories, counts.tolist()))
+
+    def to_lists(self) -> list[list[str]]:
+        """Decodes the column into a list of name lists."""
+        names = np.array(self.categories, dtype=object)[self.codes]
+        return [names[start:end].tolist() for start, end in zip(self.offsets, self.offsets[1:])]
+
+
+Column = np.ndarray | CategoricalColumn | MultiCategoricalColumn
+
+
+def _to_utc_naive(value: datetime) -> datetime:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _normalize_date(value: str | datetime | None) -> str | datetime:
+    """Prepares a date for bulk parsing by numpy, which rejects UTC offsets."""
+    if value is None:
+        return "NaT"
+    if isinstance(value, datetime):
+        return _to_utc_naive(value)
+    if value.endswith("Z"):
+        return value[:-1]
+    if value.endswith("+00:00"):
+        return value[:-6]
+    if len(value) > 10 and value[-6] in "+-":
+        return _to_utc_naive(datetime.fromisoformat(value))
+    return value
+
+
+def parse_dates(values: list[str | datetime | None]) -> np.ndarray:
+    """
+    Parses Notion dates in bulk into a UTC `datetime64[us]` array.
+
+    Args:
+        values: ISO 8601 strings, datetimes or None.
+
+    Returns:
+        The parsed array, with NaT for missing values.
+    """
+    return np.array([_normalize_date(value) for value in values], dtype="datetime64[us]")
+
+
+class _ColumnBuilder:
+    """Accumulates the values of one column while pages stream in."""
+
+    def __init__(self, prop_type: str):
+        self.prop_type = prop_type
+        self.values: list[Any] = []
+        self.offsets: list[int] = [0]
+        self.categories: dict[str, int] = {}
+
+    def _code(self, name: str) -> int:
+        return self.categories.setdefault(name, len(self.categories))
+
+    def append(self, prop: Any) -> None:
+        if prop is None:
+            self.append_missing()
+        elif self.prop_type in _CATEGORICAL_TYPES:
+            option = getattr(prop, prop.type)
+            self.values.append(self._code(option.name) if option else -1)
+        elif self.prop_type == "multi_select":
+            self.values.extend(self._code(option.name) for option in prop.multi_select)
+            self.offsets.append(len(self.values))
+        elif self.prop_type == "date":
+            self.values.append(prop.date.get("start") if prop.date else None)
+        else:
+            self.values.append(property_value(prop))
+
+    def append_missing(self) -> None:
+        if self.prop_type in _CATEGORICAL_TYPES:
+            self.values.append(-1)
+        elif self.prop_type == "multi_select":
+            self.offsets.append(len(self.values))
+        else:
+            self.values.append(None)
+
+    def build(self) -> Column:
+        categories = list(self.categories)
+        if self.prop_type in _CATEGORICAL_TYPES:
+            return CategoricalColumn(np.array(self.values, dtype=np.int32), categories)
+        if self.prop_type == "multi_select":
+            return MultiCategoricalColumn(
+                np.array(self.offsets, dtype=np.int64),
+                np.array(self.values, dtype=np.int32),
+                categories,
+            )
+        if self.prop_type in _DATE_TYPES:
+            return parse_dates(self.values)
+        if self.prop_type in ("number", "unique_id"):
+            return np.array(
+                [np.nan if value is None else value for value in self.values],
+                dtype=np.float64,
+            )
+        if self.prop_type == "checkbox":
+            return np.array(self.values, dtype=bool)
+        values = np.empty(len(self.values), dtype=object)
+        values[:] = self.values
+        return values
+
+
+class PropertyFrame:
+    """
+    Query results stored as one typed column per property.
+
+    Numbers are float64 (NaN when empty), checkboxes bool, dates and
+    timestamps UTC `datetime64[us]` (NaT when empty), selects and statuses
+    `CategoricalColumn`s, multi-selects `MultiCategoricalColumn`s, and all
+    other properties object arrays of their plain values.
+    """
+
+    def __init__(self, columns: dict[str, Column], types: dict[str, str]):
+        self.columns = columns
+        self.types = types
+
+    def __len__(self) -> int:
+        return len(self.columns["id"])
+
+    def __getitem__(self, name: str) -> Column:
+        return self.columns[name]
+
+    def to_pandas(self) -> Any:
+        """
+        Converts the frame into a pandas DataFrame with categorical selects.
+
+        Returns:
+            A `pandas.DataFrame`.
+        """
+        import pandas as pd
+
+        data: dict[str, Any] = {}
+        for name, column in self.columns.items():
+            if isinstance(column, CategoricalColumn):
+                data[name] = pd.Categorical.from_codes(column.codes, column.categories)
+            elif isinstance(column, MultiCategoricalColumn):
+                data[name] = column.to_lists()
+            elif column.dtype.kind == "M":
+                data[name] = pd.to_datetime(column).tz_localize("UTC")
+            else:
+                data[name] = column
+        return pd.DataFrame(data)
+
+    def to_arrow(self) -> Any:
+        """
+        Converts the frame into a pyarrow Table with dictionary-encoded selects.
+
+        Returns:
+            A `pyarrow.Table`.
+        """
+        import pyarrow as pa
+
+        arrays: dict[str, Any] = {}
+        for name, column in self.columns.items():
+            if isinstance(column, CategoricalColumn):
+                indices = pa.array(column.codes, mask=column.codes < 0)
+                arrays[name] = pa.DictionaryArray.from_arrays(
+                    indices, pa.array(column.categories, type=pa.string())
+                )
+            elif isinstance(column, MultiCategoricalColumn):
+                values = pa.DictionaryArray.from_arrays(
+                    pa.array(column.codes), pa.array(column.categories, type=pa.string())
+                )
+                arrays[name] = pa.ListArray.from_arrays(
+                    pa.array(column.offsets, type=pa.int32()), values
+                )
+            elif column.dtype.kind == "M":
+                arrays[name] = pa.array(column, type=pa.timestamp("us", tz="UTC"))
+            else:
+                arrays[name] = pa.array(column)
+        return pa.table(arrays)
+
+
+class PropertyFrameBuilder:
+    """Builds a `PropertyFrame` incrementally from batches of pages."""
+
+    def __init__(self):
+        self._ids: list[str] = []
+        self._created: list[datetime] = []
+        self._edited: list[datetime] = []
+        self._builders: dict[str, _ColumnBuilder] = {}
+
+    def extend(self, pages: Iterable[Page]) -> None:
+        """Appends a batch of pages to the frame being built."""
+        for page in pages:
+            for name, prop in page.properties.items():
+                if name not in self._builders:
+                    builder = _ColumnBuilder(prop.type)
+                    # * Backfill rows added before this property was seen
+                    for _ in self._ids:
+                        builder.append_missing()
+                    self._builders[name] = builder
+            for name, builder in self._builders.items():
+                builder.append(page.properties.get(name))
+            self._ids.append(page.id)
+            self._created.append(page.created_time)
+            self._edited.append(page.last_edited_time)
+
+    def build(self) -> PropertyFrame:
+        """Finalizes the columns into a `PropertyFrame`."""
+        ids = np.empty(len(self._ids), dtype=object)
+        ids[:] = self._ids
+        columns: dict[str, Column] = {
+            "id": ids,
+            "created_time": parse_dates(self._created),
+            "last_edited_time": parse_dates(self._edited),
+        }
+        types = {"id": "id", "created_time": "created_time", "last_edited_time": "last_edited_time"}
+        for name, builder in self._builders.items():
+            columns[name] = builder.build()
+            types[name] = builder.prop_type
+        return PropertyFrame(columns, types)
+
+
+def to_frame(pages: Iterable[Page]) -> PropertyFrame:
+    """
+    Converts pages into a columnar `PropertyFrame`.
+
+    Args:
+        pages: The pages to convert, typically from one database.
+
+    Returns:
+        The columnar frame.
+    """
+    builder = PropertyFrameBuilder()
+    builder.extend(pages)
+    return builder.build()
+
+
+async def frame_from_responses(
+    responses: AsyncIterator[PaginatedPageResponse],
+) -> PropertyFrame:
+    """
+    Builds a `PropertyFrame` from a stream of paginated query responses.
+
+    Args:
+        responses: The responses, e.g. from `AsyncNotionClient.iter_query_database`.
+
+    Returns:
+        The columnar frame.
+    """
+    builder = PropertyFrameBuilder()
+    async for response in responses:
+        builder.extend(response.results)
+    return builder.build()
+
+
+async def query_frame(
+    client: AsyncNotionClient,
+    database_id: str,
+    payload: QueryDatabasePayload | None = None,
+) -> PropertyFrame:
+    """
+    Queries a database and returns all results as a `PropertyFrame`.
+
+    Args:
+        client: The Notion client to query with.
+        database_id: The ID of the database to query.
+        payload: The query payload (for filtering, sorting, etc.).
+
+    Returns:
+        The columnar frame.
+    """
+    return await frame_from_responses(client.iter_query_database(database_id, payload))
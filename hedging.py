@@ -0,0 +1,116 @@
+"""Hedged requests: a backup request for reads that run slower than usual."""
+
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from typing import TypeVar
+
+from app.core.integrations.notion.rate_limit import RateLimiter
+
+# * Configure logging
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class HedgingPolicy:
+    """
+    Sends a second, identical request when the first is slower than a
+    latency percentile, and uses whichever response arrives first.
+
+    Latencies are tracked per key, e.g. per endpoint class. Only use it for
+    idempotent requests.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        window_size: int = 200,
+        min_samples: int = 20,
+        initial_delay: float = 0.25,
+        min_delay: float = 0.01,
+    ):
+        """
+        Initializes the hedging policy.
+
+        Args:
+            percentile: The latency percentile after which a hedge is sent.
+            window_size: The number of recent latencies kept per key.
+            min_samples: The number of latencies needed before the percentile
+                is used instead of `initial_delay`.
+            initial_delay: The hedging delay in seconds for keys with few samples.
+            min_delay: The lower bound of the hedging delay in seconds.
+        """
+        self.percentile = percentile
+        self.window_size = window_size
+        self.min_samples = min_samples
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.hedges_sent = 0
+        self._latencies: dict[str, deque[float]] = {}
+
+    def observe(self, key: str, duration: float) -> None:
+        """Records the latency of a completed request."""
+        latencies = self._latencies.get(key)
+        if latencies is None:
+            latencies = self._latencies[key] = deque(maxlen=self.window_size)
+        latencies.append(duration)
+
+    def delay(self, key: str) -> float:
+        """Returns how long to wait for a request before hedging it."""
+        latencies = self._latencies.get(key)
+        if latencies is None or len(latencies) < self.min_samples:
+            return self.initial_delay
+        ordered = sorted(latencies)
+        index = min(
+            len(ordered) - 1, math.ceil(self.percentile / 100 * len(ordered)) - 1
+        )
+        return max(self.min_delay, ordered[index])
+
+    async def run(
+        self,
+        key: str,
+        send: Callable[[], Awaitable[T]],
+        rate_limiter: RateLimiter | None = None,
+    ) -> T:
+        """
+        Sends a request, hedging it if it is slow.
+
+        A hedge is only sent if the rate limiter has a token available right
+        away, so hedging never delays other requests or causes 429s.
+
+        Args:
+            key: The latency bucket of the request.
+            send: A function starting the request.
+            rate_limiter: The rate limiter to take the hedge's token from.
+
+        Returns:
+            The first successful response.
+
+        Raises:
+            Exception: The primary request's error if every request failed.
+        """
+        start = time.monotonic()
+        primary = asyncio.ensure_future(send())
+        pending = {primary}
+        try:
+            done, _ = await asyncio.wait(pending, timeout=self.delay(key))
+            if not done and (rate_limiter is None or rate_limiter.try_acquire()):
+                self.hedges_sent += 1
+                logger.debug("Hedging a slow request to %s.", key)
+                pending.add(asyncio.ensure_future(send()))
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        self.observe(key, time.monotonic() - start)
+                        return task.result()
+            return primary.result()
+        finally:
+            for task in pending:
+                task.cancel()
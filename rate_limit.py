@@ -0,0 +1,306 @@
+"""Client-side rate limiting for the Notion API."""
+
+import asyncio
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Protocol
+
+# * Notion allows an average of three requests per second per integration
+DEFAULT_RATE = 3.0
+
+# * Seconds a reservation waits for another process's write lock. Bounded
+# * reservations are non-blocking and run on the event loop, so they give up
+# * almost at once instead.
+BUSY_TIMEOUT = 10.0
+BOUNDED_BUSY_TIMEOUT = 0.005
+
+
+class RateLimiter(Protocol):
+    """The interface the client and scheduler use to pace requests."""
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        """Waits until the tokens are available and takes them."""
+        ...
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Takes the tokens only if they are available right now."""
+        ...
+
+
+class AsyncRateLimiter:
+    """
+    A token-bucket rate limiter shared by concurrent coroutines.
+
+    Waiters are served in FIFO order, so a burst of concurrent callers is
+    spread out over time instead of hitting the API at once and collecting
+    429 responses.
+    """
+
+    def __init__(self, rate: float = DEFAULT_RATE, capacity: int | None = None):
+        """
+        Initializes the rate limiter.
+
+        Args:
+            rate: The number of tokens added to the bucket per second.
+            capacity: The maximum number of tokens the bucket holds, i.e. the
+                largest burst allowed. Defaults to one second's worth of tokens.
+        """
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1, int(rate))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        """
+        Waits until the requested number of tokens is available and takes them.
+
+        Args:
+            tokens: The number of tokens to take from the bucket.
+        """
+        async with self._lock:
+            self._refill()
+            while self._tokens < tokens:
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= tokens
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """
+        Takes tokens only if they are available right now, without waiting.
+
+        Args:
+            tokens: The number of tokens to take from the bucket.
+
+        Returns:
+            Whether the tokens were taken.
+        """
+        if self._lock.locked():
+            return False
+        self._refill()
+        if self._tokens < tokens:
+            return False
+        self._tokens -= tokens
+        return True
+
+
+class TokenBucketStore(Protocol):
+    """
+    Shared storage of token buckets, e.g. a local database or a network store.
+
+    `reserve` must be atomic across every process using the store.
+    """
+
+    def reserve(
+        self,
+        key: str,
+        tokens: float,
+        rate: float,
+        capacity: float,
+        max_wait: float | None = None,
+    ) -> float | None:
+        """
+        Refills a bucket and takes tokens from it, possibly ahead of time.
+
+        The balance may go negative: the caller then owns tokens that only
+        become valid after the returned wait, so concurrent callers queue up
+        behind each other instead of polling.
+
+        Args:
+            key: The bucket, e.g. one per integration.
+            tokens: The number of tokens to take.
+            rate: The number of tokens added per second.
+            capacity: The maximum number of tokens the bucket holds.
+            max_wait: If given, reserve nothing when the wait would be longer,
+                or when the store is too busy to answer right away.
+
+        Returns:
+            The number of seconds to wait before using the tokens, or None if
+            nothing was reserved.
+        """
+        ...
+
+
+class SQLiteTokenBucketStore:
+    """
+    Token buckets in a SQLite table shared by every process on a host.
+
+    Each reservation is one short write transaction, which SQLite serializes
+    across processes with its file lock.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initializes the store, creating the table if needed.
+
+        Args:
+            path: The path of the database file.
+        """
+        self.path = path
+        self._local = threading.local()
+        self._connection().execute(
+            "CREATE TABLE IF NOT EXISTS buckets "
+            "(key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)"
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        # * SQLite connections must not be shared between threads
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(
+                self.path, timeout=BUSY_TIMEOUT, isolation_level=None
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            # * A reservation lost in a power cut only costs a few extra tokens
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def reserve(
+        self,
+        key: str,
+        tokens: float,
+        rate: float,
+        capacity: float,
+        max_wait: float | None = None,
+    ) -> float | None:
+        connection = self._connection()
+        busy_timeout = BUSY_TIMEOUT if max_wait is None else BOUNDED_BUSY_TIMEOUT
+        connection.execute(f"PRAGMA busy_timeout = {int(busy_timeout * 1000)}")
+        # * Take the write lock up front so no other process reads a stale balance
+        try:
+            connection.execute("BEGIN IMMEDIATE")
+        except sqlite3.OperationalError:
+            if max_wait is None:
+                raise
+            return None
+        try:
+            # ! Note: Wall-clock time, since monotonic clocks are per process
+            # ! on some platforms
+            now = time.time()
+            row = connection.execute(
+                "SELECT tokens, updated_at FROM buckets WHERE key = ?", (key,)
+            ).fetchone()
+            balance = capacity if row is None else row[0] + (now - row[1]) * rate
+            balance = min(capacity, balance) - tokens
+            wait = max(0.0, -balance / rate)
+            if max_wait is not None and wait > max_wait:
+                connection.execute("ROLLBACK")
+                return None
+            connection.execute(
+                "INSERT INTO buckets (key, tokens, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET "
+                "tokens = excluded.tokens, updated_at = excluded.updated_at",
+                (key, balance, now),
+            )
+            connection.execute("COMMIT")
+        except BaseException:
+            if connection.in_transaction:
+                connection.execute("ROLLBACK")
+            raise
+        return wait
+
+
+class SharedRateLimiter:
+    """
+    A token-bucket rate limiter whose state is shared between processes.
+
+    Every uvicorn and Celery process using the same store and key draws from
+    one budget, so together they stay under Notion's per-integration limit
+    instead of each assuming the full rate. Acquiring costs a single store
+    round trip; the caller then sleeps for its reserved slot.
+    """
+
+    def __init__(
+        self,
+        store: TokenBucketStore,
+        key: str,
+        rate: float = DEFAULT_RATE,
+        capacity: int | None = None,
+    ):
+        """
+        Initializes the rate limiter.
+
+        Args:
+            store: The shared bucket storage.
+            key: The bucket to draw from, one per integration, e.g. from
+                `bucket_key`. Limiters with the same key share one budget.
+            rate: The number of tokens added to the bucket per second.
+            capacity: The maximum number of tokens the bucket holds.
+                Defaults to one second's worth of tokens.
+        """
+        self.store = store
+        self.key = key
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1, int(rate))
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        """
+        Reserves tokens in the shared bucket and waits until they are valid.
+
+        Args:
+            tokens: The number of tokens to take from the bucket.
+        """
+        wait = await asyncio.to_thread(
+            self.store.reserve, self.key, tokens, self.rate, self.capacity
+        )
+        if wait:
+            await asyncio.sleep(wait)
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """
+        Takes tokens only if they are available right now, without waiting.
+
+        It runs on the event loop, so if another process holds the store's
+        lock, it gives up instead of waiting for it.
+
+        Args:
+            tokens: The number of tokens to take from the bucket.
+
+        Returns:
+            Whether the tokens were taken.
+        """
+        wait = self.store.reserve(
+            self.key, tokens, self.rate, self.capacity, max_wait=0.0
+        )
+        return wait is not None
+
+
+def bucket_key(token: str) -> str:
+    """Derives an integration's bucket key from its token, without storing it."""
+    return f"notion:{hashlib.sha256(token.encode()).hexdigest()[:16]}"
+
+
+def rate_limiter_from_env(token: str | None = None) -> RateLimiter:
+    """
+    Creates the rate limiter configured by the environment.
+
+    Args:
+        token: The integration token the limiter paces. Defaults to
+            `NOTION_API_TOKEN`.
+
+    Returns:
+        A `SharedRateLimiter` over the SQLite file at `NOTION_RATE_LIMIT_PATH`
+        when it is set, so every process on the host shares the integration's
+        budget, and an in-process `AsyncRateLimiter` otherwise.
+
+    Raises:
+        ValueError: If `NOTION_RATE_LIMIT_PATH` is set but there is no token.
+    """
+    path = os.getenv("NOTION_RATE_LIMIT_PATH")
+    if path:
+        token = token or os.getenv("NOTION_API_TOKEN")
+        if not token:
+            raise ValueError("A shared rate limiter needs NOTION_API_TOKEN to be set.")
+        return SharedRateLimiter(SQLiteTokenBucketStore(path), bucket_key(token))
+    return AsyncRateLimiter()
@@ -0,0 +1,181 @@
+"""Batched, deduplicated resolution of the pages relation properties point to."""
+
+import asyncio
+import logging
+from collections.abc import Iterable
+
+from app.core.integrations.notion.client import AsyncNotionClient
+from app.core.integrations.notion.exceptions import NotionNotFoundError
+from app.core.integrations.notion.schemas import Page
+from app.core.integrations.notion.utils import clean_id
+
+# * Configure logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENCY = 8
+
+
+def relation_ids(
+    page: Page, properties: Iterable[str] | None = None
+) -> dict[str, list[str]]:
+    """
+    Lists the related page IDs of each relation property of a page.
+
+    Args:
+        page: The page.
+        properties: The names of the relation properties to include, or None
+            for all of them.
+
+    Returns:
+        The related page IDs by property name, as found in the page object.
+    """
+    names = None if properties is None else set(properties)
+    return {
+        name: [related["id"] for related in prop.relation]
+        for name, prop in page.properties.items()
+        if prop.type == "relation" and (names is None or name in names)
+    }
+
+
+class RelationGraph:
+    """
+    The pages of a result set and the pages they relate to, indexed by ID.
+
+    IDs are accepted with or without dashes.
+    """
+
+    def __init__(self):
+        self.pages: dict[str, Page] = {}
+        # * Complete related IDs of the pages whose relations were followed
+        self.relations: dict[str, dict[str, list[str]]] = {}
+        # * IDs of related pages that do not exist or are not shared
+        self.missing: set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self.pages)
+
+    def __contains__(self, page_id: str) -> bool:
+        return clean_id(page_id) in self.pages
+
+    def get(self, page_id: str) -> Page | None:
+        """Returns a page of the graph without calling the API."""
+        return self.pages.get(clean_id(page_id))
+
+    def related(self, page: Page | str, property_name: str) -> list[Page]:
+        """
+        Returns the pages a relation property points to, in order.
+
+        Args:
+            page: A page of the graph, or its ID.
+            property_name: The name of the relation property.
+
+        Returns:
+            The related pages that were resolved. Missing pages and pages
+            beyond the resolved depth are left out.
+        """
+        page_id = clean_id(page if isinstance(page, str) else page.id)
+        ids = self.relations.get(page_id, {}).get(property_name)
+        if ids is None:
+            node = self.pages.get(page_id)
+            ids = (
+                relation_ids(node, [property_name]).get(property_name, [])
+                if node
+                else []
+            )
+        return [self.pages[cid] for cid in map(clean_id, ids) if cid in self.pages]
+
+
+async def _complete_relations(
+    client: AsyncNotionClient,
+    page: Page,
+    properties: Iterable[str] | None,
+    semaphore: asyncio.Semaphore,
+) -> dict[str, list[str]]:
+    """Lists a page's related IDs, fetching relations truncated at 25 entries."""
+    ids = relation_ids(page, properties)
+    for name in ids:
+        prop = page.properties[name]
+        if not prop.has_more:
+            continue
+        async with semaphore:
+            complete = await client.get_page_property(page.id, prop.id)
+        ids[name] = [related["id"] for related in complete.relation]
+    return ids
+
+
+async def resolve_relations(
+    client: AsyncNotionClient,
+    pages: Iterable[Page],
+    depth: int = 1,
+    properties: Iterable[str] | None = None,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+) -> RelationGraph:
+    """
+    Resolves the relations of a result set with one batch of fetches per level.
+
+    Related IDs are collected across every page and deduplicated, and each
+    page not already known is fetched once, concurrently. Rendering N rows
+    with M relations each takes one `get_page` per unique related page
+    instead of N×M. Relations truncated in page objects are completed first.
+
+    Args:
+        client: The Notion client.
+        pages: The pages whose relations to resolve, e.g. a query result.
+        depth: How many relation hops to follow. 2 also resolves the
+            relations of the related pages.
+        properties: The names of the relation properties to follow, or None
+            for all of them. Applies at every depth.
+        max_concurrency: The maximum number of requests in flight.
+
+    Returns:
+        The graph of the given and related pages.
+
+    Raises:
+        NotionAPIError: If a fetch fails for a reason other than the page
+            not existing or not being shared.
+    """
+    graph = RelationGraph()
+    semaphore = asyncio.Semaphore(max_concurrency)
+    level = list(pages)
+    graph.pages.update((clean_id(page.id), page) for page in level)
+
+    async def fetch(page_id: str) -> Page:
+        async with semaphore:
+            return await client.get_page(page_id)
+
+    for _ in range(depth):
+        relations = await asyncio.gather(
+            *(
+                _complete_relations(client, page, properties, semaphore)
+                for page in level
+            )
+        )
+        wanted: set[str] = set()
+        for page, ids in zip(level, relations):
+            graph.relations[clean_id(page.id)] = ids
+            wanted.update(
+                cid
+                for related in ids.values()
+                for cid in map(clean_id, related)
+                if cid not in graph.pages and cid not in graph.missing
+            )
+        if not wanted:
+            break
+
+        unique = list(wanted)
+        results = await asyncio.gather(*map(fetch, unique), return_exceptions=True)
+        level = []
+        for page_id, result in zip(unique, results):
+            if isinstance(result, Page):
+                graph.pages[page_id] = result
+                level.append(result)
+            elif isinstance(result, NotionNotFoundError):
+                graph.missing.add(page_id)
+            elif isinstance(result, BaseException):
+                raise result
+        logger.debug(
+            "Resolved %d related pages, %d missing.",
+            len(level),
+            len(unique) - len(level),
+        )
+    return graph
@@ -0,0 +1,151 @@
+"""Priority-aware scheduling of requests that share one rate-limit budget."""
+
+import asyncio
+import heapq
+import itertools
+import logging
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Literal
+
+from app.core.integrations.notion.rate_limit import AsyncRateLimiter, RateLimiter
+
+# * Configure logging
+logger = logging.getLogger(__name__)
+
+Priority = Literal["interactive", "default", "batch"]
+
+# * Lower levels are always served first
+PRIORITY_LEVELS: dict[Priority, int] = {"interactive": 0, "default": 1, "batch": 2}
+
+_priority: ContextVar[Priority | None] = ContextVar("notion_priority", default=None)
+
+
+@contextmanager
+def request_priority(priority: Priority) -> Iterator[None]:
+    """
+    Sets the priority of every Notion request made inside the block,
+    overriding the client's default.
+
+        with request_priority("batch"):
+            await export_database(client, database_id, path)
+
+    Args:
+        priority: The priority class.
+    """
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority() -> Priority | None:
+    """Returns the priority set by the innermost `request_priority` block."""
+    return _priority.get()
+
+
+class RequestScheduler:
+    """
+    Hands out rate-limit tokens by priority class, then fairly across tenants.
+
+    Requests wait in one queue per priority class. Whenever a token becomes
+    available, it goes to the highest non-empty class, so interactive
+    requests overtake queued batch work. Within a class, tenants (e.g.
+    workspaces or tokens) are served by weighted fair queuing: a tenant
+    with weight 2 gets twice the share of a tenant with weight 1 while both
+    are busy, and no single tenant can monopolize the budget.
+    """
+
+    def __init__(
+        self,
+        rate_limiter: RateLimiter | None = None,
+        tenant_weights: dict[str, float] | None = None,
+    ):
+        """
+        Initializes the scheduler.
+
+        Args:
+            rate_limiter: The budget to share. Defaults to Notion's average
+                rate limit.
+            tenant_weights: The relative share of each tenant. Tenants not
+                listed have a weight of 1.
+        """
+        self.rate_limiter = rate_limiter or AsyncRateLimiter()
+        self.tenant_weights = tenant_weights or {}
+        # * One heap of (finish tag, sequence, future) per priority level
+        self._queues: list[list[tuple[float, int, asyncio.Future[None]]]] = [
+            [] for _ in PRIORITY_LEVELS
+        ]
+        self._virtual_time = [0.0] * len(PRIORITY_LEVELS)
+        self._finish: dict[tuple[int, str], float] = {}
+        self._sequence = itertools.count()
+        self._waiting = 0
+        self._dispatcher: asyncio.Task[None] | None = None
+
+    @property
+    def waiting(self) -> int:
+        """The number of requests waiting for a token."""
+        return self._waiting
+
+    async def acquire(
+        self, tenant: str = "default", priority: Priority = "default"
+    ) -> None:
+        """
+        Waits until the request is scheduled and has taken a rate-limit token.
+
+        Args:
+            tenant: The tenant the request is made for.
+            priority: The priority class of the request.
+        """
+        level = PRIORITY_LEVELS[priority]
+        weight = self.tenant_weights.get(tenant, 1.0)
+        start = max(self._virtual_time[level], self._finish.get((level, tenant), 0.0))
+        tag = self._finish[(level, tenant)] = start + 1.0 / weight
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._queues[level], (tag, next(self._sequence), future))
+        self._waiting += 1
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+        try:
+            await future
+        except asyncio.CancelledError:
+            # ! Note: A future resolved before the cancellation was already counted
+            if future.cancelled():
+                self._waiting -= 1
+            raise
+
+    def _pop(self) -> asyncio.Future[None] | None:
+        for level, queue in enumerate(self._queues):
+            while queue:
+                tag, _, future = heapq.heappop(queue)
+                if future.done():
+                    continue
+                self._virtual_time[level] = tag
+                return future
+        return None
+
+    async def _dispatch(self) -> None:
+        while self._waiting > 0:
+            try:
+                await self.rate_limiter.acquire()
+            except Exception as e:
+                # * Fail the request being served and keep serving the rest,
+                # * in case the limiter recovers
+                logger.error("Rate limiter failed to grant a token: %s", e)
+                future = self._pop()
+                if future is None:
+                    return
+                self._waiting -= 1
+                future.set_exception(e)
+                continue
+            # * Choose only once the token is in hand, so late arrivals with a
+            # * higher priority still go first
+            future = self._pop()
+            if future is None:
+                return
+            self._waiting -= 1
+            future.set_result(None)
+        # * Forget finish tags of idle tenants so they start fresh
+        self._finish.clear()
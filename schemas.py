@@ -1,9 +1,9 @@
 """Pydantic models for Notion API objects."""
 
 from datetime import datetime
-from typing import Any, Literal
+from typing import Annotated, Any, Literal
 
-from pydantic import BaseModel, HttpUrl
+from pydantic import BaseModel, ConfigDict, Field, HttpUrl
 
 
 # Generic Notion Object Model
@@ -39,9 +39,10 @@ class Icon(BaseModel):
 
 # Parent Object
 class Parent(BaseModel):
-    type: Literal["database_id", "page_id", "workspace"]
+    type: Literal["database_id", "page_id", "block_id", "workspace"]
     database_id: str | None = None
     page_id: str | None = None
+    block_id: str | None = None
     workspace: bool | None = None
 
 # Rich Text and Annotations
@@ -63,6 +64,17 @@ class Text(RichText):
     type: Literal["text"] = "text"
     text: dict[str, Any]
 
+class Mention(RichText):
+    type: Literal["mention"] = "mention"
+    mention: dict[str, Any]
+
+class Equation(RichText):
+    type: Literal["equation"] = "equation"
+    equation: dict[str, Any]
+
+# Any rich text item, e.g. in a title or rich text property
+RichTextItem = Text | Mention | Equation
+
 # Properties
 class Property(BaseModel):
     id: str
@@ -70,11 +82,11 @@ class Property(BaseModel):
 
 class Title(Property):
     type: Literal["title"] = "title"
-    title: list[Text]
+    title: list[RichTextItem]
 
 class RichTextProperty(Property):
     type: Literal["rich_text"] = "rich_text"
-    rich_text: list[Text]
+    rich_text: list[RichTextItem]
 
 class SelectOption(BaseModel):
     id: str
@@ -106,8 +118,156 @@ class FilesProperty(Property):
     files: list[File]
 
 
+class Number(Property):
+    type: Literal["number"] = "number"
+    number: float | None
+
+
+class Checkbox(Property):
+    type: Literal["checkbox"] = "checkbox"
+    checkbox: bool
+
+
+class Url(Property):
+    type: Literal["url"] = "url"
+    url: str | None
+
+
+class Email(Property):
+    type: Literal["email"] = "email"
+    email: str | None
+
+
+class PhoneNumber(Property):
+    type: Literal["phone_number"] = "phone_number"
+    phone_number: str | None
+
+
+class Status(Property):
+    type: Literal["status"] = "status"
+    status: SelectOption | None
+
+
+class People(Property):
+    type: Literal["people"] = "people"
+    people: list[User]
+
+
+class Relation(Property):
+    type: Literal["relation"] = "relation"
+    relation: list[dict[str, str]]
+    has_more: bool = False
+
+
+class Formula(Property):
+    type: Literal["formula"] = "formula"
+    formula: dict[str, Any]
+
+
+class Rollup(Property):
+    type: Literal["rollup"] = "rollup"
+    rollup: dict[str, Any]
+
+
+class CreatedTime(Property):
+    type: Literal["created_time"] = "created_time"
+    created_time: datetime
+
+
+class LastEditedTime(Property):
+    type: Literal["last_edited_time"] = "last_edited_time"
+    last_edited_time: datetime
+
+
+class CreatedBy(Property):
+    type: Literal["created_by"] = "created_by"
+    created_by: User
+
+
+class LastEditedBy(Property):
+    type: Literal["last_edited_by"] = "last_edited_by"
+    last_edited_by: User
+
+
+class UniqueId(Property):
+    type: Literal["unique_id"] = "unique_id"
+    unique_id: dict[str, Any]
+
+
+# Any typed property value, falling back to the generic Property
+PropertyValue = (
+    Title
+    | RichTextProperty
+    | Select
+    | MultiSelect
+    | Date
+    | FilesProperty
+    | Number
+    | Checkbox
+    | Url
+    | Email
+    | PhoneNumber
+    | Status
+    | People
+    | Relation
+    | Formula
+    | Rollup
+    | CreatedTime
+    | LastEditedTime
+    | CreatedBy
+    | LastEditedBy
+    | UniqueId
+    | Property
+)
+
+
+# * Maps each property type to the model validating its values
+PROPERTY_MODELS: dict[str, type[Property]] = {
+    model.model_fields["type"].default: model
+    for model in (
+        Title,
+        RichTextProperty,
+        Select,
+        MultiSelect,
+        Date,
+        FilesProperty,
+        Number,
+        Checkbox,
+        Url,
+        Email,
+        PhoneNumber,
+        Status,
+        People,
+        Relation,
+        Formula,
+        Rollup,
+        CreatedTime,
+        LastEditedTime,
+        CreatedBy,
+        LastEditedBy,
+        UniqueId,
+    )
+}
+
+
+def validate_property(data: dict[str, Any]) -> PropertyValue:
+    """Validates a property value with the model for its type."""
+    return PROPERTY_MODELS.get(data.get("type"), Property).model_validate(data)
+
+
+class PaginatedPropertyItemResponse(BaseModel):
+    object: Literal["list"]
+    results: list[dict[str, Any]]
+    next_cursor: str | None
+    has_more: bool
+    property_item: dict[str, Any]
+
+
 # Page and Database Models
-class Page(NotionObject):
+class PageBase(NotionObject):
+    """The fields of a page besides its properties."""
+
+    object: Literal["page"] = "page"
     id: str
     created_time: datetime
     last_edited_time: datetime
@@ -117,12 +277,13 @@ class Page(NotionObject):
     icon: Icon | None = None
     parent: Parent
     archived: bool
-    properties: dict[
-        str, Title | RichTextProperty | Select | MultiSelect | Date | FilesProperty | Property
-    ]
     url: HttpUrl
 
+class Page(PageBase):
+    properties: dict[str, PropertyValue]
+
 class Database(NotionObject):
+    object: Literal["database"] = "database"
     id: str
     created_time: datetime
     last_edited_time: datetime
@@ -140,6 +301,9 @@ class Database(NotionObject):
 class Block(NotionObject):
     """Represents a Block object in Notion."""
 
+    # * Keep the content of block types without a field below, e.g. quotes
+    model_config = ConfigDict(extra="allow")
+
     id: str
     created_time: datetime
     last_edited_time: datetime
@@ -182,6 +346,8 @@ class AppendBlockChildrenPayload(BaseModel):
     """Represents the payload for appending block children."""
 
     children: list[dict[str, Any]]
+    # * The ID of the existing child to insert after, instead of at the end
+    after: str | None = None
 
 
 class AppendBlockChildrenResponse(BaseModel):
@@ -218,6 +384,22 @@ class PaginatedPageResponse(BaseModel):
     has_more: bool
 
 
+class SearchPayload(BaseModel):
+    query: str | None = None
+    filter: dict[str, Any] | None = None
+    sort: dict[str, Any] | None = None
+    start_cursor: str | None = None
+    page_size: int | None = None
+
+
+class PaginatedSearchResponse(BaseModel):
+    object: Literal["list"]
+    # * Databases carry icons and covers too, so the object type tells them apart
+    results: list[Annotated[Page | Database, Field(discriminator="object")]]
+    next_cursor: str | None
+    has_more: bool
+
+
 class PaginatedUserResponse(BaseModel):
     object: Literal["list"]
     results: list[User]
@@ -225,6 +407,27 @@ class PaginatedUserResponse(BaseModel):
     has_more: bool
 
 
+# File Upload Models
+class CreateFileUploadPayload(BaseModel):
+    mode: Literal["single_part", "multi_part", "external_url"] = "single_part"
+    filename: str | None = None
+    content_type: str | None = None
+    number_of_parts: int | None = None
+    external_url: str | None = None
+
+
+class FileUpload(NotionObject):
+    id: str
+    status: Literal["pending", "uploaded", "expired", "failed"]
+    filename: str | None = None
+    content_type: str | None = None
+    content_length: int | None = None
+    upload_url: str | None = None
+    complete_url: str | None = None
+    expiry_time: datetime | None = None
+    number_of_parts: dict[str, int] | None = None
+
+
 # Comment Models
 class Comment(NotionObject):
     id: str
@@ -0,0 +1,299 @@
+"""An in-memory inverted full-text index over Notion pages and databases."""
+
+import hashlib
+import logging
+import math
+import re
+from collections import Counter
+from collections.abc import Iterable
+from datetime import datetime
+
+from pydantic import BaseModel
+
+from app.core.integrations.notion.client import AsyncNotionClient
+from app.core.integrations.notion.schemas import (
+    Block,
+    Database,
+    Page,
+    SearchPayload,
+)
+
+# * Configure logging
+logger = logging.getLogger(__name__)
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+# * Title terms count this many times more than body terms
+TITLE_WEIGHT = 3
+
+# * BM25 parameters
+_K1 = 1.2
+_B = 0.75
+
+
+class SearchHit(BaseModel):
+    """A ranked result from a `SearchIndex` query."""
+
+    id: str
+    object: str
+    title: str
+    score: float
+
+
+def tokenize(text: str) -> list[str]:
+    """Splits text into lowercase word tokens."""
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+def _plain_text(items: Iterable[dict]) -> str:
+    return "".join(item.get("plain_text", "") for item in items or [])
+
+
+def page_title(page: Page) -> str:
+    """Returns the plain text of a page's title property."""
+    for prop in page.properties.values():
+        if prop.type == "title":
+            return "".join(text.plain_text for text in prop.title)
+    return ""
+
+
+def page_text(page: Page) -> str:
+    """Returns the plain text of a page's rich text properties."""
+    return " ".join(
+        "".join(text.plain_text for text in prop.rich_text)
+        for prop in page.properties.values()
+        if prop.type == "rich_text"
+    )
+
+
+def block_text(block: Block) -> str:
+    """Returns the plain text of a block's rich text and caption."""
+    content = getattr(block, block.type, None) or {}
+    if block.type in ("child_page", "child_database"):
+        return content.get("title", "")
+    return " ".join(
+        filter(
+            None,
+            (
+                _plain_text(content.get("rich_text")),
+                _plain_text(content.get("caption")),
+            ),
+        )
+    )
+
+
+class _Document(BaseModel):
+    object: str
+    title: str
+    last_edited_time: datetime
+    terms: dict[str, int]
+    length: int
+    digest: str
+
+
+class SearchIndex:
+    """
+    A BM25-ranked keyword index answering searches without calling Notion.
+
+    Documents are keyed by page or database ID and only re-indexed when their
+    `last_edited_time` moves forward or, since Notion stores it with minute
+    precision, when their content changed within the same minute. `refresh`
+    can be run repeatedly and only pays for what changed since the last run.
+    """
+
+    def __init__(self):
+        self._documents: dict[str, _Document] = {}
+        self._postings: dict[str, dict[str, int]] = {}
+        self._total_length = 0
+        self.watermark: datetime | None = None
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def __contains__(self, object_id: str) -> bool:
+        return object_id in self._documents
+
+    def is_current(self, object_id: str, last_edited_time: datetime) -> bool:
+        """
+        Checks whether the index has a newer version of an object.
+
+        An equal `last_edited_time` does not count: the object may have been
+        edited again within the same minute.
+        """
+        existing = self._documents.get(object_id)
+        return existing is not None and existing.last_edited_time > last_edited_time
+
+    def _add(
+        self,
+        object_id: str,
+        object: str,
+        title: str,
+        body: str,
+        last_edited_time: datetime,
+    ) -> bool:
+        if self.is_current(object_id, last_edited_time):
+            return False
+        digest = hashlib.sha256(f"{object}\0{title}\0{body}".encode()).hexdigest()
+        existing = self._documents.get(object_id)
+        if (
+            existing is not None
+            and existing.last_edited_time == last_edited_time
+            and existing.digest == digest
+        ):
+            return False
+        self.remove(object_id)
+
+        terms = Counter(tokenize(body))
+        for term in tokenize(title):
+            terms[term] += TITLE_WEIGHT
+        length = sum(terms.values())
+        self._documents[object_id] = _Document(
+            object=object,
+            title=title,
+            last_edited_time=last_edited_time,
+            terms=terms,
+            length=length,
+            digest=digest,
+        )
+        self._total_length += length
+        for term, count in terms.items():
+            self._postings.setdefault(term, {})[object_id] = count
+        if self.watermark is None or last_edited_time > self.watermark:
+            self.watermark = last_edited_time
+        return True
+
+    def add_page(self, page: Page, blocks: Iterable[Block] = ()) -> bool:
+        """
+        Indexes a page's title, rich text properties and optional content.
+
+        Archived pages are removed from the index instead.
+
+        Args:
+            page: The page to index.
+            blocks: The page's content blocks, if they should be searchable.
+
+        Returns:
+            True if the index changed, False if it already had this version.
+        """
+        if page.archived:
+            return self.remove(page.id)
+        body = " ".join([page_text(page), *(block_text(block) for block in blocks)])
+        return self._add(
+            page.id, "page", page_title(page), body, page.last_edited_time
+        )
+
+    def add_database(self, database: Database) -> bool:
+        """
+        Indexes a database's title and description.
+
+        Args:
+            database: The database to index.
+
+        Returns:
+            True if the index changed, False if it already had this version.
+        """
+        if database.archived:
+            return self.remove(database.id)
+        return self._add(
+            database.id,
+            "database",
+            "".join(text.plain_text for text in database.title),
+            "".join(text.plain_text for text in database.description),
+            database.last_edited_time,
+        )
+
+    def remove(self, object_id: str) -> bool:
+        """
+        Removes a page or database from the index.
+
+        Args:
+            object_id: The ID of the object to remove.
+
+        Returns:
+            True if the object was indexed.
+        """
+        document = self._documents.pop(object_id, None)
+        if document is None:
+            return False
+        self._total_length -= document.length
+        for term in document.terms:
+            postings = self._postings[term]
+            del postings[object_id]
+            if not postings:
+                del self._postings[term]
+        return True
+
+    def search(self, query: str, limit: int = 10) -> list[SearchHit]:
+        """
+        Ranks indexed objects against a keyword query with BM25.
+
+        Args:
+            query: The keywords to search for.
+            limit: The maximum number of hits to return.
+
+        Returns:
+            The best matching objects, highest score first.
+        """
+        if not self._documents:
+            return []
+        count = len(self._documents)
+        average_length = self._total_length / count or 1.0
+        scores: Counter[str] = Counter()
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for object_id, frequency in postings.items():
+                length = self._documents[object_id].length
+                norm = _K1 * (1 - _B + _B * length / average_length)
+                scores[object_id] += idf * frequency * (_K1 + 1) / (frequency + norm)
+
+        return [
+            SearchHit(
+                id=object_id,
+                object=self._documents[object_id].object,
+                title=self._documents[object_id].title,
+                score=score,
+            )
+            for object_id, score in scores.most_common(limit)
+        ]
+
+    async def refresh(
+        self, client: AsyncNotionClient, include_blocks: bool = False
+    ) -> int:
+        """
+        Indexes everything edited since the last refresh.
+
+        Results of the Search API are read newest first and reading stops at the
+        first object older than the index's watermark.
+
+        Args:
+            client: The Notion client to search with.
+            include_blocks: Whether to fetch and index the top-level content
+                blocks of each changed page. This costs extra requests.
+
+        Returns:
+            The number of objects that were added, updated or removed.
+        """
+        watermark = self.watermark
+        payload = SearchPayload(
+            sort={"direction": "descending", "timestamp": "last_edited_time"}
+        )
+        changed = 0
+        async for response in client.iter_search(payload):
+            for result in response.results:
+                if watermark is not None and result.last_edited_time < watermark:
+                    logger.debug("Search index is up to date at %s.", watermark)
+                    return changed
+                if self.is_current(result.id, result.last_edited_time):
+                    continue
+                if isinstance(result, Database):
+                    changed += self.add_database(result)
+                    continue
+                blocks: list[Block] = []
+                if include_blocks and not result.archived:
+                    async for children in client.iter_block_children(result.id):
+                        blocks.extend(children.results)
+                changed += self.add_page(result, blocks)
+        return changed
@@ -0,0 +1,243 @@
+"""A synchronous facade over the async client for Celery tasks and scripts."""
+
+import asyncio
+import atexit
+import inspect
+import logging
+import os
+import threading
+from collections.abc import AsyncIterator, Callable, Coroutine, Iterator
+from typing import Any, TypeVar
+
+import httpx
+
+from app.core.integrations.notion.client import AsyncNotionClient
+from app.core.integrations.notion.rate_limit import (
+    RateLimiter,
+    rate_limiter_from_env,
+)
+
+# * Configure logging
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class EventLoopThread:
+    """
+    An event loop running forever in a daemon thread.
+
+    Sync code submits coroutines with `run` and blocks on the result, so every
+    call shares the loop and anything bound to it, such as an httpx connection
+    pool, instead of building a new loop per call like `asyncio.run` does.
+    """
+
+    def __init__(self, name: str = "notion-event-loop"):
+        """
+        Initializes and starts the loop thread.
+
+        Args:
+            name: The name of the thread.
+        """
+        self.loop = asyncio.new_event_loop()
+        self._started = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+        self._started.wait()
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        self.loop.call_soon(self._started.set)
+        self.loop.run_forever()
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread.is_alive() and not self.loop.is_closed()
+
+    def run(self, coro: Coroutine[Any, Any, T], timeout: float | None = None) -> T:
+        """
+        Runs a coroutine on the loop and waits for its result.
+
+        Args:
+            coro: The coroutine to run.
+            timeout: The maximum number of seconds to wait. The coroutine is
+                cancelled when it is exceeded.
+
+        Returns:
+            The result of the coroutine.
+
+        Raises:
+            RuntimeError: If called from the loop thread itself, which would
+                deadlock.
+            TimeoutError: If the timeout is exceeded.
+        """
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("Cannot block on the event loop thread from itself.")
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        try:
+            return future.result(timeout)
+        except TimeoutError:
+            future.cancel()
+            raise
+
+    def stop(self) -> None:
+        """Stops the loop and waits for the thread to exit."""
+        if not self.is_running:
+            return
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
+
+
+# * One loop thread per process; threads do not survive a fork, so Celery's
+# * prefork workers each start their own on first use
+_loop_thread: EventLoopThread | None = None
+_loop_pid: int | None = None
+_loop_lock = threading.Lock()
+
+
+def get_loop_thread() -> EventLoopThread:
+    """Returns the event loop thread of the current process, starting it if needed."""
+    global _loop_thread, _loop_pid
+    with _loop_lock:
+        if (
+            _loop_thread is None
+            or _loop_pid != os.getpid()
+            or not _loop_thread.is_running
+        ):
+            _loop_thread = EventLoopThread()
+            _loop_pid = os.getpid()
+            atexit.register(_loop_thread.stop)
+        return _loop_thread
+
+
+class SyncNotionClient:
+    """
+    A blocking Notion client with the same methods as `AsyncNotionClient`.
+
+    Calls run on a long-lived event loop thread that owns one
+    `httpx.AsyncClient`, so consecutive calls reuse keep-alive connections
+    and share one rate limiter. Coroutine methods return their result and
+    `iter_*` methods return regular iterators.
+    """
+
+    def __init__(
+        self,
+        token: str,
+        rate_limiter: RateLimiter | None = None,
+        loop_thread: EventLoopThread | None = None,
+        timeout: float | None = None,
+    ):
+        """
+        Initializes the sync client.
+
+        Args:
+            token: The Notion integration token.
+            rate_limiter: An optional rate limiter. Defaults to the one
+                configured by the environment, see `rate_limiter_from_env`.
+            loop_thread: The loop thread to run calls on. Defaults to the
+                process-wide thread.
+            timeout: The maximum number of seconds a single call may take.
+        """
+        self.loop_thread = loop_thread or get_loop_thread()
+        self.timeout = timeout
+        self.async_client: AsyncNotionClient = self.loop_thread.run(
+            self._create_client(token, rate_limiter)
+        )
+
+    @staticmethod
+    async def _create_client(
+        token: str, rate_limiter: RateLimiter | None
+    ) -> AsyncNotionClient:
+        # ! Note: Created on the loop thread so its locks and pool bind to it
+        return AsyncNotionClient(
+            token=token,
+            client=httpx.AsyncClient(),
+            rate_limiter=rate_limiter or rate_limiter_from_env(token),
+        )
+
+    def _iterate(self, iterator: AsyncIterator[T]) -> Iterator[T]:
+        while True:
+            try:
+                yield self.loop_thread.run(anext(iterator), self.timeout)
+            except StopAsyncIteration:
+                return
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self.async_client, name)
+        if inspect.isasyncgenfunction(attr):
+
+            def iterate(*args: Any, **kwargs: Any) -> Iterator[Any]:
+                return self._iterate(attr(*args, **kwargs))
+
+            return iterate
+        if inspect.iscoroutinefunction(attr):
+
+            def call(*args: Any, **kwargs: Any) -> Any:
+                return self.loop_thread.run(attr(*args, **kwargs), self.timeout)
+
+            return call
+        return attr
+
+    def run(self, func: Callable[[AsyncNotionClient], Coroutine[Any, Any, T]]) -> T:
+        """
+        Runs an async helper that takes the underlying client, e.g.
+        `sync_client.run(lambda c: scan_database(c, database_id))`.
+
+        Args:
+            func: A function taking an `AsyncNotionClient` and returning a coroutine.
+
+        Returns:
+            The result of the coroutine.
+        """
+        return self.loop_thread.run(func(self.async_client), self.timeout)
+
+    def close(self) -> None:
+        """Closes the connection pool."""
+        if self.loop_thread.is_running:
+            self.loop_thread.run(self.async_client.client.aclose())
+
+    def __enter__(self) -> "SyncNotionClient":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+_sync_clients: dict[tuple[int, str], SyncNotionClient] = {}
+
+
+def get_sync_notion_client(token: str | None = None) -> SyncNotionClient:
+    """
+    Returns the process-wide sync client for a token, creating it on first use.
+
+    Args:
+        token: The Notion integration token. Defaults to `NOTION_API_TOKEN`.
+
+    Returns:
+        The shared sync client.
+
+    Raises:
+        ValueError: If no token is given and `NOTION_API_TOKEN` is not set.
+    """
+    token = token or os.getenv("NOTION_API_TOKEN")
+    if not token:
+        raise ValueError("NOTION_API_TOKEN is not set in environment variables.")
+    loop_thread = get_loop_thread()
+    key = (id(loop_thread), token)
+    stale: list[SyncNotionClient] = []
+    with _loop_lock:
+        client = _sync_clients.get(key)
+        if client is None:
+            # * Drop clients bound to a stopped loop or that of a parent process
+            for stale_key, other in list(_sync_clients.items()):
+                if other.loop_thread is not loop_thread:
+                    stale.append(_sync_clients.pop(stale_key))
+            client = _sync_clients[key] = SyncNotionClient(
+                token, loop_thread=loop_thread
+            )
+    # ! Note: Closed outside the lock, since closing waits on the client's loop
+    for other in stale:
+        other.close()
+    return client
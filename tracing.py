@@ -0,0 +1,344 @@
+"""Phase-level tracing of client calls, with an OpenTelemetry adapter."""
+
+import logging
+import random
+import time
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Literal, Protocol, TypeVar, get_args
+
+import httpx
+from pydantic import BaseModel
+
+# * Configure logging
+logger = logging.getLogger(__name__)
+
+M = TypeVar("M", bound=BaseModel)
+
+# * The stages of a client call, in the order they happen:
+# * - queue: waiting for the rate limiter or scheduler
+# * - connect: acquiring a pooled connection, or connecting and TLS
+# * - first_byte: sending the request until the response headers arrive
+# * - download: receiving the response body
+# * - decode: parsing the JSON body
+# * - validate: validating the JSON with the pydantic models
+# * - retry_sleep: backing off before a retry
+Phase = Literal[
+    "queue", "connect", "first_byte", "download", "decode", "validate", "retry_sleep"
+]
+PHASES: tuple[Phase, ...] = get_args(Phase)
+
+DEFAULT_SLOW_CALL_THRESHOLD = 1.0
+
+
+@dataclass
+class CallTrace:
+    """
+    The time one client call, e.g. `query_database`, spent in each phase.
+
+    Phases of requests sent concurrently within a call are summed, so their
+    total can exceed the call's duration.
+    """
+
+    name: str
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: int | None = None
+    # * Seconds per phase, over every request and retry of the call
+    phases: dict[str, float] = field(default_factory=dict)
+    # * Counters such as requests, retries, request_bytes and response_bytes
+    counts: dict[str, int] = field(default_factory=dict)
+    error: str | None = None
+
+    @property
+    def duration(self) -> float:
+        """The seconds from the start to the end of the call, or until now."""
+        end_ns = self.end_ns if self.end_ns is not None else time.time_ns()
+        return (end_ns - self.start_ns) / 1e9
+
+
+class CallSpan(Protocol):
+    """A tracer's handle on one call in progress."""
+
+    def add_phase(
+        self, phase: Phase, start_ns: int, end_ns: int, attributes: dict[str, Any]
+    ) -> None:
+        """Records a finished phase, with Unix timestamps in nanoseconds."""
+        ...
+
+    def finish(self, trace: CallTrace) -> None:
+        """Records the totals of the call before it ends."""
+        ...
+
+
+class Tracer(Protocol):
+    """Receives the phases of client calls, e.g. to export them as spans."""
+
+    def start_call(self, name: str) -> AbstractContextManager[CallSpan]:
+        """Opens a call, named after the client method."""
+        ...
+
+
+class _NoopSpan:
+    def add_phase(
+        self, phase: Phase, start_ns: int, end_ns: int, attributes: dict[str, Any]
+    ) -> None:
+        pass
+
+    def finish(self, trace: CallTrace) -> None:
+        pass
+
+
+class NoopTracer:
+    """A tracer that records nothing. Clients using it skip tracing entirely."""
+
+    def start_call(self, name: str) -> AbstractContextManager[CallSpan]:
+        return nullcontext(_NoopSpan())
+
+
+class _OpenTelemetrySpan:
+    def __init__(self, tracer: "OpenTelemetryTracer", span: Any):
+        self._tracer = tracer
+        self._span = span
+
+    def add_phase(
+        self, phase: Phase, start_ns: int, end_ns: int, attributes: dict[str, Any]
+    ) -> None:
+        child = self._tracer.tracer.start_span(
+            f"notion.{phase}",
+            context=self._tracer.trace.set_span_in_context(self._span),
+            start_time=start_ns,
+            attributes=attributes,
+        )
+        child.end(end_time=end_ns)
+
+    def finish(self, trace: CallTrace) -> None:
+        self._span.set_attributes(
+            {f"notion.{key}": value for key, value in trace.counts.items()}
+        )
+        self._span.set_attributes(
+            {
+                f"notion.phase.{phase}.seconds": seconds
+                for phase, seconds in trace.phases.items()
+            }
+        )
+
+
+class OpenTelemetryTracer:
+    """
+    Exports each call as a client span with one child span per phase.
+
+    The call span is current while the call runs, so spans of instrumented
+    libraries, e.g. httpx, nest under it. Requires `opentelemetry-api`.
+    """
+
+    def __init__(self, tracer: Any | None = None):
+        """
+        Initializes the adapter.
+
+        Args:
+            tracer: An OpenTelemetry tracer. Defaults to one from the global
+                tracer provider.
+        """
+        try:
+            from opentelemetry import trace
+        except ImportError as e:
+            raise ImportError(
+                "OpenTelemetry tracing requires opentelemetry-api. Install it with "
+                "`pip install opentelemetry-api`."
+            ) from e
+
+        self.trace = trace
+        self.tracer = tracer or trace.get_tracer(__name__)
+
+    @contextmanager
+    def start_call(self, name: str) -> Iterator[CallSpan]:
+        with self.tracer.start_as_current_span(
+            f"notion.{name}", kind=self.trace.SpanKind.CLIENT
+        ) as span:
+            yield _OpenTelemetrySpan(self, span)
+
+
+class SlowCallLog:
+    """
+    Logs calls slower than a threshold, with their phase breakdown and
+    payload sizes, so a slow call can be blamed on Notion or on us.
+    """
+
+    def __init__(
+        self,
+        threshold: float = DEFAULT_SLOW_CALL_THRESHOLD,
+        sample_rate: float = 1.0,
+        seed: int | None = None,
+    ):
+        """
+        Initializes the log.
+
+        Args:
+            threshold: The number of seconds from which a call is slow.
+            sample_rate: The fraction of slow calls logged.
+            seed: The seed of the sampling.
+        """
+        self.threshold = threshold
+        self.sample_rate = sample_rate
+        self._random = random.Random(seed)
+
+    def observe(self, trace: CallTrace) -> bool:
+        """
+        Logs a finished call if it is slow and sampled.
+
+        Returns:
+            Whether the call was logged.
+        """
+        duration = trace.duration
+        if duration < self.threshold:
+            return False
+        if self.sample_rate < 1 and self._random.random() >= self.sample_rate:
+            return False
+        breakdown = [
+            f"{phase} {trace.phases[phase] * 1000:.0f}ms"
+            for phase in PHASES
+            if phase in trace.phases
+        ]
+        other = duration - sum(trace.phases.values())
+        if other > 0:
+            breakdown.append(f"other {other * 1000:.0f}ms")
+        logger.warning(
+            "Slow Notion call %s took %.0fms (%s): %d requests, %d retries, "
+            "%d bytes sent, %d bytes received%s.",
+            trace.name,
+            duration * 1000,
+            ", ".join(breakdown),
+            trace.counts.get("requests", 0),
+            trace.counts.get("retries", 0),
+            trace.counts.get("request_bytes", 0),
+            trace.counts.get("response_bytes", 0),
+            f", failed with {trace.error}" if trace.error else "",
+        )
+        return True
+
+
+@dataclass
+class _ActiveCall:
+    trace: CallTrace
+    span: CallSpan
+
+
+_active_call: ContextVar[_ActiveCall | None] = ContextVar(
+    "notion_active_call", default=None
+)
+
+
+def is_tracing() -> bool:
+    """Tells whether a traced call is in progress."""
+    return _active_call.get() is not None
+
+
+@contextmanager
+def trace_call(
+    name: str, tracer: Tracer, slow_calls: SlowCallLog | None = None
+) -> Iterator[CallTrace]:
+    """
+    Traces the block as one client call.
+
+    A call made while another is in progress, e.g. the requests of
+    `get_page_property`, counts as part of the outer call.
+
+    Args:
+        name: The name of the call, e.g. "query_database".
+        tracer: The tracer to report the call to.
+        slow_calls: An optional log of slow calls.
+
+    Yields:
+        The trace of the call.
+    """
+    active = _active_call.get()
+    if active is not None:
+        yield active.trace
+        return
+
+    trace = CallTrace(name)
+    with tracer.start_call(name) as span:
+        token = _active_call.set(_ActiveCall(trace, span))
+        try:
+            yield trace
+        except BaseException as e:
+            trace.error = type(e).__name__
+            raise
+        finally:
+            _active_call.reset(token)
+            trace.end_ns = time.time_ns()
+            span.finish(trace)
+            if slow_calls is not None:
+                slow_calls.observe(trace)
+
+
+def record_phase(phase: Phase, start_ns: int, end_ns: int, **attributes: Any) -> None:
+    """Records a finished phase of the current call, if one is traced."""
+    active = _active_call.get()
+    if active is None:
+        return
+    phases = active.trace.phases
+    phases[phase] = phases.get(phase, 0.0) + (end_ns - start_ns) / 1e9
+    active.span.add_phase(phase, start_ns, end_ns, attributes)
+
+
+@contextmanager
+def phase(name: Phase, **attributes: Any) -> Iterator[None]:
+    """Records the block as a phase of the current call, if one is traced."""
+    if _active_call.get() is None:
+        yield
+        return
+    start_ns = time.time_ns()
+    try:
+        yield
+    finally:
+        record_phase(name, start_ns, time.time_ns(), **attributes)
+
+
+def count(key: str, amount: int = 1) -> None:
+    """Adds to a counter of the current call, if one is traced."""
+    active = _active_call.get()
+    if active is not None:
+        active.trace.counts[key] = active.trace.counts.get(key, 0) + amount
+
+
+def validate(model: type[M], data: Any) -> M:
+    """Validates API data with a model, as the validate phase."""
+    with phase("validate", model=model.__name__):
+        return model.model_validate(data)
+
+
+class TransportTimer:
+    """
+    Splits one HTTP exchange into the connect, first byte and download phases.
+
+    Pass an instance as the `trace` request extension; httpcore calls it on
+    each connection event. With transports that report no events, such as
+    `httpx.MockTransport`, the whole exchange counts as first byte.
+    """
+
+    def __init__(self):
+        self.start_ns = time.time_ns()
+        self.events: dict[str, int] = {}
+
+    async def __call__(self, event_name: str, info: dict[str, Any]) -> None:
+        # * E.g. "http11.send_request_headers.started", for HTTP/1.1 and HTTP/2
+        _, _, event = event_name.partition(".")
+        self.events.setdefault(event, time.time_ns())
+
+    def finish(self, response: httpx.Response) -> None:
+        """Records the phases and payload sizes once the body is read."""
+        end_ns = time.time_ns()
+        sent_ns = self.events.get("send_request_headers.started")
+        headers_ns = self.events.get("receive_response_headers.complete")
+        if sent_ns is None or headers_ns is None:
+            record_phase("first_byte", self.start_ns, end_ns)
+        else:
+            record_phase("connect", self.start_ns, sent_ns)
+            record_phase("first_byte", sent_ns, headers_ns)
+            record_phase("download", headers_ns, end_ns)
+        count("requests")
+        count("request_bytes", int(response.request.headers.get("Content-Length", 0)))
+        count("response_bytes", len(response.content))
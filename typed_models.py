@@ -0,0 +1,276 @@
+"""Typed page models generated from the schema of a database."""
+
+import keyword
+import logging
+import re
+import unicodedata
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from typing import Any, Literal
+
+from pydantic import BaseModel, ConfigDict, Field, create_model
+
+from app.core.integrations.notion.client import AsyncNotionClient
+from app.core.integrations.notion.schemas import (
+    PROPERTY_MODELS,
+    Database,
+    PageBase,
+    Property,
+    QueryDatabasePayload,
+)
+from app.core.integrations.notion.tracing import validate
+
+# * Configure logging
+logger = logging.getLogger(__name__)
+
+_PROPERTIES_CONFIG = ConfigDict(populate_by_name=True)
+
+
+def field_name(property_name: str, taken: set[str] | None = None) -> str:
+    """
+    Derives a snake_case attribute name from a property name.
+
+    Args:
+        property_name: The name of the property, e.g. "Due Date".
+        taken: The attribute names already in use, to which a numeric suffix
+            avoids collisions.
+
+    Returns:
+        A valid, unused attribute name, e.g. "due_date".
+    """
+    ascii_name = (
+        unicodedata.normalize("NFKD", property_name).encode("ascii", "ignore").decode()
+    )
+    name = re.sub(r"([a-z0-9])([A-Z])", r"\1_\2", ascii_name)
+    name = re.sub(r"[^0-9a-zA-Z]+", "_", name).strip("_").lower() or "property"
+    if name[0].isdigit() or name.startswith("model_"):
+        name = f"p_{name}"
+    if keyword.iskeyword(name) or hasattr(BaseModel, name):
+        name = f"{name}_"
+    taken = taken if taken is not None else set()
+    candidate, suffix = name, 2
+    while candidate in taken:
+        candidate, suffix = f"{name}_{suffix}", suffix + 1
+    taken.add(candidate)
+    return candidate
+
+
+def class_prefix(title: str) -> str:
+    """Derives a CamelCase class name prefix from a database title."""
+    ascii_title = (
+        unicodedata.normalize("NFKD", title).encode("ascii", "ignore").decode()
+    )
+    words = re.findall(r"[0-9a-zA-Z]+", ascii_title)
+    prefix = "".join(word[0].upper() + word[1:] for word in words) or "Database"
+    return f"Db{prefix}" if prefix[0].isdigit() else prefix
+
+
+@dataclass(frozen=True)
+class _Field:
+    property_name: str
+    name: str
+    model: type[Property]
+
+
+def _fields(database: Database) -> list[_Field]:
+    taken: set[str] = set()
+    return [
+        _Field(name, field_name(name, taken), PROPERTY_MODELS.get(prop.type, Property))
+        for name, prop in database.properties.items()
+    ]
+
+
+def _title(database: Database) -> str:
+    return "".join(text.plain_text for text in database.title)
+
+
+@dataclass(frozen=True)
+class DatabaseModels:
+    """
+    The models generated for one database.
+
+    `page` has the fields of `Page`, with `properties` a model holding one
+    attribute per property, typed with the property's own model instead of
+    the `PropertyValue` union. Validating through it skips trying each union
+    member for each property of each row, and callers read e.g.
+    `row.properties.due_date.date` instead of `row.properties["Due Date"]`.
+    """
+
+    database_id: str
+    properties: type[BaseModel]
+    page: type[PageBase]
+    response: type[BaseModel]
+    # * Maps each property name to its attribute name
+    fields: dict[str, str]
+
+    def validate_page(self, data: dict[str, Any]) -> PageBase:
+        """Validates a page object of the database."""
+        return validate(self.page, data)
+
+    def validate_response(self, data: dict[str, Any]) -> Any:
+        """Validates a query response of the database."""
+        return validate(self.response, data)
+
+    async def query(
+        self,
+        client: AsyncNotionClient,
+        payload: QueryDatabasePayload | None = None,
+    ) -> Any:
+        """
+        Queries the database, validating the results with the typed models.
+
+        Args:
+            client: The Notion client.
+            payload: The query payload (for filtering, sorting, etc.).
+
+        Returns:
+            The response, with `results` a list of `page` instances.
+        """
+        return await client.query_database_as(self.database_id, self.response, payload)
+
+    async def iter_query(
+        self,
+        client: AsyncNotionClient,
+        payload: QueryDatabasePayload | None = None,
+    ) -> AsyncIterator[Any]:
+        """
+        Queries the database and follows `next_cursor` until all pages are fetched.
+
+        Args:
+            client: The Notion client.
+            payload: The query payload (for filtering, sorting, etc.).
+
+        Yields:
+            Each batch of results as returned by the API, typed.
+        """
+        payload = payload.model_copy() if payload else QueryDatabasePayload()
+        while True:
+            response = await self.query(client, payload)
+            yield response
+            if not response.has_more or not response.next_cursor:
+                return
+            payload = payload.model_copy(update={"start_cursor": response.next_cursor})
+
+
+def build_models(database: Database, name: str | None = None) -> DatabaseModels:
+    """
+    Generates the typed models of a database at runtime.
+
+    The models match the database schema at the time `database` was fetched;
+    pages of a renamed or deleted property fail validation until the models
+    are rebuilt. New properties are ignored.
+
+    Args:
+        database: The database, e.g. from `get_database`.
+        name: The class name prefix. Defaults to one derived from the title.
+
+    Returns:
+        The generated models.
+    """
+    prefix = name or class_prefix(_title(database))
+    fields = _fields(database)
+    properties = create_model(
+        f"{prefix}Properties",
+        __config__=_PROPERTIES_CONFIG,
+        **{
+            field.name: (field.model, Field(alias=field.property_name))
+            for field in fields
+        },
+    )
+    page = create_model(
+        f"{prefix}Page", __base__=PageBase, properties=(properties, ...)
+    )
+    response = create_model(
+        f"{prefix}QueryResponse",
+        object=(Literal["list"], ...),
+        results=(list[page], ...),
+        next_cursor=(str | None, ...),
+        has_more=(bool, ...),
+    )
+    logger.debug("Built %s models for database %s.", prefix, database.id)
+    return DatabaseModels(
+        database_id=database.id,
+        properties=properties,
+        page=page,
+        response=response,
+        fields={field.property_name: field.name for field in fields},
+    )
+
+
+async def database_models(
+    client: AsyncNotionClient, database_id: str, name: str | None = None
+) -> DatabaseModels:
+    """
+    Fetches a database's schema and generates its typed models.
+
+    Args:
+        client: The Notion client.
+        database_id: The ID of the database.
+        name: The class name prefix. Defaults to one derived from the title.
+
+    Returns:
+        The generated models.
+    """
+    return build_models(await client.get_database(database_id), name)
+
+
+def model_source(database: Database, name: str | None = None) -> str:
+    """
+    Generates the typed models of a database as Python source.
+
+    The source defines `<Name>Properties`, `<Name>Page` and
+    `<Name>QueryResponse`, equivalent to those of `build_models`, plus
+    `DATABASE_ID`. Commit it to get static types for a database whose schema
+    rarely changes, and regenerate it when the schema does.
+
+    Args:
+        database: The database, e.g. from `get_database`.
+        name: The class name prefix. Defaults to one derived from the title.
+
+    Returns:
+        The source of a module.
+    """
+    title = _title(database)
+    prefix = name or class_prefix(title)
+    fields = _fields(database)
+    models = sorted({field.model.__name__ for field in fields} | {"PageBase"})
+    lines = [
+        f'"""Typed models of the Notion database {title!r}.',
+        "",
+        "Generated by app.core.integrations.notion.typed_models.model_source;",
+        "regenerate after the database schema changes.",
+        '"""',
+        "",
+        "from typing import Literal",
+        "",
+        "from pydantic import BaseModel, ConfigDict, Field",
+        "",
+        "from app.core.integrations.notion.schemas import (",
+        *(f"    {model}," for model in models),
+        ")",
+        "",
+        f"DATABASE_ID = {database.id!r}",
+        "",
+        "",
+        f"class {prefix}Properties(BaseModel):",
+        "    model_config = ConfigDict(populate_by_name=True)",
+        "",
+        *(
+            f"    {field.name}: {field.model.__name__} = "
+            f"Field(alias={field.property_name!r})"
+            for field in fields
+        ),
+        "",
+        "",
+        f"class {prefix}Page(PageBase):",
+        f"    properties: {prefix}Properties",
+        "",
+        "",
+        f"class {prefix}QueryResponse(BaseModel):",
+        '    object: Literal["list"]',
+        f"    results: list[{prefix}Page]",
+        "    next_cursor: str | None",
+        "    has_more: bool",
+        "",
+    ]
+    return "\n".join(lines)
@@ -0,0 +1,235 @@
+"""Streaming file uploads to Notion and attaching them to pages and blocks."""
+
+import asyncio
+import logging
+import mimetypes
+from collections.abc import AsyncIterable, AsyncIterator
+from typing import Any, Literal, Protocol
+
+from app.core.integrations.notion.client import AsyncNotionClient
+from app.core.integrations.notion.schemas import (
+    AppendBlockChildrenPayload,
+    AppendBlockChildrenResponse,
+    CreateFileUploadPayload,
+    FileUpload,
+    Page,
+    UpdatePagePayload,
+)
+
+# * Configure logging
+logger = logging.getLogger(__name__)
+
+# * Notion accepts single-part uploads up to 20 MB and parts of 5-20 MB
+MAX_SINGLE_PART_SIZE = 20 * 1024 * 1024
+DEFAULT_PART_SIZE = 10 * 1024 * 1024
+
+FileBlockType = Literal["file", "image", "pdf", "video", "audio"]
+
+
+class AsyncReadable(Protocol):
+    """An async file handle, e.g. from `aiofiles.open` or `anyio.open_file`."""
+
+    async def read(self, size: int = -1) -> bytes: ...
+
+
+UploadSource = bytes | AsyncReadable | AsyncIterable[bytes]
+
+
+async def iter_parts(source: UploadSource, part_size: int) -> AsyncIterator[bytes]:
+    """
+    Re-chunks an upload source into parts of exactly `part_size` bytes.
+
+    Only one part is buffered at a time; the last part may be shorter.
+
+    Args:
+        source: Bytes, an async file handle or an async iterable of chunks.
+        part_size: The size of each part.
+
+    Yields:
+        The parts, in order.
+    """
+    if isinstance(source, bytes):
+        for start in range(0, len(source), part_size):
+            yield source[start : start + part_size]
+        return
+
+    if hasattr(source, "read"):
+        while part := await source.read(part_size):
+            yield part
+        return
+
+    buffer = bytearray()
+    async for chunk in source:
+        buffer.extend(chunk)
+        while len(buffer) >= part_size:
+            yield bytes(buffer[:part_size])
+            del buffer[:part_size]
+    if buffer:
+        yield bytes(buffer)
+
+
+async def upload_file(
+    client: AsyncNotionClient,
+    source: UploadSource,
+    filename: str,
+    content_type: str | None = None,
+    size: int | None = None,
+    part_size: int = DEFAULT_PART_SIZE,
+    max_concurrency: int = 3,
+) -> FileUpload:
+    """
+    Uploads a file to Notion without loading it into memory.
+
+    Files larger than `part_size` are sent as a multi-part upload whose parts
+    are read one by one and sent concurrently, so at most `max_concurrency`
+    parts are held in memory at once.
+
+    Args:
+        client: The Notion client to upload with.
+        source: Bytes, an async file handle or an async iterable of chunks.
+        filename: The name of the file.
+        content_type: The MIME type. Guessed from the filename if omitted.
+        size: The total size in bytes. Required for sources larger than one
+            part, since Notion needs the part count up front.
+        part_size: The size of each part of a multi-part upload.
+        max_concurrency: The maximum number of parts sent at once.
+
+    Returns:
+        The uploaded FileUpload object, ready to be attached.
+
+    Raises:
+        ValueError: If a multi-part upload is needed but `size` is unknown.
+    """
+    content_type = content_type or mimetypes.guess_type(filename)[0]
+    part_size = min(part_size, MAX_SINGLE_PART_SIZE)
+    parts = iter_parts(source, part_size)
+    if isinstance(source, bytes):
+        size = len(source)
+
+    if size is None or size <= part_size:
+        content = await anext(parts, b"")
+        if await anext(parts, None) is not None:
+            raise ValueError("`size` is required for multi-part uploads.")
+        upload = await client.create_file_upload(
+            CreateFileUploadPayload(
+                mode="single_part", filename=filename, content_type=content_type
+            )
+        )
+        return await client.send_file_upload(
+            upload.id, content, filename, content_type
+        )
+
+    number_of_parts = -(-size // part_size)
+    upload = await client.create_file_upload(
+        CreateFileUploadPayload(
+            mode="multi_part",
+            filename=filename,
+            content_type=content_type,
+            number_of_parts=number_of_parts,
+        )
+    )
+    logger.info("Uploading %s in %d parts.", filename, number_of_parts)
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def send(content: bytes, part_number: int) -> None:
+        try:
+            await client.send_file_upload(
+                upload.id, content, filename, content_type, part_number
+            )
+        finally:
+            semaphore.release()
+
+    tasks: list[asyncio.Task[None]] = []
+    try:
+        part_number = 0
+        while True:
+            # * Wait for a free slot before reading, to bound buffered parts
+            await semaphore.acquire()
+            failed = next((t for t in tasks if t.done() and t.exception()), None)
+            if failed is not None:
+                semaphore.release()
+                break
+            content = await anext(parts, None)
+            if content is None:
+                semaphore.release()
+                break
+            part_number += 1
+            tasks.append(asyncio.create_task(send(content, part_number)))
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+    return await client.complete_file_upload(upload.id)
+
+
+def file_upload_object(upload: FileUpload, name: str | None = None) -> dict[str, Any]:
+    """
+    Builds the file object that references an uploaded file.
+
+    Args:
+        upload: The uploaded file.
+        name: The display name. Defaults to the uploaded filename.
+
+    Returns:
+        A file object for a files property or a file block.
+    """
+    return {
+        "type": "file_upload",
+        "file_upload": {"id": upload.id},
+        "name": name or upload.filename,
+    }
+
+
+async def attach_to_property(
+    client: AsyncNotionClient,
+    page_id: str,
+    property_name: str,
+    uploads: list[FileUpload],
+) -> Page:
+    """
+    Sets a files property of a page to uploaded files.
+
+    Args:
+        client: The Notion client.
+        page_id: The ID of the page.
+        property_name: The name or ID of the files property.
+        uploads: The uploaded files. They replace the property's files.
+
+    Returns:
+        The updated page.
+    """
+    files = [file_upload_object(upload) for upload in uploads]
+    return await client.update_page(
+        page_id, UpdatePagePayload(properties={property_name: {"files": files}})
+    )
+
+
+async def append_file_block(
+    client: AsyncNotionClient,
+    block_id: str,
+    upload: FileUpload,
+    block_type: FileBlockType = "file",
+) -> AppendBlockChildrenResponse:
+    """
+    Appends a file, image, pdf, video or audio block showing an uploaded file.
+
+    Args:
+        client: The Notion client.
+        block_id: The ID of the parent page or block.
+        upload: The uploaded file.
+        block_type: The type of block to append.
+
+    Returns:
+        The appended block.
+    """
+    content = {"type": "file_upload", "file_upload": {"id": upload.id}}
+    if block_type == "file" and upload.filename:
+        content["name"] = upload.filename
+    return await client.append_block_children(
+        block_id,
+        AppendBlockChildrenPayload(
+            children=[{"object": "block", "type": block_type, block_type: content}]
+        ),
+    )
@@ -0,0 +1,163 @@
+"""An in-memory, periodically refreshed directory of workspace users."""
+
+import asyncio
+import logging
+from collections.abc import Iterable
+from typing import Any
+
+from app.core.integrations.notion.client import AsyncNotionClient
+from app.core.integrations.notion.exceptions import NotionAPIError, NotionNotFoundError
+from app.core.integrations.notion.schemas import User
+
+# * Configure logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_REFRESH_INTERVAL = 15 * 60.0
+
+
+def _user_references(obj: Any) -> list[tuple[Any, str, User]]:
+    """Lists the (owner, attribute, user) references an object carries."""
+    references = [
+        (obj, field, getattr(obj, field))
+        for field in ("created_by", "last_edited_by")
+        if isinstance(getattr(obj, field, None), User)
+    ]
+    for prop in (getattr(obj, "properties", None) or {}).values():
+        if prop.type == "people":
+            references.extend(
+                (prop.people, index, user) for index, user in enumerate(prop.people)
+            )
+        elif prop.type in ("created_by", "last_edited_by"):
+            references.append((prop, prop.type, getattr(prop, prop.type)))
+    return references
+
+
+class UserDirectory:
+    """
+    An ID-indexed map of every user in the workspace.
+
+    Pages, blocks and comments only embed partial users (an object type and an
+    ID). The directory loads all users with a paginated `/users` listing, keeps
+    them fresh in the background, and fills in the user references of a whole
+    result set at once, fetching only users it has never seen.
+    """
+
+    def __init__(
+        self,
+        client: AsyncNotionClient,
+        refresh_interval: float = DEFAULT_REFRESH_INTERVAL,
+    ):
+        """
+        Initializes the directory.
+
+        Args:
+            client: The Notion client to list users with.
+            refresh_interval: The number of seconds between background refreshes.
+        """
+        self.client = client
+        self.refresh_interval = refresh_interval
+        self._users: dict[str, User] = {}
+        self._task: asyncio.Task[None] | None = None
+
+    def __len__(self) -> int:
+        return len(self._users)
+
+    def __contains__(self, user_id: str) -> bool:
+        return user_id in self._users
+
+    def get(self, user_id: str) -> User | None:
+        """Returns a user from the directory without calling the API."""
+        return self._users.get(user_id)
+
+    async def refresh(self) -> int:
+        """
+        Reloads every user of the workspace.
+
+        Returns:
+            The number of users in the directory.
+        """
+        users: dict[str, User] = {}
+        async for response in self.client.iter_users(page_size=100):
+            users.update((user.id, user) for user in response.results)
+        # * Keep users fetched individually, e.g. guests missing from /users
+        self._users = {**self._users, **users}
+        return len(self._users)
+
+    async def resolve(self, user_ids: Iterable[str]) -> dict[str, User]:
+        """
+        Looks up many users, fetching unknown ones concurrently.
+
+        Args:
+            user_ids: The IDs to resolve. Duplicates are fetched once.
+
+        Returns:
+            The resolved users by ID. Users that no longer exist are omitted.
+        """
+        unique = set(user_ids)
+        missing = [user_id for user_id in unique if user_id not in self._users]
+        results = await asyncio.gather(
+            *map(self.client.get_user, missing), return_exceptions=True
+        )
+        for user_id, result in zip(missing, results):
+            if isinstance(result, User):
+                self._users[user_id] = result
+            elif isinstance(result, NotionNotFoundError):
+                logger.debug("User %s was not found.", user_id)
+            elif isinstance(result, BaseException):
+                raise result
+        return {
+            user_id: self._users[user_id]
+            for user_id in unique
+            if user_id in self._users
+        }
+
+    async def hydrate(self, objects: Iterable[Any]) -> int:
+        """
+        Replaces the partial users in pages, blocks or comments with full ones.
+
+        Covers `created_by` and `last_edited_by`, and people, created by and
+        last edited by properties of pages. Objects are updated in place.
+
+        Args:
+            objects: The result set to hydrate.
+
+        Returns:
+            The number of references that were filled in.
+        """
+        references = [ref for obj in objects for ref in _user_references(obj)]
+        users = await self.resolve(user.id for _, _, user in references)
+        hydrated = 0
+        for owner, key, user in references:
+            full = users.get(user.id)
+            if full is None:
+                continue
+            if isinstance(owner, list):
+                owner[key] = full
+            else:
+                setattr(owner, key, full)
+            hydrated += 1
+        return hydrated
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                count = await self.refresh()
+                logger.debug("User directory refreshed with %d users.", count)
+            except NotionAPIError as e:
+                logger.warning("Failed to refresh the user directory: %s", e)
+            await asyncio.sleep(self.refresh_interval)
+
+    def start(self) -> None:
+        """Starts refreshing in a background task on the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stops the background task."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -0,0 +1,144 @@
+"""In-process fan-out of verified webhook events to stream subscribers."""
+
+import asyncio
+import logging
+from collections.abc import AsyncIterator, Iterable
+from contextlib import asynccontextmanager
+from typing import Any
+
+from app.core.integrations.notion.utils import clean_id
+from app.core.integrations.notion.webhooks.schemas import WebhookPayload
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUFFER_SIZE = 100
+
+# * Keys whose values identify the objects an event is about
+_ID_KEYS = ("id", "page_id", "database_id", "block_id")
+
+
+def event_object_ids(payload: WebhookPayload) -> set[str]:
+    """
+    Collects the IDs of the pages, databases and blocks an event refers to.
+
+    Looks at ID keys of the event data and of the objects nested in it one
+    level deep, such as `parent` or `entity`.
+
+    Args:
+        payload: The webhook event.
+
+    Returns:
+        The IDs without dashes.
+    """
+    ids: set[str] = set()
+    for obj in [payload.data, *payload.data.values()]:
+        if not isinstance(obj, dict):
+            continue
+        ids.update(
+            clean_id(obj[key]) for key in _ID_KEYS if isinstance(obj.get(key), str)
+        )
+    return ids
+
+
+class Subscription:
+    """
+    One subscriber's filtered, bounded view of the event stream.
+
+    When the buffer is full, the oldest event is dropped and counted in
+    `dropped`, so a slow subscriber never holds back the others.
+    """
+
+    def __init__(
+        self, object_ids: Iterable[str] = (), buffer_size: int = DEFAULT_BUFFER_SIZE
+    ):
+        """
+        Initializes the subscription.
+
+        Args:
+            object_ids: The page, database or block IDs to receive events for.
+                Empty to receive every event.
+            buffer_size: The maximum number of undelivered events kept.
+        """
+        self.object_ids = {clean_id(object_id) for object_id in object_ids}
+        self.dropped = 0
+        self._queue: asyncio.Queue[WebhookPayload] = asyncio.Queue(buffer_size)
+
+    def matches(self, ids: set[str]) -> bool:
+        """Tells whether an event about the given objects is wanted."""
+        return not self.object_ids or not self.object_ids.isdisjoint(ids)
+
+    def put(self, payload: WebhookPayload) -> None:
+        """Buffers an event, dropping the oldest one if the buffer is full."""
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.dropped += 1
+        self._queue.put_nowait(payload)
+
+    async def get(self) -> WebhookPayload:
+        """Waits for the next event."""
+        return await self._queue.get()
+
+
+class EventBroker:
+    """Publishes each webhook event to every matching subscription."""
+
+    def __init__(self):
+        self._subscriptions: set[Subscription] = set()
+
+    def __len__(self) -> int:
+        """Returns the number of active subscriptions."""
+        return len(self._subscriptions)
+
+    def publish(self, payload: WebhookPayload) -> int:
+        """
+        Delivers an event to the matching subscriptions without waiting.
+
+        Args:
+            payload: The verified webhook event.
+
+        Returns:
+            The number of subscriptions the event was delivered to.
+        """
+        ids = event_object_ids(payload)
+        delivered = 0
+        for subscription in self._subscriptions:
+            if subscription.matches(ids):
+                subscription.put(payload)
+                delivered += 1
+        return delivered
+
+    @asynccontextmanager
+    async def subscribe(
+        self,
+        object_ids: Iterable[str] = (),
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+    ) -> AsyncIterator[Subscription]:
+        """
+        Subscribes to events for the duration of the block.
+
+        Args:
+            object_ids: The page, database or block IDs to receive events for.
+                Empty to receive every event.
+            buffer_size: The maximum number of undelivered events kept.
+
+        Yields:
+            The subscription.
+        """
+        subscription = Subscription(object_ids, buffer_size)
+        self._subscriptions.add(subscription)
+        logger.debug("Stream subscribed, %d active.", len(self._subscriptions))
+        try:
+            yield subscription
+        finally:
+            self._subscriptions.discard(subscription)
+
+
+def format_sse(event: str, data: Any, event_id: int | None = None) -> str:
+    """Formats one Server-Sent Events message."""
+    lines = [] if event_id is None else [f"id: {event_id}"]
+    lines += [f"event: {event}", f"data: {data}"]
+    return "\n".join(lines) + "\n\n"
+
+
+# * Shared by the webhook receiver and the stream endpoint of this process
+broker = EventBroker()
@@ -1,11 +1,24 @@
-from fastapi import APIRouter, Depends, status
+import asyncio
+import json
+from collections.abc import AsyncIterator
 
+from fastapi import APIRouter, Depends, Query, Request, status
+from fastapi.responses import StreamingResponse
+
+from app.core.integrations.notion.webhooks.broker import (
+    DEFAULT_BUFFER_SIZE,
+    broker,
+    format_sse,
+)
 from app.core.integrations.notion.webhooks.schemas import WebhookPayload
 from app.core.integrations.notion.webhooks.security import verify_notion_signature
 from app.core.integrations.notion.webhooks.tasks import process_webhook_event
 
 router = APIRouter()
 
+# * Seconds between keep-alive comments on idle streams
+HEARTBEAT_INTERVAL = 15.0
+
 
 @router.post(
     "/",
@@ -19,6 +32,54 @@ async def handle_notion_webhook(payload: WebhookPayload):
 
     - **Signature Verification**: Ensures the request is from Notion.
     - **Asynchronous Processing**: Offloads the event to a Celery worker.
+    - **Streaming**: Pushes the event to subscribers of `/stream`.
     """
     process_webhook_event.delay(payload.model_dump())
+    broker.publish(payload)
     return {"status": "received"}
+
+
+async def _event_stream(
+    request: Request, object_ids: list[str], buffer_size: int
+) -> AsyncIterator[str]:
+    async with broker.subscribe(object_ids, buffer_size) as subscription:
+        event_id = 0
+        reported_drops = 0
+        while not await request.is_disconnected():
+            try:
+                payload = await asyncio.wait_for(
+                    subscription.get(), timeout=HEARTBEAT_INTERVAL
+                )
+            except asyncio.TimeoutError:
+                yield ": heartbeat\n\n"
+                continue
+            if subscription.dropped > reported_drops:
+                # * Tell the client it missed events and should refetch
+                lagged = {"dropped": subscription.dropped}
+                yield format_sse("lagged", json.dumps(lagged))
+                reported_drops = subscription.dropped
+            event_id += 1
+            yield format_sse(payload.event_type, payload.model_dump_json(), event_id)
+
+
+@router.get("/stream", summary="Stream Notion Webhook Events")
+async def stream_notion_events(
+    request: Request,
+    database_id: list[str] = Query(default=[]),
+    page_id: list[str] = Query(default=[]),
+    buffer_size: int = Query(default=DEFAULT_BUFFER_SIZE, ge=1, le=1000),
+) -> StreamingResponse:
+    """
+    Pushes verified webhook events to the client as Server-Sent Events.
+
+    - **Filtering**: Only events about the given databases or pages are sent;
+      without filters, every event is.
+    - **Backpressure**: Each client has a bounded buffer. If it overflows, the
+      oldest events are dropped and a `lagged` event tells the client to
+      refetch.
+    """
+    return StreamingResponse(
+        _event_stream(request, [*database_id, *page_id], buffer_size),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
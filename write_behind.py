@@ -0,0 +1,155 @@
+"""Write-behind buffering that coalesces page updates into one PATCH per page."""
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any
+
+from app.core.integrations.notion.client import AsyncNotionClient
+from app.core.integrations.notion.schemas import Page, UpdatePagePayload
+from app.core.integrations.notion.utils import clean_id
+
+# * Configure logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_WINDOW = 0.25
+
+
+@dataclass
+class _PendingUpdate:
+    """The merged updates of one page waiting to be flushed."""
+
+    payload: dict[str, Any] = field(default_factory=lambda: {"properties": {}})
+    futures: list[asyncio.Future[Page]] = field(default_factory=list)
+    timer: asyncio.TimerHandle | None = None
+
+
+class PageUpdateBuffer:
+    """
+    Coalesces `update_page` calls for the same page over a short window.
+
+    The first update of a page opens a window of `window` seconds. Updates
+    submitted during the window are merged, with later values winning per
+    property (and for `archived`, `icon` and `cover`), and sent as a single
+    PATCH when it closes. Every caller gets a future resolving to the page
+    returned by that PATCH, or to its error. Flushes of the same page never
+    overlap, so updates are applied in submission order.
+
+    Call `close` on shutdown to flush everything still buffered.
+    """
+
+    def __init__(self, client: AsyncNotionClient, window: float = DEFAULT_WINDOW):
+        """
+        Initializes the buffer.
+
+        Args:
+            client: The Notion client to send updates with.
+            window: The number of seconds updates of a page are collected for.
+        """
+        self.client = client
+        self.window = window
+        self._pending: dict[str, _PendingUpdate] = {}
+        self._inflight: dict[str, asyncio.Task[None]] = {}
+        self._closed = False
+
+    def __len__(self) -> int:
+        """Returns the number of pages with buffered updates."""
+        return len(self._pending)
+
+    def submit(self, page_id: str, payload: UpdatePagePayload) -> asyncio.Future[Page]:
+        """
+        Buffers an update of a page.
+
+        Args:
+            page_id: The ID of the page to update.
+            payload: The update, merged with other buffered updates of the page.
+
+        Returns:
+            A future resolving to the updated page once the merged update is sent.
+
+        Raises:
+            RuntimeError: If the buffer is closed.
+        """
+        if self._closed:
+            raise RuntimeError("Cannot submit updates to a closed PageUpdateBuffer.")
+        page_id = clean_id(page_id)
+        pending = self._pending.get(page_id)
+        if pending is None:
+            pending = self._pending[page_id] = _PendingUpdate()
+            pending.timer = asyncio.get_running_loop().call_later(
+                self.window, self._flush_page, page_id
+            )
+        update = payload.model_dump(exclude_unset=True)
+        pending.payload["properties"].update(update.pop("properties", {}))
+        pending.payload.update(update)
+        future: asyncio.Future[Page] = asyncio.get_running_loop().create_future()
+        pending.futures.append(future)
+        return future
+
+    async def update_page(self, page_id: str, payload: UpdatePagePayload) -> Page:
+        """
+        Buffers an update and waits for it to be sent, like
+        `AsyncNotionClient.update_page`.
+        """
+        return await self.submit(page_id, payload)
+
+    def _flush_page(self, page_id: str) -> asyncio.Task[None] | None:
+        pending = self._pending.pop(page_id, None)
+        if pending is None:
+            return None
+        if pending.timer is not None:
+            pending.timer.cancel()
+        previous = self._inflight.get(page_id)
+        task = asyncio.create_task(self._send(page_id, pending, previous))
+        self._inflight[page_id] = task
+
+        def forget(_: asyncio.Task[None]) -> None:
+            if self._inflight.get(page_id) is task:
+                del self._inflight[page_id]
+
+        task.add_done_callback(forget)
+        return task
+
+    async def _send(
+        self,
+        page_id: str,
+        pending: _PendingUpdate,
+        previous: asyncio.Task[None] | None,
+    ) -> None:
+        try:
+            if previous is not None:
+                # * Keep updates of one page in order
+                await asyncio.wait({previous})
+            logger.debug(
+                "Flushing %d coalesced updates of page %s.",
+                len(pending.futures),
+                page_id,
+            )
+            page = await self.client.update_page(
+                page_id, UpdatePagePayload.model_validate(pending.payload)
+            )
+        except asyncio.CancelledError:
+            # * E.g. at shutdown: the update may or may not have been applied
+            for future in pending.futures:
+                future.cancel()
+            raise
+        except Exception as e:
+            for future in pending.futures:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            for future in pending.futures:
+                if not future.done():
+                    future.set_result(page)
+
+    async def flush(self) -> None:
+        """Sends every buffered update now and waits until all are sent."""
+        for page_id in list(self._pending):
+            self._flush_page(page_id)
+        if self._inflight:
+            await asyncio.wait(set(self._inflight.values()))
+
+    async def close(self) -> None:
+        """Stops accepting updates and flushes the buffered ones."""
+        self._closed = True
+        await self.flush()